@@ -0,0 +1,125 @@
+import contextvars
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.db import connection
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from django.utils import translation
+from django.utils.translation import gettext as _
+
+from app.utils import constants
+from app.utils.permissions import remember_checks
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# Headers of a sub-response that are passed on to the client.
+RESPONSE_HEADERS = ("ETag", "Location", "Retry-After")
+# Headers of the batch that aren't passed on to its sub-requests.
+BATCH_ONLY_HEADERS = (
+    "HTTP_IDEMPOTENCY_KEY",
+    "HTTP_IF_MATCH",
+    "HTTP_IF_NONE_MATCH",
+    "HTTP_IF_MODIFIED_SINCE",
+    "HTTP_IF_UNMODIFIED_SINCE",
+)
+
+logger = logging.getLogger(__name__)
+
+
+def run_batch(request, items, concurrent=False):
+    """Run the sub-requests of a batch and return their responses by id.
+
+    They share the authentication of the batch and the answers to their
+    permission checks. Read-only batches run on a few threads when asked to,
+    unless a transaction is open, as threads couldn't see its changes.
+    """
+    with remember_checks():
+        if (
+            concurrent
+            and not connection.in_atomic_block
+            and all(item["method"] in SAFE_METHODS for item in items)
+        ):
+            context = contextvars.copy_context()
+            language = translation.get_language()
+            with ThreadPoolExecutor(constants.BATCH_MAX_WORKERS) as executor:
+                responses = list(
+                    executor.map(
+                        lambda item: context.copy().run(
+                            run_in_thread, request, item, language
+                        ),
+                        items,
+                    )
+                )
+        else:
+            responses = [run(request, item) for item in items]
+    return {item["id"]: response for item, response in zip(items, responses)}
+
+
+def run_in_thread(request, item, language):
+    try:
+        with translation.override(language):
+            return run(request, item)
+    finally:
+        connection.close()
+
+
+def run(request, item):
+    url = urlsplit(item["path"])
+    try:
+        match = resolve(url.path)
+    except Resolver404:
+        return error(404, _("Not found."))
+    view_class = getattr(match.func, "cls", None)
+    if view_class is None or getattr(view_class, "batchable", True) is False:
+        return error(400, _("This path can't be part of a batch."))
+
+    try:
+        response = match.func(
+            build_request(request, item, url, match), *match.args, **match.kwargs
+        )
+        if hasattr(response, "render"):
+            response.render()
+    except Exception:
+        # One failing sub-request mustn't lose the responses of the others.
+        logger.exception("Batch request %s %s failed", item["method"], item["path"])
+        return error(500, _("A server error occurred."))
+    return {
+        "status": response.status_code,
+        "headers": {
+            name: response[name] for name in RESPONSE_HEADERS if name in response
+        },
+        "body": json.loads(response.content) if response.content else None,
+    }
+
+
+def build_request(parent, item, url, match):
+    body = b"" if item.get("body") is None else json.dumps(item["body"]).encode()
+    request = HttpRequest()
+    request.method = item["method"]
+    request.path = request.path_info = url.path
+    request.META = {
+        **parent.META,
+        "REQUEST_METHOD": item["method"],
+        "PATH_INFO": url.path,
+        "QUERY_STRING": url.query,
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(body)),
+        "HTTP_ACCEPT": "application/json",
+    }
+    for name in BATCH_ONLY_HEADERS:
+        request.META.pop(name, None)
+    request.GET = QueryDict(url.query)
+    request._stream = io.BytesIO(body)
+    request._read_started = False
+    request.resolver_match = match
+    # DRF takes the user as authenticated, instead of decoding the JWT again.
+    request._force_auth_user = parent.user
+    request._force_auth_token = parent.auth
+    return request
+
+
+def error(status, detail):
+    return {"status": status, "headers": {}, "body": {"detail": detail}}
@@ -0,0 +1,89 @@
+import functools
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.response import Response
+
+from app.models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def get_request_hash(request):
+    digest = hashlib.sha256()
+    for part in [request.method, request.get_full_path(), request.body]:
+        digest.update(part if isinstance(part, bytes) else part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_expiry():
+    return timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+
+
+def idempotent(view):
+    """Replay the stored response of a POST retried with the same key.
+
+    The key is claimed by inserting its row in the transaction that runs the
+    view and stores the response. A concurrent duplicate blocks on the unique
+    index until that transaction ends, then replays what it stored, or runs
+    the view itself if the first request failed and rolled back.
+    """
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None or not request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"detail": _("Idempotency key is too long")},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        request_hash = get_request_hash(request)
+        with transaction.atomic():
+            stored = claim(request.user, key, request_hash)
+            if stored is None:
+                response = view(request, *args, **kwargs)
+                store(request.user, key, response)
+                return response
+
+        if stored.request_hash != request_hash:
+            return Response(
+                {"detail": _("Idempotency key was used for another request")},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        response = Response(stored.body, status=stored.status)
+        response["Idempotent-Replayed"] = "true"
+        return response
+
+    return wrapper
+
+
+def claim(user, key, request_hash):
+    """Insert the row of ``key`` or return the stored one when it exists."""
+    IdempotencyKey.objects.filter(
+        user=user, key=key, created_at__lt=get_expiry()
+    ).delete()
+    try:
+        with transaction.atomic():
+            IdempotencyKey.objects.create(user=user, key=key, request_hash=request_hash)
+    except IntegrityError:
+        return IdempotencyKey.objects.get(user=user, key=key)
+    return None
+
+
+def store(user, key, response):
+    stored = IdempotencyKey.objects.filter(user=user, key=key)
+    if response.status_code >= 500:
+        # Server errors are retried for real.
+        stored.delete()
+    else:
+        stored.update(status=response.status_code, body=response.data)
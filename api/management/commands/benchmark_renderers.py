@@ -0,0 +1,78 @@
+import datetime
+import gzip
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils.translation import gettext_lazy as _
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer
+
+
+def build_payload(num_stages, num_tasks):
+    """A project detail shaped payload with ``num_stages`` x ``num_tasks`` tasks."""
+    today = datetime.date(2024, 1, 1)
+    now = datetime.datetime(2024, 1, 1, 12, 30, tzinfo=datetime.timezone.utc)
+    return {
+        "id": 1,
+        "name": "Benchmark project",
+        "describe": "Project used to benchmark the JSON renderers",
+        "start_date": today,
+        "end_date": today + datetime.timedelta(days=365),
+        "status": _("Active"),
+        "updated_at": now,
+        "stages": [
+            {
+                "id": stage,
+                "name": f"Stage {stage}",
+                "start_date": today,
+                "end_date": today + datetime.timedelta(days=30),
+                "progress": Decimal("0.25"),
+                "tasks": [
+                    {
+                        "id": stage * num_tasks + task,
+                        "content": f"Task {task} of stage {stage}",
+                        "status": task % 4,
+                        "start_date": today + datetime.timedelta(days=task % 30),
+                        "end_date": today + datetime.timedelta(days=task % 30 + 1),
+                        "user": task % 50,
+                        "updated_at": now,
+                    }
+                    for task in range(num_tasks)
+                ],
+            }
+            for stage in range(num_stages)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare encode time and response size of the JSON renderers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stages", type=int, default=50)
+        parser.add_argument("--tasks", type=int, default=200)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        payload = build_payload(options["stages"], options["tasks"])
+        self.stdout.write(
+            "%d tasks, best of %d runs"
+            % (options["stages"] * options["tasks"], options["repeat"])
+        )
+        for renderer in [JSONRenderer(), FastJSONRenderer()]:
+            timings = []
+            for _run in range(options["repeat"]):
+                started = time.perf_counter()
+                content = renderer.render(payload)
+                timings.append(time.perf_counter() - started)
+            self.stdout.write(
+                "%-18s %8.1f ms %10d bytes %10d gzipped"
+                % (
+                    type(renderer).__name__,
+                    min(timings) * 1000,
+                    len(content),
+                    len(gzip.compress(content)),
+                )
+            )
@@ -0,0 +1,24 @@
+import glob
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.schema import generate_schema, get_code_version, schema_path
+
+
+class Command(BaseCommand):
+    help = "Write the OpenAPI schema of every language for the current code version"
+
+    def handle(self, *args, **options):
+        current = set()
+        for language, _name in settings.LANGUAGES:
+            generate_schema(language)
+            current.add(schema_path(language))
+            self.stdout.write(schema_path(language))
+
+        # Schemas of previous deployments are never served again.
+        pattern = os.path.join(settings.SCHEMA_CACHE_DIR, "openapi-*.json")
+        for path in set(glob.glob(pattern)) - current:
+            os.remove(path)
+        self.stdout.write("Schema version %s" % get_code_version())
@@ -0,0 +1,82 @@
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Loads what a worker loads before serving its first request.
+WORKER_STARTUP = """
+import resource
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(output):
+    """Return ``(total_us, {root package: self_us})`` of ``-X importtime`` output."""
+    total = 0
+    packages = defaultdict(int)
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        own, cumulative, indent, name = match.groups()
+        packages[name.split(".")[0]] += int(own)
+        if len(indent) == 1:
+            total += int(cumulative)
+    return total, dict(packages)
+
+
+class Command(BaseCommand):
+    help = "Report the import time of a worker and check it against a budget"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--settings-module",
+            default=os.environ.get("DJANGO_SETTINGS_MODULE"),
+            help="Settings of the worker to measure",
+        )
+        parser.add_argument(
+            "--budget",
+            type=float,
+            default=settings.IMPORT_TIME_BUDGET_MS,
+            help="Maximum import time in milliseconds",
+        )
+        parser.add_argument("--top", type=int, default=15)
+
+    def handle(self, *args, **options):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": options["settings_module"]}
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", WORKER_STARTUP],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+
+        total, packages = parse_importtime(result.stderr)
+        self.stdout.write("%-30s %10s %7s" % ("package", "self ms", "share"))
+        ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+        for name, own in ranked[: options["top"]]:
+            self.stdout.write(
+                "%-30s %10.1f %6.1f%%" % (name, own / 1000, own / total * 100)
+            )
+        self.stdout.write(
+            "Total %.1f ms (budget %.1f ms), max RSS %d MB"
+            % (total / 1000, options["budget"], int(result.stdout.split()[-1]) // 1024)
+        )
+        if total / 1000 > options["budget"]:
+            raise CommandError(
+                "Import time %.1f ms is over the budget of %.1f ms"
+                % (total / 1000, options["budget"])
+            )
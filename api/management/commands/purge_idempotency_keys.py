@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from api.idempotency import get_expiry
+from app.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Delete the stored responses of expired idempotency keys"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        expired = IdempotencyKey.objects.filter(created_at__lt=get_expiry())
+        deleted = 0
+        while True:
+            # Small batches keep each DELETE from holding locks for long.
+            batch = list(expired.values_list("pk", flat=True)[: options["batch_size"]])
+            if not batch:
+                break
+            deleted += IdempotencyKey.objects.filter(pk__in=batch).delete()[0]
+        self.stdout.write("%d idempotency keys deleted" % deleted)
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+
+class APIGZipMiddleware(GZipMiddleware):
+    """Gzip JSON responses of at least ``API_GZIP_MIN_LENGTH`` bytes.
+
+    Streaming responses, such as the project event stream, are left alone
+    because compressing them would buffer the events.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming:
+            return response
+        content_type = response.get("Content-Type", "")
+        if "json" not in content_type.split(";")[0]:
+            return response
+        if len(response.content) < settings.API_GZIP_MIN_LENGTH:
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,34 @@
+from django.utils.http import parse_etags
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def get_etag(instance):
+    return '"%d"' % instance.version
+
+
+def if_match(request, instance):
+    """Return whether ``If-Match`` allows writing ``instance``.
+
+    Without the header the write is still checked against the version the
+    view has read. Weak tags match too: GZipMiddleware weakens the tags of the
+    responses it compresses, and the version is the same in every encoding.
+    """
+    header = request.headers.get("If-Match")
+    if header is None:
+        return True
+    etags = [etag.removeprefix("W/") for etag in parse_etags(header)]
+    return etags == ["*"] or get_etag(instance) in etags
+
+
+def precondition_failed():
+    return Response(
+        {"detail": _("The resource has been modified since it was read")},
+        status=status.HTTP_412_PRECONDITION_FAILED,
+    )
+
+
+def with_etag(response, instance):
+    response["ETag"] = get_etag(instance)
+    return response
@@ -0,0 +1,69 @@
+import functools
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import translation
+
+# Packages whose source makes up the schema when CODE_VERSION is not set.
+SOURCE_PACKAGES = ["api", "app"]
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def get_code_version():
+    """Return ``CODE_VERSION``, or a fingerprint of the API source files."""
+    if settings.CODE_VERSION:
+        return settings.CODE_VERSION
+    digest = hashlib.md5()
+    for package in SOURCE_PACKAGES:
+        for path in sorted((Path(settings.BASE_DIR) / package).rglob("*.py")):
+            digest.update(f"{path}:{path.stat().st_mtime_ns}".encode())
+    return digest.hexdigest()[:12]
+
+
+def schema_path(language):
+    return os.path.join(
+        settings.SCHEMA_CACHE_DIR, f"openapi-{get_code_version()}-{language}.json"
+    )
+
+
+def generate_schema(language):
+    """Write the schema of ``language`` to its file and return its content."""
+    # Imported here as only the first request of a new version needs them.
+    from drf_spectacular.generators import SchemaGenerator
+    from drf_spectacular.renderers import OpenApiJsonRenderer
+
+    with translation.override(language):
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+        content = OpenApiJsonRenderer().render(schema, renderer_context={})
+
+    path = schema_path(language)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Written aside and renamed so other workers never read a partial file.
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, "wb") as file:
+        file.write(content)
+    os.chmod(temp_path, 0o644)
+    os.replace(temp_path, path)
+    return content
+
+
+def get_schema(language):
+    """Return ``(content, etag)`` of the schema, generating it when missing."""
+    path = schema_path(language)
+    if path not in _loaded:
+        with _lock:
+            if path not in _loaded:
+                try:
+                    with open(path, "rb") as file:
+                        content = file.read()
+                except FileNotFoundError:
+                    content = generate_schema(language)
+                _loaded[path] = (content, hashlib.md5(content).hexdigest())
+    return _loaded[path]
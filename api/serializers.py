@@ -5,15 +5,115 @@ import datetime
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers, status
 from rest_framework.validators import UniqueValidator
 from app.models import Stage, UserProject, UserStage, Project, Task, Report
 from app.utils import constants
+from app.utils.activity import record
 from app.utils.helpers import check_token
+from app.utils.members import transfer_stage_owner
+from app.utils.permissions import refresh_permissions
+
+
+def parse_paths(value):
+    """Turn ``"name,stages.name"`` into ``{"name": {}, "stages": {"name": {}}}``."""
+    if not value:
+        return None
+    tree = {}
+    for path in value.split(","):
+        node = tree
+        for name in filter(None, path.strip().split(".")):
+            node = node.setdefault(name, {})
+    return tree
+
+
+def get_branch(tree, path):
+    for name in path:
+        if not tree:
+            return None
+        tree = tree.get(name)
+    return tree or None
+
+
+class SparseFieldsMixin:
+    """Represent only the fields asked for with ``?fields=`` and ``?expand=``.
+
+    Both take comma separated names, dotted for nested serializers, like
+    ``fields=name,stages.name``. Fields in ``Meta.expandable_fields`` are left
+    out unless expanded, or named in ``fields``; views expand some by default
+    with the ``expand`` argument. Fields left out are never read, nor their
+    queries run. Writes are not affected.
+    """
+
+    def __init__(self, *args, expand=(), **kwargs):
+        self.default_expand = set(expand)
+        super().__init__(*args, **kwargs)
+
+    def get_path(self):
+        path = []
+        field = self
+        while field.parent is not None:
+            if getattr(field, "field_name", ""):
+                path.insert(0, field.field_name)
+            field = field.parent
+        return path
+
+    @cached_property
+    def selection(self):
+        request = self.context.get("request")
+        params = request.query_params if request is not None else {}
+        path = self.get_path()
+        selected = get_branch(parse_paths(params.get("fields")), path)
+        expanded = get_branch(parse_paths(params.get("expand")), path) or {}
+        return selected, expanded
+
+    def is_selected(self, name):
+        selected, expanded = self.selection
+        if name in expanded:
+            return True
+        if selected is not None:
+            return name in selected
+        if name in self.default_expand:
+            return True
+        return name not in getattr(self.Meta, "expandable_fields", ())
+
+    @property
+    def _readable_fields(self):
+        for field in super()._readable_fields:
+            if self.is_selected(field.field_name):
+                yield field
+
+    def prepare(self, queryset, *extra):
+        """Load only the columns of the selected fields, when some were picked.
+
+        ``extra`` names columns needed anyway, like the key of a prefetch.
+        """
+        if self.selection[0] is None:
+            return queryset
+        concrete = {field.name for field in queryset.model._meta.concrete_fields}
+        columns = [
+            field.source for field in self._readable_fields if field.source in concrete
+        ]
+        if "version" in concrete:
+            columns.append("version")
+        return queryset.only(*columns, *extra)
+
+
+class VersionedSerializerMixin:
+    """Write updates with one UPDATE conditioned on the version read."""
+
+    def update(self, instance, validated_data):
+        for name, value in validated_data.items():
+            setattr(instance, name, value)
+        instance.save_if_version(instance.version, list(validated_data))
+        return instance
 
 
-class SignUpSerializers(serializers.ModelSerializer):
+class SignUpSerializers(SparseFieldsMixin, serializers.ModelSerializer):
     username = serializers.CharField(
         max_length=30,
         label=_("Username"),
@@ -70,7 +170,7 @@ class SignUpSerializers(serializers.ModelSerializer):
         return user
 
 
-class VerifySerializers(serializers.ModelSerializer):
+class VerifySerializers(SparseFieldsMixin, serializers.ModelSerializer):
     pk = serializers.IntegerField(label=_("User ID"))
     verify_token = serializers.CharField(max_length=255, label=_("Verify token"))
 
@@ -90,19 +190,24 @@ class VerifySerializers(serializers.ModelSerializer):
         return instance
 
 
-class StageSerializers(serializers.ModelSerializer):
+class StageSerializers(SparseFieldsMixin, serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(many=False, queryset=User.objects.all())
 
     class Meta:
         model = Stage
         fields = ["name", "start_date", "end_date", "user"]
 
+    def get_actor(self):
+        request = self.context.get("request")
+        return request.user if request else None
+
     def to_representation(self, instance):
         representation = super().to_representation(instance)
 
-        representation["user"] = UserStage.objects.values("user_id").get(
-            stage=instance, role=constants.STAGE_OWNER
-        )
+        if "user" in representation:
+            representation["user"] = UserStage.objects.values("user_id").get(
+                stage=instance, role=constants.STAGE_OWNER
+            )
         return representation
 
     def validate(self, data):
@@ -125,47 +230,45 @@ class StageSerializers(serializers.ModelSerializer):
         stage = Stage.objects.create(project_id=project_id, **validated_data)
         UserStage.objects.create(user=user, stage=stage, role=constants.STAGE_OWNER)
         UserProject.objects.filter(user=user, project_id=project_id).update(
-            role=constants.STAGE_OWNER
+            role=constants.STAGE_OWNER, updated_at=timezone.now()
+        )
+        refresh_permissions(project_id, [user.pk])
+        record(
+            stage.project_id,
+            constants.ACTIVITY_STAGE_CREATED,
+            self.get_actor(),
+            stage.pk,
+            owner=user.pk,
         )
         return stage
 
     def update(self, instance, validated_data):
-        project_id = self.context.get("project_id")
         user = validated_data.pop("user")
 
         instance.name = validated_data.get("name", instance.name)
         instance.start_date = validated_data.get("start_date", instance.start_date)
         instance.end_date = validated_data.get("end_date", instance.end_date)
-        instance.save()
+        instance.save_if_version(instance.version, ["name", "start_date", "end_date"])
+        record(
+            instance.project_id,
+            constants.ACTIVITY_STAGE_UPDATED,
+            self.get_actor(),
+            instance.pk,
+        )
 
         if user:
-            UserProject.objects.filter(
-                project_id=project_id, role=constants.STAGE_OWNER
-            ).update(role=constants.MEMBER)
-
-            UserStage.objects.filter(stage=instance, role=constants.STAGE_OWNER).update(
-                role=constants.MEMBER
-            )
-
-            try:
-                stage_owner = UserStage.objects.get(user=user, stage=instance)
-                stage_owner.role = constants.STAGE_OWNER
-                stage_owner.save()
-            except ObjectDoesNotExist:
-                UserStage.objects.create(
-                    user=user, stage=instance, role=constants.STAGE_OWNER
-                )
+            transfer_stage_owner(instance, user.pk, self.get_actor())
 
         return instance
 
 
-class TaskSerializers(serializers.ModelSerializer):
+class TaskSerializers(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = ["content", "start_date", "end_date", "status"]
 
 
-class UserStageSerializers(serializers.ModelSerializer):
+class UserStageSerializers(SparseFieldsMixin, serializers.ModelSerializer):
     pk = serializers.IntegerField(source="user.pk")
     username = serializers.CharField(source="user.username")
     first_name = serializers.CharField(source="user.first_name")
@@ -176,7 +279,7 @@ class UserStageSerializers(serializers.ModelSerializer):
         fields = ["pk", "username", "first_name", "last_name", "role"]
 
 
-class StageListSerializers(serializers.ModelSerializer):
+class StageListSerializers(SparseFieldsMixin, serializers.ModelSerializer):
     task_set = TaskSerializers(many=True, read_only=True)
     members = UserStageSerializers(many=True, read_only=True)
     task_count = serializers.SerializerMethodField("get_task_count")
@@ -192,12 +295,32 @@ class StageListSerializers(serializers.ModelSerializer):
             "task_set",
             "members",
         ]
+        expandable_fields = ["members"]
+
+    def prepare(self, queryset, *extra):
+        queryset = super().prepare(queryset, *extra)
+        if self.is_selected("task_set"):
+            tasks = self.fields["task_set"].child
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "task_set", queryset=tasks.prepare(Task.objects.all(), "stage")
+                )
+            )
+        if self.is_selected("members"):
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "userstage_set",
+                    queryset=UserStage.objects.select_related("user"),
+                    to_attr="members",
+                )
+            )
+        return queryset
 
     def get_task_count(self, instance):
         return Task.objects.filter(stage=instance).count()
 
 
-class MemberProjectSerializer(serializers.ModelSerializer):
+class MemberProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     pk = serializers.SerializerMethodField("get_pk")
     first_name = serializers.SerializerMethodField("get_first_name")
     last_name = serializers.SerializerMethodField("get_last_name")
@@ -208,19 +331,21 @@ class MemberProjectSerializer(serializers.ModelSerializer):
         fields = ["pk", "first_name", "last_name", "email", "role"]
 
     def get_pk(self, instance):
-        return User.objects.get(pk=instance.user.pk).pk
+        return instance.user_id
 
     def get_first_name(self, instance):
-        return User.objects.get(pk=instance.user.pk).first_name
+        return instance.user.first_name
 
     def get_last_name(self, instance):
-        return User.objects.get(pk=instance.user.pk).last_name
+        return instance.user.last_name
 
     def get_email(self, instance):
-        return User.objects.get(pk=instance.user.pk).email
+        return instance.user.email
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(
+    SparseFieldsMixin, VersionedSerializerMixin, serializers.ModelSerializer
+):
     task_count = serializers.SerializerMethodField("get_task_count")
     stage_count = serializers.SerializerMethodField("get_stage_count")
     stages = StageListSerializers(many=True, read_only=True)
@@ -241,12 +366,34 @@ class ProjectSerializer(serializers.ModelSerializer):
             "stages",
             "members",
         ]
+        expandable_fields = ["stages", "members"]
+
+    def prepare(self, queryset):
+        queryset = super().prepare(queryset)
+        if self.is_selected("stages"):
+            stages = self.fields["stages"].child
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "stage_set",
+                    queryset=stages.prepare(Stage.objects.order_by("pk"), "project"),
+                    to_attr="stages",
+                )
+            )
+        if self.is_selected("members"):
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "userproject_set",
+                    queryset=UserProject.objects.select_related("user"),
+                    to_attr="members",
+                )
+            )
+        return queryset
 
     def get_pm(self, instance):
-        user_project = UserProject.objects.get(
+        user_project = UserProject.objects.select_related("user").get(
             project=instance, role=constants.PROJECT_MANAGER
         )
-        return User.objects.get(pk=user_project.user.pk).username
+        return user_project.user.username
 
     def get_stage_count(self, instance):
         return Stage.objects.filter(project=instance.pk).count()
@@ -261,6 +408,11 @@ class ProjectSerializer(serializers.ModelSerializer):
         return value
 
 
+class CloneProjectSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=50, label=_("Project name"))
+    start_date = serializers.DateField(label=_("Start date"), required=False)
+
+
 class ListUserSerializer(serializers.Serializer):
     user_ids = serializers.ListField(child=serializers.IntegerField())
 
@@ -289,7 +441,7 @@ class ListUserSerializer(serializers.Serializer):
         return value
 
 
-class AddMemberStageSerializers(serializers.ModelSerializer):
+class AddMemberStageSerializers(SparseFieldsMixin, serializers.ModelSerializer):
     user = serializers.ListField(child=serializers.IntegerField(label=_("User ID")))
 
     class Meta:
@@ -339,13 +491,97 @@ class AddMemberStageSerializers(serializers.ModelSerializer):
         return data
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(
+    SparseFieldsMixin, VersionedSerializerMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Task
         fields = ("content", "start_date", "end_date", "status", "user")
 
 
-class ReportSerializer(serializers.ModelSerializer):
+class ReportSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Report
         fields = ["content"]
+
+
+class TimelineQuerySerializer(serializers.Serializer):
+    bucket = serializers.ChoiceField(choices=["day", "week"], default="day")
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, data):
+        start = data.get("start")
+        end = data.get("end")
+        if start and end:
+            if start > end:
+                raise serializers.ValidationError(
+                    _("Start date must be before end date")
+                )
+            if (end - start).days > constants.TIMELINE_MAX_DAYS:
+                raise serializers.ValidationError(_("Date range is too long"))
+        return data
+
+
+class WorkloadQuerySerializer(serializers.Serializer):
+    projects = serializers.ListField(
+        child=serializers.IntegerField(label=_("Project ID")), allow_empty=False
+    )
+    start = serializers.DateField()
+    end = serializers.DateField()
+
+    def validate(self, data):
+        if data["start"] > data["end"]:
+            raise serializers.ValidationError(_("Start date must be before end date"))
+        if (data["end"] - data["start"]).days > constants.TIMELINE_MAX_DAYS:
+            raise serializers.ValidationError(_("Date range is too long"))
+        return data
+
+
+class ChangesQuerySerializer(serializers.Serializer):
+    since = serializers.CharField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=500, default=100)
+
+
+class RemoveMembersSerializer(serializers.Serializer):
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(label=_("User ID")),
+        allow_empty=False,
+        max_length=constants.BULK_MEMBERS_MAX,
+    )
+
+
+class ActivityQuerySerializer(serializers.Serializer):
+    before = serializers.IntegerField(min_value=1, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=200, default=50)
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    type = serializers.ChoiceField(
+        choices=[name for _, name in constants.SEARCH_KIND_CHOICES], required=False
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    offset = serializers.IntegerField(min_value=0, max_value=10000, default=0)
+
+
+class BatchItemSerializer(serializers.Serializer):
+    id = serializers.CharField(max_length=64)
+    method = serializers.ChoiceField(choices=["GET", "POST", "PUT", "PATCH", "DELETE"])
+    path = serializers.CharField(max_length=2000)
+    body = serializers.JSONField(required=False, allow_null=True)
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = serializers.ListField(
+        child=BatchItemSerializer(),
+        min_length=1,
+        max_length=constants.BATCH_MAX_REQUESTS,
+    )
+    concurrent = serializers.BooleanField(default=False)
+
+    def validate_requests(self, value):
+        ids = [item["id"] for item in value]
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError(_("Request ids must be unique."))
+        return value
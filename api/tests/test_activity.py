@@ -0,0 +1,135 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import status
+
+from api.tests.test_setup import TestSetUp
+from app.models import ActivityLog, Project, Stage, UserProject
+from app.utils import activity, constants
+
+
+class ActivityLogTest(TestSetUp):
+    def setUp(self):
+        self.project = Project.objects.create(name="Project", end_date="2024-02-01")
+        UserProject.objects.create(
+            user=self.user, project=self.project, role=constants.PROJECT_MANAGER
+        )
+        self.members = [
+            get_user_model().objects.create_user(username=username)
+            for username in ["member1", "member2"]
+        ]
+        for user in self.members:
+            UserProject.objects.create(user=user, project=self.project)
+        self.url = reverse("project_activity", kwargs={"project_id": self.project.pk})
+        self.client.force_authenticate(self.user)
+
+    def test_buffered_entries_are_written_together(self):
+        with self.assertNumQueries(1):
+            with self.captureOnCommitCallbacks(execute=True):
+                with activity.buffered():
+                    for user in self.members:
+                        activity.record(
+                            self.project.pk,
+                            constants.ACTIVITY_MEMBER_ADDED,
+                            self.user,
+                            user.pk,
+                        )
+
+        self.assertEqual(ActivityLog.objects.count(), 2)
+
+    def test_rolled_back_changes_are_not_logged(self):
+        with self.captureOnCommitCallbacks(execute=True), activity.buffered():
+            try:
+                with transaction.atomic():
+                    activity.record(self.project.pk, constants.ACTIVITY_PROJECT_CLOSED)
+                    raise ValueError
+            except ValueError:
+                pass
+
+        self.assertFalse(ActivityLog.objects.exists())
+
+    def test_api_mutations_are_logged(self):
+        remove_url = reverse(
+            "remove_members_of_project", kwargs={"project_id": self.project.pk}
+        )
+        delete_url = reverse("delete_project", kwargs={"project_id": self.project.pk})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                remove_url, {"user_ids": [user.pk for user in self.members]}
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(delete_url)
+
+        self.assertEqual(
+            list(
+                ActivityLog.objects.order_by("pk").values_list(
+                    "action", "actor", "object_id"
+                )
+            ),
+            [
+                (constants.ACTIVITY_MEMBER_REMOVED, self.user.pk, self.members[0].pk),
+                (constants.ACTIVITY_MEMBER_REMOVED, self.user.pk, self.members[1].pk),
+                (constants.ACTIVITY_PROJECT_CLOSED, self.user.pk, self.project.pk),
+            ],
+        )
+
+    def test_stage_owner_change_is_logged(self):
+        stage = Stage.objects.create(
+            name="Stage",
+            start_date="2024-01-01",
+            end_date="2024-01-10",
+            project=self.project,
+        )
+        stage.userstage_set.create(user=self.members[0], role=constants.STAGE_OWNER)
+        url = reverse(
+            "stage_detail",
+            kwargs={"project_id": self.project.pk, "stage_id": stage.pk},
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(
+                url,
+                {
+                    "name": "Stage",
+                    "start_date": "2024-01-01",
+                    "end_date": "2024-01-10",
+                    "user": self.members[1].pk,
+                },
+            )
+
+        entry = ActivityLog.objects.get(action=constants.ACTIVITY_STAGE_OWNER_CHANGED)
+        self.assertEqual(entry.object_id, stage.pk)
+        self.assertEqual(
+            entry.data, {"old": [self.members[0].pk], "new": self.members[1].pk}
+        )
+
+    def test_paginate_activity(self):
+        ActivityLog.objects.bulk_create(
+            [
+                ActivityLog(
+                    project=self.project,
+                    action=constants.ACTIVITY_MEMBER_ADDED,
+                    object_id=index,
+                    month=202401,
+                )
+                for index in range(5)
+            ]
+        )
+
+        response = self.client.get(self.url, {"limit": 3})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [entry["object_id"] for entry in response.data["results"]], [4, 3, 2]
+        )
+        self.assertEqual(response.data["results"][0]["action"], "member_added")
+
+        response = self.client.get(
+            self.url, {"limit": 3, "before": response.data["before"]}
+        )
+
+        self.assertEqual(
+            [entry["object_id"] for entry in response.data["results"]], [1, 0]
+        )
+        self.assertIsNone(response.data["before"])
@@ -0,0 +1,172 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from api.tests.test_setup import TestSetUp
+from app.models import Project, Stage, Task, UserProject
+from app.utils import constants
+
+
+class BatchTest(TestSetUp):
+    def setUp(self):
+        self.project = Project.objects.create(name="Project", end_date="2024-02-01")
+        UserProject.objects.create(
+            user=self.user, project=self.project, role=constants.PROJECT_MANAGER
+        )
+        self.stage = Stage.objects.create(
+            name="Stage",
+            start_date="2024-01-01",
+            end_date="2024-01-10",
+            project=self.project,
+        )
+        self.task = Task.objects.create(
+            content="Task",
+            start_date="2024-01-01",
+            end_date="2024-01-02",
+            stage=self.stage,
+        )
+        self.url = reverse("batch")
+        self.stage_kwargs = {"project_id": self.project.pk, "stage_id": self.stage.pk}
+        self.client.force_authenticate(self.user)
+
+    def batch(self, requests, **data):
+        response = self.client.post(
+            self.url, {"requests": requests, **data}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["responses"]
+
+    def get(self, id, name, **kwargs):
+        return {"id": id, "method": "GET", "path": reverse(name, kwargs=kwargs)}
+
+    def test_responses_are_keyed_by_id(self):
+        responses = self.batch(
+            [
+                self.get("project", "project_detail", project_id=self.project.pk),
+                self.get("stage", "stage_detail", **self.stage_kwargs),
+                self.get("tasks", "stage_tasks", **self.stage_kwargs),
+            ]
+        )
+
+        self.assertEqual(responses["project"]["status"], status.HTTP_200_OK)
+        self.assertEqual(responses["project"]["body"]["name"], "Project")
+        self.assertIn("ETag", responses["stage"]["headers"])
+        self.assertEqual(
+            [task["content"] for task in responses["tasks"]["body"]["results"]],
+            ["Task"],
+        )
+
+    def test_failures_are_per_request(self):
+        other = Project.objects.create(name="Other", end_date="2024-02-01")
+        UserProject.objects.create(
+            user=get_user_model().objects.create_user(username="other"),
+            project=other,
+        )
+
+        responses = self.batch(
+            [
+                self.get("mine", "project_detail", project_id=self.project.pk),
+                self.get("other", "project_detail", project_id=other.pk),
+                {"id": "missing", "method": "GET", "path": "/api/nowhere"},
+                {"id": "nested", "method": "POST", "path": self.url},
+            ]
+        )
+
+        self.assertEqual(responses["mine"]["status"], status.HTTP_200_OK)
+        self.assertEqual(responses["other"]["status"], status.HTTP_403_FORBIDDEN)
+        self.assertEqual(responses["missing"]["status"], status.HTTP_404_NOT_FOUND)
+        self.assertEqual(responses["nested"]["status"], status.HTTP_400_BAD_REQUEST)
+
+    def test_server_errors_are_per_request(self):
+        # TaskList reads the project with get(), which raises DoesNotExist.
+        missing = {"project_id": 0, "stage_id": self.stage.pk}
+
+        with self.assertLogs("api.batch", "ERROR"):
+            responses = self.batch(
+                [
+                    self.get("broken", "stage_tasks", **missing),
+                    self.get("tasks", "stage_tasks", **self.stage_kwargs),
+                ]
+            )
+
+        self.assertEqual(
+            responses["broken"]["status"], status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+        self.assertEqual(responses["tasks"]["status"], status.HTTP_200_OK)
+
+    def count_permission_checks(self, requests):
+        with CaptureQueriesContext(connection) as queries:
+            self.batch(requests)
+        return sum("effectivepermission" in query["sql"] for query in queries)
+
+    def test_permission_checks_are_shared(self):
+        single = self.count_permission_checks(
+            [self.get("a", "stage_detail", **self.stage_kwargs)]
+        )
+        repeated = self.count_permission_checks(
+            [
+                self.get(id, "stage_detail", **self.stage_kwargs)
+                for id in ["a", "b", "c"]
+            ]
+        )
+
+        self.assertGreater(single, 0)
+        self.assertEqual(repeated, single)
+
+    def test_writes(self):
+        responses = self.batch(
+            [
+                {
+                    "id": "rename",
+                    "method": "PATCH",
+                    "path": reverse(
+                        "task_detail",
+                        kwargs={**self.stage_kwargs, "task_id": self.task.pk},
+                    ),
+                    "body": {"content": "Renamed"},
+                }
+            ],
+            concurrent=True,
+        )
+
+        self.assertEqual(responses["rename"]["status"], status.HTTP_200_OK)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.content, "Renamed")
+
+    def test_preconditions_of_the_batch_are_not_passed_on(self):
+        response = self.client.post(
+            self.url,
+            {
+                "requests": [
+                    self.get("stage", "stage_detail", **self.stage_kwargs),
+                    {
+                        "id": "rename",
+                        "method": "PATCH",
+                        "path": reverse(
+                            "task_detail",
+                            kwargs={**self.stage_kwargs, "task_id": self.task.pk},
+                        ),
+                        "body": {"content": "Renamed"},
+                    },
+                ]
+            },
+            format="json",
+            HTTP_IF_MATCH='"0"',
+            HTTP_IF_NONE_MATCH="*",
+        )
+
+        responses = response.data["responses"]
+        self.assertEqual(responses["stage"]["status"], status.HTTP_200_OK)
+        self.assertEqual(responses["stage"]["body"]["name"], "Stage")
+        self.assertEqual(responses["rename"]["status"], status.HTTP_200_OK)
+
+    def test_ids_must_be_unique(self):
+        request = self.get("same", "project_detail", project_id=self.project.pk)
+
+        response = self.client.post(
+            self.url, {"requests": [request, request]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,149 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+
+from api.tests.test_setup import TestSetUp
+from app.models import Project, Stage, Task, UserProject, UserStage
+from app.utils import constants
+from app.utils.ics import fold, get_feed_token
+from app.utils.members import remove_members
+from app.utils.permissions import refresh_permissions
+from app.utils.queries import delete_without_signals
+
+
+class CalendarFeedTest(TestSetUp):
+    def setUp(self):
+        cache.clear()
+        self.project = Project.objects.create(name="Website", end_date="2099-01-01")
+        UserProject.objects.create(
+            user=self.user, project=self.project, role=constants.PROJECT_MANAGER
+        )
+        self.stage = Stage.objects.create(
+            name="Launch",
+            start_date=datetime.date.today(),
+            end_date=datetime.date.today() + datetime.timedelta(days=7),
+            project=self.project,
+        )
+        UserStage.objects.create(
+            user=self.user, stage=self.stage, role=constants.STAGE_OWNER
+        )
+        self.task = self.create_task("Write copy; review, then ship")
+        self.url = reverse("calendar_feed", args=[get_feed_token(self.user)])
+
+    def create_task(self, content, days=3, user=None):
+        return Task.objects.create(
+            content=content,
+            start_date=datetime.date.today(),
+            end_date=datetime.date.today() + datetime.timedelta(days=days),
+            stage=self.stage,
+            user=user or self.user,
+        )
+
+    def get(self, **headers):
+        response = self.client.get(self.url, headers=headers)
+        content = b"".join(getattr(response, "streaming_content", [])).decode()
+        return response, content
+
+    def test_feed_url(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(reverse("calendar"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["url"].endswith(self.url))
+
+    def test_feed(self):
+        self.create_task("Old", days=-constants.CALENDAR_PAST_DAYS - 1)
+        other = get_user_model().objects.create_user(username="other")
+        self.create_task("Not mine", user=other)
+
+        response, content = self.get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        self.assertTrue(content.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertIn("UID:stage-%d@" % self.stage.pk, content)
+        self.assertIn("UID:task-%d@" % self.task.pk, content)
+        self.assertIn("SUMMARY:Write copy\\; review\\, then ship\r\n", content)
+        self.assertNotIn("Old", content)
+        self.assertNotIn("Not mine", content)
+
+    def test_unchanged_polls_skip_the_database(self):
+        response, content = self.get()
+
+        with self.assertNumQueries(0):
+            cached, cached_content = self.get()
+        with self.assertNumQueries(0):
+            not_modified, _ = self.get(if_none_match=response["ETag"])
+
+        self.assertEqual(cached_content, content)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_changes_are_picked_up(self):
+        etag = self.get()[0]["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.content = "Ship it"
+            self.task.save()
+        response, content = self.get(if_none_match=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("SUMMARY:Ship it", content)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_new_projects_are_picked_up(self):
+        etag = self.get()[0]["ETag"]
+        project = Project.objects.create(name="Other", end_date="2099-01-01")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserProject.objects.create(user=self.user, project=project)
+
+        self.assertNotEqual(self.get()[0]["ETag"], etag)
+
+    def add_member(self):
+        member = get_user_model().objects.create_user(username="member")
+        UserProject.objects.create(user=member, project=self.project)
+        UserStage.objects.create(user=member, stage=self.stage)
+        self.url = reverse("calendar_feed", args=[get_feed_token(member)])
+        return member
+
+    def test_removed_members_lose_the_project(self):
+        member = self.add_member()
+        response, content = self.get()
+        self.assertIn("UID:stage-%d@" % self.stage.pk, content)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            remove_members(self.project.pk, [member.pk])
+        removed, content = self.get(if_none_match=response["ETag"])
+
+        self.assertEqual(removed.status_code, status.HTTP_200_OK)
+        self.assertNotIn("UID:stage-%d@" % self.stage.pk, content)
+
+    def test_refresh_of_everyone_forgets_removed_members(self):
+        member = self.add_member()
+        etag = self.get()[0]["ETag"]
+        # Bulk deletes skip the signals, so everyone is refreshed afterwards.
+        delete_without_signals(UserStage.objects.filter(user=member))
+        delete_without_signals(UserProject.objects.filter(user=member))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            refresh_permissions(self.project.pk)
+        response, content = self.get(if_none_match=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("UID:stage-%d@" % self.stage.pk, content)
+
+    def test_bad_token(self):
+        self.url = reverse("calendar_feed", args=["1:forged"])
+
+        self.assertEqual(self.get()[0].status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_fold(self):
+        lines = fold("SUMMARY:" + "é" * 50).split("\r\n")
+
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(all(len(line.encode()) <= 75 for line in lines))
+        self.assertTrue(lines[1].startswith(" "))
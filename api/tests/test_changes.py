@@ -0,0 +1,65 @@
+from django.urls import reverse
+from rest_framework import status
+
+from api.tests.test_setup import TestSetUp
+from app.models import Project, Stage, Task, UserProject
+from app.utils import constants
+
+
+class ProjectChangesTest(TestSetUp):
+    def setUp(self):
+        self.project = Project.objects.create(name="Project", end_date="2024-02-01")
+        UserProject.objects.create(
+            user=self.user, project=self.project, role=constants.PROJECT_MANAGER
+        )
+        self.stage = Stage.objects.create(
+            name="Stage",
+            start_date="2024-01-01",
+            end_date="2024-01-10",
+            project=self.project,
+        )
+        self.task = Task.objects.create(
+            content="Task",
+            start_date="2024-01-02",
+            end_date="2024-01-03",
+            stage=self.stage,
+        )
+        self.url = reverse("project_changes", kwargs={"project_id": self.project.pk})
+        self.client.force_authenticate(self.user)
+
+    def fetch_all(self, since=None):
+        changes = []
+        while True:
+            params = {"limit": 2}
+            if since:
+                params["since"] = since
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            changes += response.data["changes"]
+            since = response.data["cursor"]
+            if not response.data["has_more"]:
+                return changes, since
+
+    def test_paginate_changes(self):
+        changes, cursor = self.fetch_all()
+        self.assertEqual(
+            sorted(change["type"] for change in changes),
+            ["project", "project_member", "stage", "task"],
+        )
+
+        changes, cursor = self.fetch_all(cursor)
+        self.assertEqual(changes, [])
+
+        task_id = self.task.pk
+        self.task.delete()
+        self.stage.delete()
+        changes, cursor = self.fetch_all(cursor)
+        self.assertEqual(
+            [(change["type"], change["op"], change["id"]) for change in changes],
+            [("task", "delete", task_id), ("stage", "upsert", self.stage.pk)],
+        )
+        self.assertIsNotNone(changes[1]["data"]["deleted_at"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"since": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
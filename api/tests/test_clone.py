@@ -0,0 +1,122 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+
+from api.tests.test_setup import TestSetUp
+from app.models import Project, Stage, Task, UserProject, UserStage
+from app.utils import constants
+from app.utils.cloning import clone_project
+from app.utils.helpers import is_pm_or_stage_owner
+from app.utils.search import search
+
+
+class CloneProjectTest(TestSetUp):
+    def setUp(self):
+        self.template = Project.objects.create(
+            name="Template", describe="Standard", end_date="2024-03-01"
+        )
+        self.template.refresh_from_db()
+        UserProject.objects.create(
+            user=self.user, project=self.template, role=constants.PROJECT_MANAGER
+        )
+        self.owner = get_user_model().objects.create_user(username="owner")
+        UserProject.objects.create(
+            user=self.owner, project=self.template, role=constants.STAGE_OWNER
+        )
+        self.stages = [
+            Stage.objects.create(
+                name=name,
+                start_date=start,
+                end_date=end,
+                project=self.template,
+                status=constants.STAGE_STATUS_CHOICES[-1][0],
+            )
+            for name, start, end in [
+                ("Design", "2024-01-01", "2024-01-10"),
+                ("Build", "2024-01-11", "2024-02-01"),
+            ]
+        ]
+        UserStage.objects.create(
+            user=self.owner, stage=self.stages[1], role=constants.STAGE_OWNER
+        )
+        for index in range(30):
+            Task.objects.create(
+                content="Checklist item %d" % index,
+                start_date="2024-01-12",
+                end_date="2024-01-13",
+                stage=self.stages[index % 2],
+                user=self.owner,
+            )
+        self.url = reverse("clone_project", kwargs={"project_id": self.template.pk})
+
+    def test_copies_with_shifted_dates(self):
+        project = clone_project(
+            self.template, "Copy", start_date=datetime.date(2024, 6, 1)
+        )
+
+        self.assertEqual(project.end_date, datetime.date(2024, 7, 31))
+        stages = list(Stage.objects.filter(project=project).order_by("pk"))
+        self.assertEqual(
+            [(stage.name, str(stage.start_date)) for stage in stages],
+            [("Design", "2024-06-01"), ("Build", "2024-06-11")],
+        )
+        self.assertEqual(
+            {stage.status for stage in stages}, {constants.STAGE_STATUS_DEFAULT}
+        )
+        tasks = Task.objects.filter(stage__project=project)
+        self.assertEqual(tasks.count(), 30)
+        self.assertEqual(tasks.filter(stage=stages[0]).count(), 15)
+        self.assertEqual(str(tasks.first().start_date), "2024-06-12")
+        self.assertEqual(
+            set(
+                UserProject.objects.filter(project=project).values_list("user", "role")
+            ),
+            {
+                (self.user.pk, constants.PROJECT_MANAGER),
+                (self.owner.pk, constants.STAGE_OWNER),
+            },
+        )
+        self.assertTrue(is_pm_or_stage_owner(self.owner, stages[1], project))
+        self.assertEqual(
+            search(self.owner, "checklist", constants.SEARCH_TASK)["count"], 60
+        )
+
+    def test_writes_do_not_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as few:
+            clone_project(self.template, "Few")
+        # Few enough rows that SQLite still takes each table in one insert.
+        for index in range(10):
+            Task.objects.create(
+                content="More",
+                start_date="2024-01-12",
+                end_date="2024-01-13",
+                stage=self.stages[0],
+            )
+
+        with CaptureQueriesContext(connection) as many:
+            clone_project(self.template, "Many")
+
+        self.assertEqual(len(many), len(few))
+
+    def test_api(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.post(
+            self.url, {"name": "Copy", "start_date": "2024-06-01"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["name"], "Copy")
+        self.assertEqual(response.data["stage_count"], 2)
+        self.assertEqual(response.data["task_count"], 30)
+
+    def test_only_pm_can_clone(self):
+        self.client.force_authenticate(self.owner)
+
+        response = self.client.post(self.url, {"name": "Copy"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
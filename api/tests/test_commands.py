@@ -0,0 +1,68 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from app.models import Project, Stage, Task
+from app.utils import constants
+
+
+class EvaluateStageHealthTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        project = Project.objects.create(name="Project", end_date=today)
+        cls.lagging = Stage.objects.create(
+            name="Lagging",
+            start_date=today - datetime.timedelta(days=9),
+            end_date=today,
+            project=project,
+        )
+        cls.on_track = Stage.objects.create(
+            name="On track",
+            start_date=today - datetime.timedelta(days=9),
+            end_date=today,
+            project=project,
+            status=constants.SLOWED,
+        )
+        cls.closed = Stage.objects.create(
+            name="Closed",
+            start_date=today - datetime.timedelta(days=9),
+            end_date=today,
+            project=project,
+            status=constants.CLOSED,
+        )
+        for stage, task_status in [
+            (cls.lagging, constants.TASK_NEW),
+            (cls.lagging, constants.TASK_RESOLVED),
+            (cls.on_track, constants.TASK_RESOLVED),
+            (cls.on_track, constants.TASK_REJECTED),
+            (cls.closed, constants.TASK_NEW),
+        ]:
+            Task.objects.create(
+                content="Task",
+                start_date=stage.start_date,
+                end_date=stage.end_date,
+                status=task_status,
+                stage=stage,
+            )
+
+    def test_evaluate_stage_health(self):
+        out = StringIO()
+        call_command("evaluate_stage_health", stdout=out)
+        self.assertEqual(
+            out.getvalue().strip(), "1 stages slowed, 1 stages back on track"
+        )
+        self.lagging.refresh_from_db()
+        self.on_track.refresh_from_db()
+        self.closed.refresh_from_db()
+        self.assertEqual(self.lagging.status, constants.SLOWED)
+        self.assertEqual(self.on_track.status, constants.ACTIVE)
+        self.assertEqual(self.closed.status, constants.CLOSED)
+
+    def test_dry_run(self):
+        call_command("evaluate_stage_health", "--dry-run", stdout=StringIO())
+        self.lagging.refresh_from_db()
+        self.assertEqual(self.lagging.status, constants.ACTIVE)
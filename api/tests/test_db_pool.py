@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import tempfile
+import threading
+
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+from projectmanagement.db import pool
+from projectmanagement.db.pool import ConnectionPool, PoolTimeout, pool_stats
+
+
+def ping(conn):
+    conn.execute("SELECT 1")
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    def setUp(self):
+        self.pool = ConnectionPool(
+            lambda: sqlite3.connect(":memory:", check_same_thread=False),
+            max_size=2,
+            timeout=0.2,
+            ping=ping,
+        )
+
+    def tearDown(self):
+        self.pool.dispose()
+
+    def test_reuse_connection(self):
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+        self.assertIs(self.pool.acquire(), conn)
+        self.assertEqual(self.pool.stats()["created"], 1)
+
+    def test_stats_in_use(self):
+        first = self.pool.acquire()
+        self.pool.acquire()
+        stats = self.pool.stats()
+        self.assertEqual(stats["in_use"], 2)
+        self.assertEqual(stats["idle"], 0)
+        self.pool.release(first)
+        self.assertEqual(self.pool.stats()["in_use"], 1)
+
+    def test_checkout_timeout(self):
+        self.pool.acquire()
+        self.pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            self.pool.acquire()
+        stats = self.pool.stats()
+        self.assertEqual(stats["waits"], 1)
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertGreater(stats["wait_time"], 0)
+
+    def test_waiter_gets_released_connection(self):
+        conn = self.pool.acquire()
+        self.pool.acquire()
+        self.pool.timeout = 5
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(self.pool.acquire()))
+        waiter.start()
+        self.pool.release(conn)
+        waiter.join()
+        self.assertIs(result[0], conn)
+        self.assertEqual(self.pool.stats()["waits"], 1)
+
+    def test_broken_connection_replaced(self):
+        conn = self.pool.acquire()
+        self.pool.release(conn)
+        conn.close()
+        new_conn = self.pool.acquire()
+        self.assertIsNot(new_conn, conn)
+        self.assertEqual(self.pool.stats()["discarded"], 1)
+
+    def test_release_discard(self):
+        conn = self.pool.acquire()
+        self.pool.release(conn, discard=True)
+        stats = self.pool.stats()
+        self.assertEqual(stats["size"], 0)
+        self.assertEqual(stats["idle"], 0)
+
+
+class PooledBackendTest(SimpleTestCase):
+    alias = "pooled"
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        handler = ConnectionHandler(
+            {
+                "default": {"ENGINE": "django.db.backends.dummy"},
+                self.alias: {
+                    "ENGINE": "projectmanagement.db.backends.sqlite3",
+                    "NAME": os.path.join(directory.name, "db.sqlite3"),
+                    "POOL": {"MAX_SIZE": 2},
+                }
+            }
+        )
+        self.connection = handler[self.alias]
+        self.addCleanup(self.dispose)
+
+    def dispose(self):
+        self.connection.close()
+        pool._pools.pop((os.getpid(), self.alias)).dispose()
+
+    def test_closed_connection_is_reused(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        raw = self.connection.connection
+        self.assertEqual(pool_stats()[self.alias]["in_use"], 1)
+
+        self.connection.close()
+        stats = pool_stats()[self.alias]
+        self.assertEqual((stats["in_use"], stats["idle"]), (0, 1))
+
+        self.connection.ensure_connection()
+        self.assertIs(self.connection.connection, raw)
+        stats = pool_stats()[self.alias]
+        self.assertEqual((stats["in_use"], stats["idle"]), (1, 0))
+        self.assertEqual(stats["created"], 1)
@@ -0,0 +1,67 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from projectmanagement.db.middleware import ReplicaRoutingMiddleware
+from projectmanagement.db.routers import PrimaryReplicaRouter
+
+
+@override_settings(REPLICA_DATABASES=["replica_0"], REPLICA_STICKY_SECONDS=5)
+class ReplicaRoutingTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = PrimaryReplicaRouter()
+        self.used = []
+        cache.clear()
+
+    def view(self, write=False):
+        def get_response(request):
+            if write:
+                self.router.db_for_write(User)
+            self.used.append(self.router.db_for_read(User))
+            return HttpResponse()
+
+        return ReplicaRoutingMiddleware(get_response)
+
+    def test_safe_read_goes_to_replica(self):
+        self.view()(self.factory.get("/api/projects/list"))
+        self.assertEqual(self.used, ["replica_0"])
+
+    def test_unsafe_request_reads_primary(self):
+        self.view()(self.factory.post("/api/projects"))
+        self.assertEqual(self.used, ["default"])
+
+    def test_write_pins_request_and_sets_cookie(self):
+        response = self.view(write=True)(self.factory.get("/api/projects/list"))
+        self.assertEqual(self.used, ["default"])
+        self.assertIn("primary_until", response.cookies)
+
+    def test_sticky_cookie_reads_primary(self):
+        request = self.factory.get("/api/projects/list")
+        request.COOKIES["primary_until"] = str(int(time.time()) + 5)
+        self.view()(request)
+        self.assertEqual(self.used, ["default"])
+
+    def test_expired_cookie_reads_replica(self):
+        request = self.factory.get("/api/projects/list")
+        request.COOKIES["primary_until"] = str(int(time.time()) - 1)
+        self.view()(request)
+        self.assertEqual(self.used, ["replica_0"])
+
+    def test_sticky_jwt_user(self):
+        token = AccessToken()
+        token["user_id"] = 42
+        header = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+        self.view(write=True)(self.factory.patch("/api/projects/1", **header))
+        self.view()(self.factory.get("/api/projects/1/detail", **header))
+        self.view()(self.factory.get("/api/projects/1/detail"))
+        self.assertEqual(self.used, ["default", "default", "replica_0"])
+
+    @override_settings(REPLICA_DATABASES=[])
+    def test_without_replicas(self):
+        self.view()(self.factory.get("/api/projects/list"))
+        self.assertEqual(self.used, ["default"])
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app.events import broker, channel, subscribe
+from app.events.broker import RESYNC, Broker
+from app.models import Project, Stage, UserProject
+from app.utils import constants
+
+
+class BrokerTest(SimpleTestCase):
+    async def test_dispatch_from_thread(self):
+        events = Broker()
+        subscription = events.subscribe("project:1", 10)
+        thread = threading.Thread(
+            target=events.dispatch, args=("project:1", {"type": "task"})
+        )
+        thread.start()
+        thread.join()
+        event = await asyncio.wait_for(subscription.get(), 1)
+        self.assertEqual(event, {"type": "task"})
+
+    async def test_overflow_asks_for_resync(self):
+        events = Broker()
+        subscription = events.subscribe("project:1", 2)
+        for index in range(3):
+            events.dispatch("project:1", {"type": "task", "id": index})
+        await asyncio.sleep(0)
+        self.assertEqual(subscription.queue.qsize(), 1)
+        self.assertEqual(await subscription.get(), RESYNC)
+
+    async def test_unsubscribe(self):
+        events = Broker()
+        subscription = events.subscribe("project:1", 2)
+        subscription.close()
+        self.assertEqual(events.subscriber_count("project:1"), 0)
+
+
+class ProjectEventsTest(TestCase):
+    async def test_events_published_on_commit(self):
+        project = await Project.objects.acreate(name="Project", end_date="2024-02-01")
+        subscription = subscribe(project.pk)
+
+        def create_stage():
+            with self.captureOnCommitCallbacks(execute=True):
+                return Stage.objects.create(
+                    name="Stage",
+                    start_date="2024-01-01",
+                    end_date="2024-01-10",
+                    project=project,
+                )
+
+        stage = await sync_to_async(create_stage)()
+        event = await asyncio.wait_for(subscription.get(), 1)
+        subscription.close()
+        self.assertEqual(event, {"type": "stage", "action": "created", "id": stage.pk})
+        self.assertEqual(broker.subscriber_count(channel(project.pk)), 0)
+
+    async def test_event_stream_view(self):
+        user = await get_user_model().objects.acreate(username="user1")
+        project = await Project.objects.acreate(name="Project", end_date="2024-02-01")
+        await UserProject.objects.acreate(
+            user=user, project=project, role=constants.PROJECT_MANAGER
+        )
+        url = reverse("project_events", kwargs={"project_id": project.pk})
+
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 401)
+
+        token = AccessToken.for_user(user)
+        response = await self.async_client.get(
+            url, headers={"Authorization": f"Bearer {token}"}
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b"retry: 3000\n\n")
+        broker.dispatch(channel(project.pk), {"type": "task", "id": 1})
+        self.assertEqual(
+            await anext(stream), b'event: task\ndata: {"type": "task", "id": 1}\n\n'
+        )
+        await stream.aclose()
@@ -0,0 +1,112 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from api.tests.test_setup import TestSetUp
+from app.models import Project, Stage, Task, UserProject, UserStage
+from app.utils import constants
+
+
+class SparseFieldsTest(TestSetUp):
+    def setUp(self):
+        self.project = Project.objects.create(name="Project", end_date="2024-02-01")
+        UserProject.objects.create(
+            user=self.user, project=self.project, role=constants.PROJECT_MANAGER
+        )
+        self.member = get_user_model().objects.create_user(username="member")
+        UserProject.objects.create(user=self.member, project=self.project)
+        self.stages = [
+            Stage.objects.create(
+                name=name,
+                start_date="2024-01-01",
+                end_date="2024-01-10",
+                project=self.project,
+            )
+            for name in ["First", "Second"]
+        ]
+        UserStage.objects.create(
+            user=self.member, stage=self.stages[0], role=constants.STAGE_OWNER
+        )
+        for stage in self.stages:
+            Task.objects.create(
+                content="Task",
+                start_date="2024-01-01",
+                end_date="2024-01-02",
+                stage=stage,
+            )
+        self.detail_url = reverse(
+            "project_detail", kwargs={"project_id": self.project.pk}
+        )
+        self.client.force_authenticate(self.user)
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data, queries
+
+    def test_default_detail_is_unchanged(self):
+        data, _ = self.get(self.detail_url)
+
+        self.assertEqual(data["pm"], self.user.username)
+        self.assertEqual(data["task_count"], 2)
+        self.assertEqual(
+            [stage["name"] for stage in data["stages"]], ["First", "Second"]
+        )
+        self.assertEqual(len(data["stages"][0]["task_set"]), 1)
+        self.assertEqual(len(data["members"]), 2)
+
+    def test_fields_skip_their_queries(self):
+        _, full = self.get(self.detail_url)
+        data, sparse = self.get(self.detail_url, fields="name,status")
+
+        self.assertEqual(set(data), {"name", "status"})
+        self.assertLess(len(sparse), len(full))
+        self.assertFalse(
+            any('"app_stage"' in query["sql"] for query in sparse.captured_queries)
+        )
+
+    def test_nested_fields(self):
+        data, _ = self.get(self.detail_url, fields="name,stages.name")
+
+        self.assertEqual(set(data), {"name", "stages"})
+        self.assertEqual(
+            [dict(stage) for stage in data["stages"]],
+            [{"name": "First"}, {"name": "Second"}],
+        )
+
+    def test_list_expands_on_request(self):
+        url = reverse("project_list")
+        data, _ = self.get(url)
+        self.assertNotIn("stages", data["results"][0])
+
+        data, _ = self.get(url, fields="name", expand="stages.members")
+
+        stages = data["results"][0]["stages"]
+        self.assertEqual(
+            set(stages[0]),
+            {
+                "name",
+                "start_date",
+                "end_date",
+                "status",
+                "task_count",
+                "task_set",
+                "members",
+            },
+        )
+        self.assertEqual(stages[0]["members"][0]["username"], "member")
+        self.assertEqual(data["results"][0]["name"], "Project")
+        self.assertNotIn("pm", data["results"][0])
+
+    def test_tasks(self):
+        url = reverse(
+            "stage_tasks",
+            kwargs={"project_id": self.project.pk, "stage_id": self.stages[0].pk},
+        )
+
+        data, _ = self.get(url, fields="content")
+
+        self.assertEqual(data["results"], [{"content": "Task"}])
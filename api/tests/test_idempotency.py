@@ -0,0 +1,84 @@
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from api.tests.test_setup import TestSetUp
+from app.models import IdempotencyKey, Project, Report, UserProject
+from app.utils import constants
+
+
+class IdempotencyTest(TestSetUp):
+    def setUp(self):
+        self.url = reverse("create_project")
+        self.data = {
+            "name": "Project",
+            "describe": "Describe",
+            "end_date": "2099-01-01",
+        }
+        self.client.force_authenticate(self.user)
+
+    def post(self, data, key="key-1"):
+        return self.client.post(self.url, data, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_response(self):
+        first = self.post(self.data)
+        retry = self.post(self.data)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Project.objects.count(), 1)
+
+    def test_key_reused_for_another_request(self):
+        self.post(self.data)
+
+        response = self.post({**self.data, "name": "Other"})
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Project.objects.count(), 1)
+
+    def test_expired_key_runs_again(self):
+        self.post(self.data)
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+
+        response = self.post(self.data)
+
+        self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(Project.objects.count(), 2)
+
+    def test_requests_without_key_are_not_stored(self):
+        self.client.post(self.url, self.data, format="json")
+        self.client.post(self.url, self.data, format="json")
+
+        self.assertEqual(Project.objects.count(), 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_report_retry(self):
+        project = Project.objects.create(name="Project", end_date="2024-02-01")
+        UserProject.objects.create(
+            user=self.user, project=project, role=constants.PROJECT_MANAGER
+        )
+        url = reverse("list_report", kwargs={"project_id": project.pk})
+
+        for _ in range(2):
+            self.client.post(url, {"content": "Done"}, HTTP_IDEMPOTENCY_KEY="report")
+
+        self.assertEqual(Report.objects.count(), 1)
+
+    def test_purge_expired_keys(self):
+        self.post(self.data, key="old")
+        self.post(self.data, key="new")
+        IdempotencyKey.objects.filter(key="old").update(
+            created_at=timezone.now() - timedelta(days=2)
+        )
+
+        call_command("purge_idempotency_keys", stdout=io.StringIO())
+
+        self.assertEqual(
+            list(IdempotencyKey.objects.values_list("key", flat=True)), ["new"]
+        )
@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+
+from api.tests.test_setup import TestSetUp
+from app.models import Project, Stage, Task, Tombstone, UserProject, UserStage
+from app.utils import constants
+
+
+class RemoveMembersTest(TestSetUp):
+    def setUp(self):
+        User = get_user_model()
+        self.project = Project.objects.create(name="Project", end_date="2024-02-01")
+        other_project = Project.objects.create(name="Other", end_date="2024-02-01")
+        self.stage = Stage.objects.create(
+            name="Stage",
+            start_date="2024-01-01",
+            end_date="2024-01-10",
+            project=self.project,
+        )
+        other_stage = Stage.objects.create(
+            name="Other stage",
+            start_date="2024-01-01",
+            end_date="2024-01-10",
+            project=other_project,
+        )
+        UserProject.objects.create(
+            user=self.user, project=self.project, role=constants.PROJECT_MANAGER
+        )
+        self.free, self.busy, self.owner, self.busy_elsewhere = [
+            User.objects.create_user(username=username)
+            for username in ["free", "busy", "owner", "busy_elsewhere"]
+        ]
+        for user in [self.free, self.busy, self.owner, self.busy_elsewhere]:
+            UserProject.objects.create(user=user, project=self.project)
+        UserStage.objects.create(user=self.free, stage=self.stage)
+        UserStage.objects.create(
+            user=self.owner, stage=self.stage, role=constants.STAGE_OWNER
+        )
+        Task.objects.create(
+            content="Task",
+            start_date="2024-01-01",
+            end_date="2024-01-02",
+            stage=self.stage,
+            user=self.busy,
+        )
+        Task.objects.create(
+            content="Task",
+            start_date="2024-01-01",
+            end_date="2024-01-02",
+            stage=other_stage,
+            user=self.busy_elsewhere,
+        )
+        self.url = reverse(
+            "remove_members_of_project", kwargs={"project_id": self.project.pk}
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_remove_members(self):
+        user_ids = [
+            self.free.pk,
+            self.busy.pk,
+            self.owner.pk,
+            self.busy_elsewhere.pk,
+            self.user.pk,
+            9999,
+        ]
+        response = self.client.post(self.url, {"user_ids": user_ids}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {result["user_id"]: result for result in response.data["results"]}
+        self.assertTrue(results[self.free.pk]["removed"])
+        self.assertTrue(results[self.busy_elsewhere.pk]["removed"])
+        self.assertEqual(results[self.busy.pk]["reason"], "has_open_tasks")
+        self.assertEqual(results[self.owner.pk]["reason"], "is_stage_owner")
+        self.assertEqual(results[self.owner.pk]["stages"], [self.stage.pk])
+        self.assertEqual(results[self.user.pk]["reason"], "is_pm")
+        self.assertEqual(results[9999]["reason"], "not_in_project")
+
+        members = UserProject.objects.filter(project=self.project)
+        self.assertEqual(
+            set(members.values_list("user_id", flat=True)),
+            {self.user.pk, self.busy.pk, self.owner.pk},
+        )
+        self.assertFalse(UserStage.objects.filter(user=self.free).exists())
+        self.assertEqual(Tombstone.objects.filter(project=self.project).count(), 3)
+
+    def test_single_member_delete(self):
+        url = f"/api/projects/{self.project.pk}/members/{self.owner.pk}"
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["stages"], [{"stage": self.stage.pk}])
+
+        url = f"/api/projects/{self.project.pk}/members/{self.free.pk}"
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,140 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from api.tests.test_setup import TestSetUp
+from app.models import PendingNotification, Project, Stage, UserProject
+from app.utils import constants
+from app.utils.notifications import notify, send_digests
+
+
+class NotificationDigestTest(TestCase):
+    def setUp(self):
+        self.user = TestSetUp.setup_user()
+        self.projects = [
+            Project.objects.create(name=name, end_date="2024-02-01")
+            for name in ["Website", "Mobile"]
+        ]
+        for project in self.projects:
+            UserProject.objects.create(
+                user=self.user, project=project, role=constants.PROJECT_MANAGER
+            )
+        self.stage = Stage.objects.create(
+            name="Launch",
+            start_date="2024-01-01",
+            end_date="2024-01-10",
+            project=self.projects[0],
+        )
+        self.members = [
+            get_user_model().objects.create_user(
+                username=username, email=f"{username}@example.com"
+            )
+            for username in ["first", "second"]
+        ]
+        self.client.force_login(self.user)
+
+    def test_adding_members_queues_instead_of_sending(self):
+        response = self.client.post(
+            reverse("add-user-to-project", kwargs={"pk": self.projects[0].pk}),
+            {"email": self.members[0].email, "role": constants.MEMBER},
+        )
+        self.client.post(
+            reverse(
+                "add-member-to-stage",
+                kwargs={"project_id": self.projects[0].pk, "pk": self.stage.pk},
+            ),
+            {"user_id": self.members[0].pk},
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(
+            list(
+                PendingNotification.objects.order_by("pk").values_list(
+                    "user", "kind", "data"
+                )
+            ),
+            [
+                (self.members[0].pk, constants.NOTIFY_PROJECT_MEMBER_ADDED, {}),
+                (
+                    self.members[0].pk,
+                    constants.NOTIFY_STAGE_MEMBER_ADDED,
+                    {"stage": "Launch"},
+                ),
+            ],
+        )
+
+    def test_one_digest_per_user(self):
+        member_ids = [member.pk for member in self.members]
+        for project in self.projects:
+            notify(
+                member_ids, project.pk, constants.NOTIFY_PROJECT_MEMBER_ADDED, self.user
+            )
+        notify(
+            member_ids[:1],
+            self.projects[0].pk,
+            constants.NOTIFY_STAGE_MEMBER_ADDED,
+            self.user,
+            stage="Launch",
+        )
+
+        self.assertEqual(send_digests(batch_size=1), 2)
+
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            ["first@example.com", "second@example.com"],
+        )
+        first = next(
+            message for message in mail.outbox if message.to[0].startswith("f")
+        )
+        self.assertEqual(first.subject, "3 updates in your projects")
+        self.assertIn("Website\n  - user1 added you to the project\n", first.body)
+        self.assertIn("  - user1 added you to stage Launch\n", first.body)
+        self.assertIn("Mobile\n", first.body)
+        self.assertFalse(PendingNotification.objects.exists())
+
+    def test_digest_is_not_escaped(self):
+        self.projects[0].name = 'R&D "Q1"'
+        self.projects[0].save()
+        notify(
+            [self.members[0].pk],
+            self.projects[0].pk,
+            constants.NOTIFY_STAGE_MEMBER_ADDED,
+            self.user,
+            stage="Dev's",
+        )
+
+        send_digests()
+
+        self.assertIn('R&D "Q1"\n', mail.outbox[0].body)
+        self.assertIn("  - user1 added you to stage Dev's\n", mail.outbox[0].body)
+
+    def test_queries_do_not_grow_with_notifications(self):
+        notify(
+            [self.members[0].pk],
+            self.projects[0].pk,
+            constants.NOTIFY_PROJECT_MEMBER_ADDED,
+        )
+        with self.assertNumQueries(4):
+            send_digests()
+
+        for project in self.projects:
+            notify(
+                [member.pk for member in self.members] * 5,
+                project.pk,
+                constants.NOTIFY_PROJECT_MEMBER_ADDED,
+            )
+        # Last id, users, then notifications and their delete per batch.
+        with self.assertNumQueries(4):
+            send_digests()
+
+    def test_command(self):
+        out = io.StringIO()
+
+        call_command("send_notification_digests", stdout=out)
+
+        self.assertEqual(out.getvalue(), "0 digests sent\n")
@@ -0,0 +1,168 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from api.tests.test_setup import TestSetUp
+from app.models import Project, Stage, Task, UserProject, UserStage
+from app.utils import constants
+
+
+class DetailPagesTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = TestSetUp.setup_user()
+        self.project = Project.objects.create(name="Project", end_date="2024-02-01")
+        UserProject.objects.create(
+            user=self.user, project=self.project, role=constants.PROJECT_MANAGER
+        )
+        self.stages = {}
+        for status in [constants.ACTIVE, constants.SLOWED, constants.CLOSED]:
+            stage = Stage.objects.create(
+                name=f"Stage {status}",
+                start_date="2024-01-01",
+                end_date="2024-01-10",
+                project=self.project,
+                status=status,
+            )
+            UserStage.objects.create(
+                user=self.user, stage=stage, role=constants.STAGE_OWNER
+            )
+            Task.objects.create(
+                content=f"Task {status}",
+                start_date="2024-01-01",
+                end_date="2024-01-02",
+                stage=stage,
+                user=self.user,
+            )
+            self.stages[status] = stage
+        self.project_url = reverse("project-detail", kwargs={"pk": self.project.pk})
+        self.stage_url = reverse(
+            "detail-stage",
+            kwargs={
+                "project_id": self.project.pk,
+                "pk": self.stages[constants.ACTIVE].pk,
+            },
+        )
+        self.client.force_login(self.user)
+
+    def test_project_detail(self):
+        response = self.client.get(self.project_url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["stage_active"]), 2)
+        self.assertEqual(len(response.context["stage_closed"]), 1)
+        self.assertEqual(response.context["task_count"], 3)
+        self.assertContains(response, 'id="num-stage">2<')
+        self.assertContains(response, "csrfmiddlewaretoken", count=1)
+
+    def test_project_detail_fragment_cache(self):
+        self.client.get(self.project_url)
+
+        # Session, user, project, membership and nothing for the fragment.
+        with self.assertNumQueries(4):
+            response = self.client.get(self.project_url)
+        self.assertContains(response, 'id="num-stage">2<')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Stage.objects.create(
+                name="New stage",
+                start_date="2024-01-01",
+                end_date="2024-01-10",
+                project=self.project,
+            )
+        response = self.client.get(self.project_url)
+        self.assertContains(response, 'id="num-stage">3<')
+
+    def test_stage_detail(self):
+        response = self.client.get(self.stage_url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["task_count"], 1)
+        self.assertContains(response, "Task 0")
+
+        with self.assertNumQueries(4):
+            self.client.get(self.stage_url)
+
+    def test_stage_detail_wrong_project(self):
+        other = Project.objects.create(name="Other", end_date="2024-02-01")
+        url = reverse(
+            "detail-stage",
+            kwargs={"project_id": other.pk, "pk": self.stages[constants.ACTIVE].pk},
+        )
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 404)
+
+
+class ProjectListPageTest(TestCase):
+    def setUp(self):
+        self.user = TestSetUp.setup_user()
+        for index in range(constants.PROJECT_LIST_PAGE_SIZE + 3):
+            project = Project.objects.create(
+                name=f"Project {index}", describe="Demo", end_date="2024-02-01"
+            )
+            UserProject.objects.create(
+                user=self.user,
+                project=project,
+                role=constants.PROJECT_MANAGER if index == 0 else constants.MEMBER,
+            )
+            stage = Stage.objects.create(
+                name="Stage",
+                start_date="2024-01-01",
+                end_date="2024-01-10",
+                project=project,
+            )
+            for status in [constants.TASK_NEW, constants.TASK_RESOLVED]:
+                Task.objects.create(
+                    content="Task",
+                    start_date="2024-01-01",
+                    end_date="2024-01-02",
+                    stage=stage,
+                    status=status,
+                )
+        self.first = Project.objects.order_by("pk").first()
+        Project.objects.create(name="Not a member", end_date="2024-02-01")
+        self.url = reverse("project")
+        self.client.force_login(self.user)
+
+    def test_list_is_scoped_and_paginated(self):
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+
+        projects = response.context["project_list"]
+        self.assertEqual(len(projects), constants.PROJECT_LIST_PAGE_SIZE)
+        self.assertEqual(response.context["paginator"].count, 15)
+        self.assertEqual(projects[0].stage_count, 1)
+        self.assertEqual(projects[0].task_count, 1)
+        self.assertNotContains(response, "Not a member")
+
+        response = self.client.get(self.url, {"page": 2})
+
+        projects = response.context["project_list"]
+        self.assertEqual(len(projects), 3)
+        self.assertEqual(projects[2].pk, self.first.pk)
+        self.assertEqual(projects[2].role, constants.PROJECT_MANAGER)
+
+    def test_search(self):
+        response = self.client.get(self.url, {"q": "project 1"})
+
+        names = [project.name for project in response.context["project_list"]]
+        self.assertEqual(
+            names,
+            [
+                "Project 14",
+                "Project 13",
+                "Project 12",
+                "Project 11",
+                "Project 10",
+                "Project 1",
+            ],
+        )
+
+    def test_login_required(self):
+        self.client.logout()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,103 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+
+from api.tests.test_setup import TestSetUp
+from app.models import EffectivePermission, Project, Stage, UserProject, UserStage
+from app.utils import constants
+from app.utils.helpers import (
+    is_in_group,
+    is_in_project,
+    is_pm,
+    is_pm_or_stage_owner,
+    is_stage_member_or_pm,
+)
+from app.utils.members import remove_members
+from app.utils.permissions import get_visible_projects
+
+
+class EffectivePermissionTest(TestSetUp):
+    def setUp(self):
+        self.project = Project.objects.create(name="Project", end_date="2024-02-01")
+        UserProject.objects.create(
+            user=self.user, project=self.project, role=constants.PROJECT_MANAGER
+        )
+        self.owner, self.member = [
+            get_user_model().objects.create_user(username=username)
+            for username in ["owner", "member"]
+        ]
+        for user in [self.owner, self.member]:
+            UserProject.objects.create(user=user, project=self.project)
+        self.stage = self.create_stage(self.project)
+        UserStage.objects.create(
+            user=self.owner, stage=self.stage, role=constants.STAGE_OWNER
+        )
+        self.stage.user.add(self.member, through_defaults={"role": constants.MEMBER})
+
+    def create_stage(self, project):
+        return Stage.objects.create(
+            name="Stage",
+            start_date="2024-01-01",
+            end_date="2024-01-10",
+            project=project,
+        )
+
+    def test_capabilities_follow_memberships(self):
+        stage = self.create_stage(self.project)
+
+        self.assertTrue(is_pm(self.user, self.project))
+        self.assertFalse(is_pm(self.owner, self.project))
+        self.assertTrue(is_pm_or_stage_owner(self.user, stage, self.project))
+        self.assertTrue(is_pm_or_stage_owner(self.owner, self.stage, self.project))
+        self.assertFalse(is_pm_or_stage_owner(self.member, self.stage, self.project))
+        self.assertTrue(is_stage_member_or_pm(self.member, self.stage))
+        self.assertFalse(is_stage_member_or_pm(self.member, stage))
+
+    def test_stage_of_another_project_is_rejected(self):
+        other = Project.objects.create(name="Other", end_date="2024-02-01")
+        UserProject.objects.create(
+            user=self.owner, project=other, role=constants.PROJECT_MANAGER
+        )
+
+        self.assertFalse(is_pm_or_stage_owner(self.owner, self.stage, other))
+
+    def test_bulk_removal_revokes(self):
+        remove_members(self.project.pk, [self.member.pk])
+
+        self.assertFalse(is_in_project(self.member, self.project))
+        self.assertFalse(is_stage_member_or_pm(self.member, self.stage))
+
+    def test_groups(self):
+        group = Group.objects.create(name="PM")
+
+        self.member.groups.add(group)
+        self.assertTrue(is_in_group(self.member))
+        group.user_set.remove(self.member)
+        self.assertFalse(is_in_group(self.member))
+
+    def test_checks_are_one_query(self):
+        with self.assertNumQueries(1):
+            is_pm_or_stage_owner(self.owner, self.stage, self.project)
+        with self.assertNumQueries(1):
+            self.assertEqual(list(get_visible_projects(self.member)), [self.project])
+
+    def test_rebuild(self):
+        before = set(
+            EffectivePermission.objects.values_list(
+                "user", "project", "stage", "capability"
+            )
+        )
+        EffectivePermission.objects.all().delete()
+
+        call_command("rebuild_permissions", stdout=io.StringIO())
+
+        self.assertEqual(
+            set(
+                EffectivePermission.objects.values_list(
+                    "user", "project", "stage", "capability"
+                )
+            ),
+            before,
+        )
@@ -0,0 +1,127 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+
+from api.tests.test_setup import TestSetUp
+from app.models import Project, Stage, Task, UserProject, UserStage, VersionConflict
+from app.utils import constants
+
+
+class PreconditionTest(TestSetUp):
+    def setUp(self):
+        self.project = Project.objects.create(name="Project", end_date="2024-02-01")
+        UserProject.objects.create(
+            user=self.user, project=self.project, role=constants.PROJECT_MANAGER
+        )
+        self.owner = get_user_model().objects.create_user(username="owner")
+        UserProject.objects.create(
+            user=self.owner, project=self.project, role=constants.STAGE_OWNER
+        )
+        self.stage = Stage.objects.create(
+            name="Stage",
+            start_date="2024-01-01",
+            end_date="2024-01-10",
+            project=self.project,
+        )
+        UserStage.objects.create(
+            user=self.owner, stage=self.stage, role=constants.STAGE_OWNER
+        )
+        self.task = Task.objects.create(
+            content="Task",
+            start_date="2024-01-01",
+            end_date="2024-01-02",
+            stage=self.stage,
+        )
+        self.stage_url = reverse(
+            "stage_detail",
+            kwargs={"project_id": self.project.pk, "stage_id": self.stage.pk},
+        )
+        self.task_url = reverse(
+            "task_detail",
+            kwargs={
+                "project_id": self.project.pk,
+                "stage_id": self.stage.pk,
+                "task_id": self.task.pk,
+            },
+        )
+        self.stage_data = {
+            "name": "Renamed",
+            "start_date": "2024-01-01",
+            "end_date": "2024-01-10",
+            "user": self.owner.pk,
+        }
+        self.client.force_authenticate(self.user)
+
+    def test_stage_update_with_current_etag(self):
+        etag = self.client.get(self.stage_url)["ETag"]
+
+        response = self.client.put(self.stage_url, self.stage_data, HTTP_IF_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(etag, '"1"')
+        self.assertEqual(response["ETag"], '"2"')
+
+    def test_stale_etag_is_rejected(self):
+        self.client.put(self.stage_url, self.stage_data, HTTP_IF_MATCH='"1"')
+
+        response = self.client.put(
+            self.stage_url, {**self.stage_data, "name": "Lost"}, HTTP_IF_MATCH='"1"'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(Stage.objects.get(pk=self.stage.pk).name, "Renamed")
+
+    def test_etag_of_gzipped_response_matches(self):
+        # Long enough for the project detail to be compressed.
+        Project.objects.filter(pk=self.project.pk).update(describe="x" * 500)
+        for index in range(5):
+            Stage.objects.create(
+                name="Stage %d" % index,
+                start_date="2024-01-01",
+                end_date="2024-01-10",
+                project=self.project,
+            )
+        detail = self.client.get(
+            reverse("project_detail", kwargs={"project_id": self.project.pk}),
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+        self.assertEqual(detail["Content-Encoding"], "gzip")
+        self.assertEqual(detail["ETag"], 'W/"1"')
+
+        response = self.client.patch(
+            reverse("update_project", kwargs={"project_id": self.project.pk}),
+            {"name": "New"},
+            HTTP_IF_MATCH=detail["ETag"],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_project_update_without_if_match(self):
+        url = reverse("update_project", kwargs={"project_id": self.project.pk})
+
+        response = self.client.patch(url, {"name": "New"})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response["ETag"], '"2"')
+
+    def test_stage_owner_updates_task(self):
+        self.client.force_authenticate(self.owner)
+
+        response = self.client.patch(
+            self.task_url, {"status": constants.TASK_IN_PROGRESS}, HTTP_IF_MATCH='"1"'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], constants.TASK_IN_PROGRESS)
+        self.assertEqual(response["ETag"], '"2"')
+
+    def test_concurrent_write_is_detected(self):
+        task = Task.objects.get(pk=self.task.pk)
+        self.task.content = "First"
+        self.task.save()
+        task.content = "Second"
+
+        with self.assertNumQueries(1), self.assertRaises(VersionConflict):
+            task.save_if_version(task.version, ["content"])
+
+        self.assertEqual(Task.objects.get(pk=self.task.pk).content, "First")
@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete, pre_delete
+from django.test import TestCase
+
+from api.tests.test_setup import TestSetUp
+from app.models import Project, UserProject
+from app.utils.queries import delete_without_signals
+
+
+class DeleteWithoutSignalsTest(TestCase):
+    def setUp(self):
+        self.user = TestSetUp.setup_user()
+        self.projects = [
+            Project.objects.create(name=name, end_date="2024-02-01")
+            for name in ["First", "Second"]
+        ]
+        for project in self.projects:
+            UserProject.objects.create(user=self.user, project=project)
+
+    def test_one_delete_without_signals(self):
+        sent = []
+
+        def receiver(sender, **kwargs):
+            sent.append(sender)
+
+        for signal in [pre_delete, post_delete]:
+            signal.connect(receiver, sender=UserProject)
+            self.addCleanup(signal.disconnect, receiver, sender=UserProject)
+
+        with self.assertNumQueries(1):
+            count = delete_without_signals(
+                UserProject.objects.filter(project=self.projects[0])
+            )
+
+        self.assertEqual(count, 1)
+        self.assertEqual(sent, [])
+        self.assertEqual(
+            list(UserProject.objects.values_list("project", flat=True)),
+            [self.projects[1].pk],
+        )
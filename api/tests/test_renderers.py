@@ -0,0 +1,83 @@
+import datetime
+import gzip
+import io
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api.middleware import APIGZipMiddleware
+from api.renderers import FastJSONParser, FastJSONRenderer
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    def test_matches_json_renderer(self):
+        data = {
+            "date": datetime.date(2024, 1, 2),
+            "datetime": datetime.datetime(
+                2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc
+            ),
+            "decimal": Decimal("1.50"),
+            "lazy": _("Active"),
+            "text": "Tiếng Việt \u2028\u2029",
+            1: [None, True, 1.5],
+        }
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indent(self):
+        content = FastJSONRenderer().render({"a": 1}, "application/json; indent=2", {})
+
+        self.assertEqual(content, b'{\n  "a": 1\n}')
+
+    def test_parse(self):
+        parser = FastJSONParser()
+
+        self.assertEqual(
+            parser.parse(io.BytesIO('{"name": "Dự án"}'.encode())), {"name": "Dự án"}
+        )
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b"{"))
+
+
+@override_settings(API_GZIP_MIN_LENGTH=100)
+class APIGZipMiddlewareTest(SimpleTestCase):
+    def compress(self, response):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+        return APIGZipMiddleware(lambda request: response)(request)
+
+    def test_large_json_is_compressed(self):
+        data = {"tasks": ["task"] * 100}
+
+        response = self.compress(JsonResponse(data))
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), JsonResponse(data).content)
+
+    def test_small_json_is_not_compressed(self):
+        response = self.compress(JsonResponse({"id": 1}))
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_html_and_streams_are_not_compressed(self):
+        html = self.compress(HttpResponse("x" * 1000))
+        stream = self.compress(
+            StreamingHttpResponse(iter(["x" * 1000]), content_type="text/event-stream")
+        )
+
+        self.assertFalse(html.has_header("Content-Encoding"))
+        self.assertFalse(stream.has_header("Content-Encoding"))
+
+
+class BenchmarkRenderersTest(SimpleTestCase):
+    def test_command(self):
+        out = io.StringIO()
+
+        call_command("benchmark_renderers", stages=2, tasks=3, repeat=1, stdout=out)
+
+        self.assertIn("6 tasks", out.getvalue())
+        self.assertIn("FastJSONRenderer", out.getvalue())
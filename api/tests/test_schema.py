@@ -0,0 +1,80 @@
+import io
+import os
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+from api import schema
+from api.tests.test_setup import TestSetUp
+
+
+class SchemaTest(TestSetUp):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(SCHEMA_CACHE_DIR=directory.name, CODE_VERSION="1")
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.directory = directory.name
+        schema.get_code_version.cache_clear()
+        schema._loaded.clear()
+        self.addCleanup(schema._loaded.clear)
+        self.addCleanup(schema.get_code_version.cache_clear)
+
+    def test_schema_is_generated_once(self):
+        with mock.patch.object(
+            schema, "generate_schema", wraps=schema.generate_schema
+        ) as generate:
+            response = self.client.get(reverse("schema"))
+            self.client.get(reverse("schema"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'"openapi"', response.content)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        self.assertEqual(generate.call_count, 1)
+        self.assertTrue(os.path.exists(schema.schema_path("en")))
+
+    def test_not_modified(self):
+        etag = self.client.get(reverse("schema"))["ETag"]
+
+        response = self.client.get(reverse("schema"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_versioned_url_is_cached(self):
+        response = self.client.get(reverse("schema"), {"v": "1"})
+        old = self.client.get(reverse("schema"), {"v": "0"})
+
+        self.assertEqual(response["Cache-Control"], "public, max-age=86400")
+        self.assertEqual(old["Cache-Control"], "no-cache")
+
+    def test_swagger_ui_loads_versioned_url(self):
+        response = self.client.get(reverse("swagger-ui"))
+
+        self.assertEqual(response.data["schema_url"], reverse("schema") + "?v=1")
+
+    def test_new_version_regenerates(self):
+        self.client.get(reverse("schema"))
+        old_path = schema.schema_path("en")
+
+        with override_settings(CODE_VERSION="2"):
+            schema.get_code_version.cache_clear()
+            self.client.get(reverse("schema"))
+            new_path = schema.schema_path("en")
+
+        self.assertNotEqual(old_path, new_path)
+        self.assertTrue(os.path.exists(new_path))
+
+    def test_command_removes_old_versions(self):
+        stale = os.path.join(self.directory, "openapi-0-en.json")
+        open(stale, "w").close()
+
+        call_command("generate_schema", stdout=io.StringIO())
+
+        self.assertEqual(
+            sorted(os.listdir(self.directory)),
+            ["openapi-1-en.json", "openapi-1-vi.json"],
+        )
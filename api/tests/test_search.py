@@ -0,0 +1,112 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from api.tests.test_setup import TestSetUp
+from app.models import Project, Report, SearchPosting, Stage, Task, UserProject
+from app.utils import constants
+from app.utils.search import index_document, tokenize
+
+
+class SearchTest(TestSetUp):
+    def setUp(self):
+        self.project = Project.objects.create(
+            name="Website", describe="Dự án trang web", end_date="2024-02-01"
+        )
+        UserProject.objects.create(
+            user=self.user, project=self.project, role=constants.PROJECT_MANAGER
+        )
+        self.stage = Stage.objects.create(
+            name="Login",
+            start_date="2024-01-01",
+            end_date="2024-01-10",
+            project=self.project,
+        )
+        self.task = self.create_task("Fix login login form")
+        self.other_task = self.create_task("Style login button")
+        self.url = reverse("search")
+        self.client.force_authenticate(self.user)
+
+    def create_task(self, content, stage=None):
+        return Task.objects.create(
+            content=content,
+            start_date="2024-01-01",
+            end_date="2024-01-02",
+            stage=stage or self.stage,
+        )
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_tokenize_drops_diacritics(self):
+        self.assertEqual(tokenize("Dự án ĐẸP, v2!"), ["du", "an", "dep", "v2"])
+
+    def test_results_are_ranked(self):
+        data = self.search(q="login", type="task")
+
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(
+            [result["id"] for result in data["results"]],
+            [self.task.pk, self.other_task.pk],
+        )
+
+    def test_search_without_diacritics(self):
+        data = self.search(q="du an")
+
+        self.assertEqual(
+            [(result["type"], result["id"]) for result in data["results"]],
+            [("project", self.project.pk)],
+        )
+
+    def test_reports_are_searchable(self):
+        report = Report.objects.create(
+            content="Weekly status", user=self.user, project=self.project
+        )
+
+        data = self.search(q="weekly")
+
+        self.assertEqual(data["results"][0]["id"], report.pk)
+
+    def test_other_projects_are_hidden(self):
+        other = Project.objects.create(name="Login", end_date="2024-02-01")
+        UserProject.objects.create(
+            user=get_user_model().objects.create_user(username="other"),
+            project=other,
+            role=constants.PROJECT_MANAGER,
+        )
+
+        data = self.search(q="login", type="project")
+
+        self.assertEqual(data["count"], 0)
+
+    def test_index_follows_changes(self):
+        self.task.content = "Fix signup form"
+        self.task.save()
+        self.other_task.delete()
+
+        self.assertEqual(self.search(q="login", type="task")["count"], 0)
+        self.assertEqual(self.search(q="signup")["results"][0]["id"], self.task.pk)
+
+    def test_unchanged_text_is_not_rewritten(self):
+        # Savepoint, document, postings and release; nothing is written.
+        with self.assertNumQueries(4):
+            index_document(self.task)
+
+    def test_paginate(self):
+        data = self.search(q="login", limit=1, offset=1)
+
+        self.assertEqual(data["count"], 3)
+        self.assertEqual(len(data["results"]), 1)
+
+    def test_rebuild_index(self):
+        before = self.search(q="login")
+        SearchPosting.objects.all().delete()
+
+        call_command("rebuild_search_index", stdout=io.StringIO())
+
+        self.assertEqual(self.search(q="login"), before)
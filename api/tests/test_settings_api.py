@@ -0,0 +1,87 @@
+import io
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.management.commands.importtime_report import parse_importtime
+from projectmanagement import settings_api
+
+LOADED_MODULES = """
+import sys
+import django
+django.setup()
+from django.urls import reverse
+print(reverse("project_detail", kwargs={"project_id": 1}))
+for name in ["numpy", "drf_spectacular.views", "crispy_forms", "widget_tweaks"]:
+    print(name in sys.modules)
+"""
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     django.utils
+import time:       200 |        300 |   django.conf
+import time:        50 |        350 | django
+import time:        30 |         30 | numpy
+"""
+
+
+class APISettingsTest(SimpleTestCase):
+    def test_api_worker_skips_html_stack(self):
+        result = subprocess.run(
+            [sys.executable, "-c", LOADED_MODULES],
+            cwd=settings.BASE_DIR,
+            env={
+                **os.environ,
+                "DJANGO_SETTINGS_MODULE": "projectmanagement.settings_api",
+            },
+            capture_output=True,
+            text=True,
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(
+            result.stdout.split(),
+            ["/en/api/projects/1/detail", "False", "False", "False", "False"],
+        )
+
+    def test_parse_importtime(self):
+        total, packages = parse_importtime(IMPORTTIME_OUTPUT)
+
+        self.assertEqual(total, 380)
+        self.assertEqual(packages, {"django": 350, "numpy": 30})
+
+    def test_report_over_budget(self):
+        with self.assertRaisesMessage(CommandError, "over the budget"):
+            call_command(
+                "importtime_report",
+                settings_module="projectmanagement.settings_api",
+                budget=0,
+                stdout=io.StringIO(),
+            )
+
+
+@override_settings(
+    MIDDLEWARE=settings_api.MIDDLEWARE, ROOT_URLCONF=settings_api.ROOT_URLCONF
+)
+class APIWorkerEventsTest(TestCase):
+    url = "/en/api/projects/1/events"
+
+    def test_anonymous(self):
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_token(self):
+        user = get_user_model().objects.create_user(username="user")
+        token = AccessToken.for_user(user)
+
+        response = self.client.get(
+            self.url, headers={"Authorization": f"Bearer {token}"}
+        )
+
+        # Authenticated, but not a member of the project.
+        self.assertEqual(response.status_code, 403)
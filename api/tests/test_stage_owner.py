@@ -0,0 +1,154 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase, skipUnlessDBFeature
+
+from api.tests.test_setup import TestSetUp
+from app.models import Project, Stage, UserProject, UserStage
+from app.utils import constants
+from app.utils.members import transfer_stage_owner
+
+
+def create_stage(project, name, owner):
+    stage = Stage.objects.create(
+        name=name, start_date="2024-01-01", end_date="2024-01-10", project=project
+    )
+    UserStage.objects.create(user=owner, stage=stage, role=constants.STAGE_OWNER)
+    return stage
+
+
+class TransferStageOwnerTest(TestSetUp):
+    def setUp(self):
+        self.project = Project.objects.create(name="Project", end_date="2024-02-01")
+        UserProject.objects.create(
+            user=self.user, project=self.project, role=constants.PROJECT_MANAGER
+        )
+        self.owner, self.other_owner, self.member = [
+            get_user_model().objects.create_user(username=username)
+            for username in ["owner", "other_owner", "member"]
+        ]
+        for user in [self.owner, self.other_owner]:
+            UserProject.objects.create(
+                user=user, project=self.project, role=constants.STAGE_OWNER
+            )
+        UserProject.objects.create(user=self.member, project=self.project)
+        self.stage = create_stage(self.project, "Stage", self.owner)
+        self.other_stage = create_stage(self.project, "Other", self.other_owner)
+
+    def get_project_role(self, user):
+        return UserProject.objects.get(user=user, project=self.project).role
+
+    def test_transfer_keeps_other_stage_owners(self):
+        old_owners = transfer_stage_owner(self.stage, self.member.pk)
+
+        self.assertEqual(old_owners, [self.owner.pk])
+        self.assertEqual(
+            list(
+                UserStage.objects.filter(role=constants.STAGE_OWNER)
+                .order_by("stage")
+                .values_list("stage", "user")
+            ),
+            [
+                (self.stage.pk, self.member.pk),
+                (self.other_stage.pk, self.other_owner.pk),
+            ],
+        )
+        self.assertEqual(self.get_project_role(self.owner), constants.MEMBER)
+        self.assertEqual(self.get_project_role(self.member), constants.STAGE_OWNER)
+        self.assertEqual(self.get_project_role(self.other_owner), constants.STAGE_OWNER)
+
+    def test_owner_of_another_stage_keeps_role(self):
+        UserStage.objects.create(
+            user=self.owner, stage=self.other_stage, role=constants.STAGE_OWNER
+        )
+
+        transfer_stage_owner(self.stage, self.user.pk)
+
+        self.assertEqual(self.get_project_role(self.owner), constants.STAGE_OWNER)
+        self.assertEqual(self.get_project_role(self.user), constants.PROJECT_MANAGER)
+        self.assertEqual(
+            UserStage.objects.get(user=self.user, stage=self.stage).role,
+            constants.STAGE_OWNER,
+        )
+
+    def test_member_added_after_the_lock_is_upserted(self):
+        locked = []
+
+        def select_for_update():
+            # The memberships are read before the new member's one is added.
+            queryset = UserStage.objects.exclude(user=self.member).select_for_update()
+            locked.append(queryset.query.select_for_update)
+            return queryset
+
+        UserStage.objects.create(user=self.member, stage=self.stage)
+        with mock.patch.object(
+            UserStage.objects, "select_for_update", select_for_update
+        ):
+            transfer_stage_owner(self.stage, self.member.pk)
+
+        self.assertEqual(locked, [True])
+        self.assertEqual(
+            list(
+                UserStage.objects.filter(stage=self.stage)
+                .order_by("pk")
+                .values_list("user", "role")
+            ),
+            [
+                (self.owner.pk, constants.MEMBER),
+                (self.member.pk, constants.STAGE_OWNER),
+            ],
+        )
+
+    def test_transfer_to_current_owner_writes_nothing(self):
+        # Savepoint, lock and release.
+        with self.assertNumQueries(3):
+            transfer_stage_owner(self.stage, self.owner.pk)
+
+    def test_transfer_queries(self):
+        UserStage.objects.create(user=self.member, stage=self.stage)
+
+        # Savepoint, lock, stage roles, two project role updates, the
+        # permission refresh of both users (savepoint, delete, two reads,
+        # insert and release) and release.
+        with self.assertNumQueries(12):
+            transfer_stage_owner(self.stage, self.member.pk)
+
+
+@skipUnlessDBFeature("has_select_for_update")
+class ConcurrentTransferTest(TransactionTestCase):
+    def test_concurrent_transfers_leave_one_owner(self):
+        project = Project.objects.create(name="Project", end_date="2024-02-01")
+        users = [
+            get_user_model().objects.create_user(username=f"user{index}")
+            for index in range(5)
+        ]
+        for user in users:
+            UserProject.objects.create(user=user, project=project)
+        stage = create_stage(project, "Stage", users[0])
+        barrier = threading.Barrier(len(users) - 1)
+
+        def transfer(user):
+            try:
+                barrier.wait()
+                transfer_stage_owner(stage, user.pk)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=transfer, args=[user]) for user in users[1:]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(
+            UserStage.objects.filter(stage=stage, role=constants.STAGE_OWNER).count(),
+            1,
+        )
+        self.assertEqual(
+            UserProject.objects.filter(
+                project=project, role=constants.STAGE_OWNER
+            ).count(),
+            1,
+        )
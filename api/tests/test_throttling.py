@@ -0,0 +1,73 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from api import throttling
+from api.tests.test_setup import TestSetUp
+from app.models import Project, UserProject
+from app.utils import constants
+
+
+@override_settings(
+    THROTTLE_BUCKETS={"user": (1000, 1.0), "project_detail": (2, 0.5)},
+    THROTTLE_SYNC_INTERVAL=1000,
+)
+class TokenBucketThrottleTest(TestSetUp):
+    def setUp(self):
+        throttling.reset()
+        cache.clear()
+        self.addCleanup(throttling.reset)
+
+    def test_bucket_refills(self):
+        self.assertEqual(throttling.take("project_detail", "a", now=0), 0)
+        self.assertEqual(throttling.take("project_detail", "a", now=0), 0)
+        self.assertEqual(throttling.take("project_detail", "a", now=0), 2)
+        self.assertEqual(throttling.take("project_detail", "a", now=2), 0)
+        self.assertEqual(throttling.take("project_detail", "b", now=2), 0)
+
+    @override_settings(THROTTLE_SYNC_INTERVAL=0)
+    def test_spent_tokens_are_shared(self):
+        throttling.take("project_detail", "a")
+        throttling.take("project_detail", "a")
+        # A new worker starts from the shared bucket.
+        throttling.reset()
+
+        self.assertGreater(throttling.take("project_detail", "a"), 0)
+
+    @override_settings(THROTTLE_SYNC_INTERVAL=0)
+    def test_cache_is_used_without_the_lock(self):
+        calls = []
+
+        class Cache:
+            def get(self, key):
+                calls.append(throttling._lock.locked())
+                return cache.get(key)
+
+            def set(self, *args):
+                calls.append(throttling._lock.locked())
+                cache.set(*args)
+
+        with mock.patch.object(throttling, "cache", Cache()):
+            throttling.take("project_detail", "a")
+            throttling.take("project_detail", "a")
+
+        self.assertEqual(calls, [False] * 5)
+
+    def test_rejected_request(self):
+        project = Project.objects.create(name="Project", end_date="2024-02-01")
+        UserProject.objects.create(
+            user=self.user, project=project, role=constants.PROJECT_MANAGER
+        )
+        url = reverse("project_detail", kwargs={"project_id": project.pk})
+        self.client.force_authenticate(self.user)
+
+        responses = [self.client.get(url) for _ in range(3)]
+
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [status.HTTP_200_OK, status.HTTP_200_OK, status.HTTP_429_TOO_MANY_REQUESTS],
+        )
+        self.assertEqual(responses[2]["Retry-After"], "2")
@@ -0,0 +1,108 @@
+import datetime
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+
+from api.tests.test_setup import TestSetUp
+from app.models import Project, Stage, Task, UserProject
+from app.utils import constants
+from app.utils.timeline import count_active, to_ordinals
+
+
+class CountActiveTest(SimpleTestCase):
+    def test_day_buckets(self):
+        starts = to_ordinals([datetime.date(2024, 1, 1), datetime.date(2024, 1, 2)])
+        ends = to_ordinals([datetime.date(2024, 1, 2), datetime.date(2024, 1, 4)])
+        counts = count_active(
+            starts,
+            ends,
+            [constants.TASK_NEW, constants.TASK_NEW],
+            len(constants.TASK_STATUS_CHOICES),
+            datetime.date(2024, 1, 1),
+            5,
+        )
+        self.assertEqual(counts[constants.TASK_NEW].tolist(), [1, 2, 1, 1, 0])
+        self.assertEqual(counts[constants.TASK_IN_PROGRESS].tolist(), [0] * 5)
+
+    def test_week_buckets_and_clipping(self):
+        starts = to_ordinals([datetime.date(2023, 12, 20), datetime.date(2024, 1, 9)])
+        ends = to_ordinals([datetime.date(2024, 1, 2), datetime.date(2024, 3, 1)])
+        counts = count_active(
+            starts,
+            ends,
+            [constants.TASK_NEW, constants.TASK_IN_PROGRESS],
+            len(constants.TASK_STATUS_CHOICES),
+            datetime.date(2024, 1, 1),
+            3,
+            width=7,
+        )
+        self.assertEqual(counts[constants.TASK_NEW].tolist(), [1, 0, 0])
+        self.assertEqual(counts[constants.TASK_IN_PROGRESS].tolist(), [0, 1, 1])
+
+
+class ProjectTimelineTest(TestSetUp):
+    def setUp(self):
+        self.project = Project.objects.create(name="Project", end_date="2024-02-01")
+        UserProject.objects.create(
+            user=self.user, project=self.project, role=constants.PROJECT_MANAGER
+        )
+        self.stage = stage = Stage.objects.create(
+            name="Stage",
+            start_date="2024-01-01",
+            end_date="2024-01-10",
+            project=self.project,
+        )
+        Task.objects.create(
+            content="Task",
+            start_date="2024-01-02",
+            end_date="2024-01-03",
+            status=constants.TASK_IN_PROGRESS,
+            stage=stage,
+        )
+        self.url = reverse("project_timeline", kwargs={"project_id": self.project.pk})
+
+    def test_timeline(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url, {"bucket": "week"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["stages"]), 1)
+        self.assertEqual(len(response.data["tasks"]), 1)
+        self.assertEqual(len(response.data["buckets"]), 2)
+        self.assertEqual(response.data["active_tasks"]["In Progress"], [1, 0])
+
+    def test_invalid_range(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(
+            self.url, {"start": "2024-02-01", "end": "2024-01-01"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_range_without_bounds_is_limited(self):
+        Task.objects.create(
+            content="Later",
+            start_date="2054-01-01",
+            end_date="2054-01-02",
+            stage=self.stage,
+        )
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["start"], datetime.date(2024, 1, 1))
+        self.assertEqual(
+            (response.data["end"] - response.data["start"]).days,
+            constants.TIMELINE_MAX_DAYS,
+        )
+        self.assertEqual(len(response.data["buckets"]), constants.TIMELINE_MAX_DAYS + 1)
+        self.assertEqual([task["content"] for task in response.data["tasks"]], ["Task"])
+
+    def test_range_with_only_an_end(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(self.url, {"end": "2024-01-01"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["buckets"]), 1)
+        self.assertEqual(response.data["tasks"], [])
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+
+from api.tests.test_setup import TestSetUp
+from app.models import Project, Stage, Task, UserProject
+from app.utils import constants
+
+
+class WorkloadTest(TestSetUp):
+    def setUp(self):
+        cache.clear()
+        self.project = Project.objects.create(name="Project", end_date="2024-02-01")
+        UserProject.objects.create(
+            user=self.user, project=self.project, role=constants.PROJECT_MANAGER
+        )
+        self.member = get_user_model().objects.create_user(username="member")
+        self.stage = Stage.objects.create(
+            name="Stage",
+            start_date="2024-01-01",
+            end_date="2024-01-31",
+            project=self.project,
+        )
+        for start_date, end_date, task_status in [
+            ("2024-01-01", "2024-01-02", constants.TASK_NEW),
+            ("2024-01-01", "2024-01-02", constants.TASK_IN_PROGRESS),
+            ("2024-01-02", "2024-01-05", constants.TASK_NEW),
+            ("2024-01-01", "2024-01-05", 2),
+        ]:
+            Task.objects.create(
+                content="Task",
+                start_date=start_date,
+                end_date=end_date,
+                status=task_status,
+                stage=self.stage,
+                user=self.member,
+            )
+        self.params = {
+            "projects": [self.project.pk],
+            "start": "2024-01-01",
+            "end": "2024-01-03",
+        }
+
+    def test_workload_matrix(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("workload"), self.params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["users"], [self.member.pk])
+        self.assertEqual(response.data["usernames"], ["member"])
+        self.assertEqual(response.data["open_tasks"], [[2, 3, 1]])
+
+    def test_cache_invalidated_on_task_change(self):
+        self.client.force_authenticate(self.user)
+        self.client.get(reverse("workload"), self.params)
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(
+                content="Task",
+                start_date="2024-01-03",
+                end_date="2024-01-03",
+                stage=self.stage,
+                user=self.member,
+            )
+        response = self.client.get(reverse("workload"), self.params)
+        self.assertEqual(response.data["open_tasks"], [[2, 3, 2]])
+
+    def test_not_pm(self):
+        self.client.force_authenticate(self.member)
+        response = self.client.get(reverse("workload"), self.params)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
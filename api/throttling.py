@@ -0,0 +1,153 @@
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+# Past this many buckets, the full ones are dropped before adding another.
+MAX_BUCKETS = 10000
+
+_buckets = {}
+_lock = threading.Lock()
+
+
+class Bucket:
+    __slots__ = ["tokens", "updated", "spent", "synced", "syncing"]
+
+    def __init__(self, capacity, now):
+        self.tokens = capacity
+        self.updated = now
+        self.spent = 0
+        self.synced = now
+        self.syncing = False
+
+    def refill(self, capacity, rate, now):
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+
+
+def reset():
+    with _lock:
+        _buckets.clear()
+
+
+def get_cache_key(key):
+    return "throttle:%s:%s" % key
+
+
+def take(scope, ident, now=None):
+    """Take a token of the bucket and return 0, or the seconds until one is due.
+
+    The decision is made on the bucket of this process. Every
+    ``THROTTLE_SYNC_INTERVAL`` the tokens it spent are merged into the copy
+    kept in the shared cache, so a client spreading requests over workers is
+    still held to about one bucket. The merge is a plain get and set, and
+    requests racing it can be slightly over-admitted.
+
+    The lock every request takes is never held over a cache round trip.
+    """
+    capacity, rate = settings.THROTTLE_BUCKETS[scope]
+    now = time.monotonic() if now is None else now
+    key = (scope, ident)
+    with _lock:
+        fresh = key not in _buckets
+    # A new bucket starts from the shared copy.
+    shared = cache.get(get_cache_key(key)) if fresh else None
+    with _lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            if len(_buckets) >= MAX_BUCKETS:
+                prune(now)
+            bucket = _buckets[key] = Bucket(capacity, now)
+            merge(bucket, shared, 0, capacity, rate)
+        bucket.refill(capacity, rate, now)
+        if bucket.tokens < 1:
+            wait = (1 - bucket.tokens) / rate
+        else:
+            wait = 0
+            bucket.tokens -= 1
+            bucket.spent += 1
+        due = (
+            not bucket.syncing
+            and now - bucket.synced >= settings.THROTTLE_SYNC_INTERVAL
+        )
+        if due:
+            bucket.syncing = True
+            bucket.synced = now
+            spent = bucket.spent
+    if due:
+        sync(key, bucket, spent, capacity, rate)
+    return wait
+
+
+def merge(bucket, shared, spent, capacity, rate):
+    """Apply the shared copy to ``bucket``, with the lock held.
+
+    ``spent`` of the tokens the bucket spent are now in the shared copy; the
+    ones spent since stay to be merged by the next sync.
+    """
+    if shared is not None:
+        tokens, updated = shared
+        tokens = min(capacity, tokens + max(time.time() - updated, 0) * rate)
+        bucket.tokens = min(bucket.tokens, tokens - bucket.spent)
+    bucket.spent -= spent
+
+
+def sync(key, bucket, spent, capacity, rate):
+    # The shared copy is timed with the wall clock, as every worker has its
+    # own monotonic one.
+    cache_key = get_cache_key(key)
+    try:
+        shared = cache.get(cache_key)
+        with _lock:
+            merge(bucket, shared, spent, capacity, rate)
+            # Tokens spent during the round trip are left to the next sync.
+            value = (bucket.tokens + bucket.spent, time.time())
+        cache.set(
+            cache_key,
+            value,
+            math.ceil(capacity / rate + settings.THROTTLE_SYNC_INTERVAL),
+        )
+    finally:
+        bucket.syncing = False
+
+
+def prune(now):
+    for key, bucket in list(_buckets.items()):
+        capacity, rate = settings.THROTTLE_BUCKETS[key[0]]
+        if bucket.tokens + (now - bucket.updated) * rate >= capacity:
+            del _buckets[key]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    def get_scope(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        if scope is None:
+            return True
+        if request.user.is_authenticated:
+            ident = "user-%s" % request.user.pk
+        else:
+            ident = self.get_ident(request)
+        self.retry_after = take(scope, ident)
+        return not self.retry_after
+
+    def wait(self):
+        return self.retry_after
+
+
+class UserBucketThrottle(TokenBucketThrottle):
+    def get_scope(self, request, view):
+        return "user"
+
+
+class RouteBucketThrottle(TokenBucketThrottle):
+    def get_scope(self, request, view):
+        match = request.resolver_match
+        if match is None or match.url_name not in settings.THROTTLE_BUCKETS:
+            return None
+        return match.url_name
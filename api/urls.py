@@ -1,16 +1,11 @@
 from django.urls import path
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from . import views
 
 urlpatterns = [
-    path("schema", SpectacularAPIView.as_view(), name="schema"),
-    path(
-        "schema/swagger-ui",
-        SpectacularSwaggerView.as_view(url_name="schema"),
-        name="swagger-ui",
-    ),
+    path("schema", views.schema, name="schema"),
+    path("schema/swagger-ui", views.swagger_ui, name="swagger-ui"),
     path("login", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh", TokenRefreshView.as_view(), name="token_refresh"),
     path("signup", views.SignUp.as_view(), name="signup"),
@@ -22,9 +17,15 @@ urlpatterns = [
         views.TaskList.as_view(),
         name="stage_tasks",
     ),
+    path(
+        "projects/<int:project_id>/stages/<int:stage_id>/tasks/<int:task_id>",
+        views.TaskDetail.as_view(),
+        name="task_detail",
+    ),
     path(
         "projects/<int:project_id>/delete", views.delete_project, name="delete_project"
     ),
+    path("projects/<int:project_id>/clone", views.clone_project, name="clone_project"),
     path(
         "projects/<int:project_id>/stages", views.StageList.as_view(), name="stage_list"
     ),
@@ -58,9 +59,40 @@ urlpatterns = [
         "projects/<int:project_id>/members/<int:user_id>",
         views.MemberDetailOfProject.as_view(),
     ),
+    path(
+        "projects/<int:project_id>/members/remove",
+        views.RemoveMembersOfProject.as_view(),
+        name="remove_members_of_project",
+    ),
     path(
         "projects/<int:project_id>/reports",
         views.ReportListView.as_view(),
         name="list_report",
     ),
+    path(
+        "projects/<int:project_id>/timeline",
+        views.ProjectTimeline.as_view(),
+        name="project_timeline",
+    ),
+    path(
+        "projects/<int:project_id>/events",
+        views.project_events,
+        name="project_events",
+    ),
+    path(
+        "projects/<int:project_id>/changes",
+        views.ProjectChanges.as_view(),
+        name="project_changes",
+    ),
+    path(
+        "projects/<int:project_id>/activity",
+        views.ProjectActivity.as_view(),
+        name="project_activity",
+    ),
+    path("search", views.Search.as_view(), name="search"),
+    path("batch", views.Batch.as_view(), name="batch"),
+    path("calendar", views.CalendarFeedUrl.as_view(), name="calendar"),
+    path("calendar/<str:token>.ics", views.calendar_feed, name="calendar_feed"),
+    path("workload", views.Workload.as_view(), name="workload"),
+    path("monitoring/db-pool", views.db_pool_stats, name="db_pool_stats"),
 ]
@@ -1,25 +1,65 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import transaction
+from django.db.models import Max, Min
 from django.forms import model_to_dict
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.encoding import force_str
-from django.utils.http import urlsafe_base64_decode
-from django.utils.translation import gettext_lazy as _
+from django.utils.http import http_date, urlsafe_base64_decode
+from django.utils.decorators import method_decorator
+from django.utils.translation import get_language, gettext_lazy as _
+from django.views.decorators.http import condition, require_safe
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import filters
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.generics import ListAPIView, CreateAPIView
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import (
+    SAFE_METHODS,
+    AllowAny,
+    IsAdminUser,
+    IsAuthenticated,
+)
 from rest_framework.response import Response
 from rest_framework.views import APIView
-
-from app.models import Project, UserProject, Stage, Task, UserStage, Report
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from app.events import notify_project_change, subscribe
+from app.models import (
+    Project,
+    UserProject,
+    Stage,
+    Task,
+    UserStage,
+    Report,
+    VersionConflict,
+)
 from app.utils import constants
-from app.utils.helpers import send_mail_verification, is_in_project, is_pm
+from app.utils.activity import get_activity, record
+from app.utils.changes import InvalidCursor, get_changes
+from app.utils import cloning, ics
+from app.utils import members
+from app.utils.helpers import send_mail_verification, is_in_project
+from app.utils.members import remove_members
+from app.utils.permissions import get_visible_projects, refresh_permissions
+from app.utils.search import search
+from projectmanagement.db.pool import pool_stats
+from .batch import run_batch
+from .idempotency import idempotent
 from .permissions import IsPM, IsPMOrProjectMember, IsPMOrStageOwner
+from .preconditions import if_match, precondition_failed, with_etag
+from .schema import get_code_version, get_schema
 from .serializers import (
     SignUpSerializers,
     VerifySerializers,
@@ -32,8 +72,25 @@ from .serializers import (
     UserStageSerializers,
     TaskSerializer,
     ReportSerializer,
+    TimelineQuerySerializer,
+    WorkloadQuerySerializer,
+    ChangesQuerySerializer,
+    RemoveMembersSerializer,
+    ActivityQuerySerializer,
+    SearchQuerySerializer,
+    BatchSerializer,
+    CloneProjectSerializer,
 )
 
+SEARCH_KINDS = {name: kind for kind, name in constants.SEARCH_KIND_CHOICES}
+
+REMOVE_MEMBER_MESSAGES = {
+    members.NOT_IN_PROJECT: "User is not in project",
+    members.HAS_OPEN_TASKS: "Cannot delete user - User have already assigned to some task",
+    members.IS_PM: "Cannot delete PM",
+    members.IS_STAGE_OWNER: "Cannot delete user - User have already been stage owner of some stage",
+}
+
 
 class SignUp(APIView):
     permission_classes = [AllowAny]
@@ -94,13 +151,15 @@ class Verify(APIView):
 )
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
+@idempotent
 def create_project(request):
-    serializer = ProjectSerializer(data=request.data)
+    serializer = ProjectSerializer(data=request.data, context={"request": request})
     if serializer.is_valid():
         project = serializer.save()
         UserProject.objects.create(
             user=request.user, project=project, role=constants.PROJECT_MANAGER
         )
+        record(project.pk, constants.ACTIVITY_PROJECT_CREATED, request.user, project.pk)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -113,13 +172,46 @@ def create_project(request):
 @permission_classes([IsAuthenticated, IsPM])
 def update_project(request, project_id):
     project = get_object_or_404(Project, pk=project_id)
-    serializer = ProjectSerializer(project, data=request.data, partial=True)
+    if not if_match(request, project):
+        return precondition_failed()
+    serializer = ProjectSerializer(
+        project, data=request.data, partial=True, context={"request": request}
+    )
     if serializer.is_valid():
-        serializer.save()
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        try:
+            serializer.save()
+        except VersionConflict:
+            return precondition_failed()
+        record(
+            project.pk,
+            constants.ACTIVITY_PROJECT_UPDATED,
+            request.user,
+            project.pk,
+            fields=sorted(serializer.validated_data),
+        )
+        return with_etag(
+            Response(serializer.data, status=status.HTTP_201_CREATED), project
+        )
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@extend_schema(request=CloneProjectSerializer, responses=ProjectSerializer)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated, IsPM])
+@idempotent
+def clone_project(request, project_id):
+    template = get_object_or_404(Project, pk=project_id)
+    serializer = CloneProjectSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    project = cloning.clone_project(
+        template, actor=request.user, **serializer.validated_data
+    )
+    serializer = ProjectSerializer(project, context={"request": request})
+    return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
 class TaskList(APIView):
     pagination_class = PageNumberPagination
     permission_classes = (IsAuthenticated,)
@@ -130,17 +222,54 @@ class TaskList(APIView):
 
     def get(self, request, project_id, stage_id):
         project = Project.objects.get(id=project_id)
-        tasks = self.get_object_tasks_by_stage(stage_id=stage_id)
+        context = {"request": request}
+        tasks = TaskSerializer(context=context).prepare(
+            self.get_object_tasks_by_stage(stage_id=stage_id)
+        )
         paginator = self.pagination_class()
         result_page = paginator.paginate_queryset(tasks, request)
 
         if is_in_project(user=request.user, project=project):
-            data = TaskSerializer(result_page, many=True).data
+            data = TaskSerializer(result_page, many=True, context=context).data
             return paginator.get_paginated_response(data)
 
         return Response(status=status.HTTP_403_FORBIDDEN)
 
 
+class TaskDetail(APIView):
+    def get_permissions(self):
+        if self.request.method in SAFE_METHODS:
+            return [IsAuthenticated(), IsPMOrProjectMember()]
+        return [IsAuthenticated(), IsPMOrStageOwner()]
+
+    def get_object(self, project_id, stage_id, task_id):
+        return get_object_or_404(
+            Task, pk=task_id, stage_id=stage_id, stage__project_id=project_id
+        )
+
+    @extend_schema(responses=TaskSerializer)
+    def get(self, request, project_id, stage_id, task_id):
+        task = self.get_object(project_id, stage_id, task_id)
+        serializer = TaskSerializer(task, context={"request": request})
+        return with_etag(Response(serializer.data, status=status.HTTP_200_OK), task)
+
+    @extend_schema(request=TaskSerializer, responses=TaskSerializer)
+    def patch(self, request, project_id, stage_id, task_id):
+        task = self.get_object(project_id, stage_id, task_id)
+        if not if_match(request, task):
+            return precondition_failed()
+        serializer = TaskSerializer(
+            task, data=request.data, partial=True, context={"request": request}
+        )
+        if serializer.is_valid():
+            try:
+                serializer.save()
+            except VersionConflict:
+                return precondition_failed()
+            return with_etag(Response(serializer.data, status=status.HTTP_200_OK), task)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
 class StageList(APIView, LimitOffsetPagination):
     permission_classes = [IsAuthenticated, IsPMOrProjectMember]
 
@@ -162,15 +291,19 @@ class StageList(APIView, LimitOffsetPagination):
     )
     def get(self, request, project_id):
         name = self.request.query_params.get("name", "")
-        stages = Stage.objects.filter(project_id=project_id, name__icontains=name)
+        context = {"request": request}
+        stages = StageListSerializers(context=context).prepare(
+            Stage.objects.filter(project_id=project_id, name__icontains=name)
+        )
         result_page = self.paginate_queryset(stages, request, view=self)
-        data = StageListSerializers(result_page, many=True).data
+        data = StageListSerializers(result_page, many=True, context=context).data
 
         return self.get_paginated_response(data)
 
+    @method_decorator(idempotent)
     def post(self, request, project_id):
         serializer = StageSerializers(
-            data=request.data, context={"project_id": project_id}
+            data=request.data, context={"project_id": project_id, "request": request}
         )
         if serializer.is_valid():
             serializer.save()
@@ -187,7 +320,7 @@ def delete_project(request, project_id):
             {"detail": "Can not delete project - Project already has stage"},
             status.HTTP_400_BAD_REQUEST,
         )
-    project.delete()
+    project.delete(actor=request.user)
     return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -201,11 +334,13 @@ class StageDetail(APIView):
         },
     )
     def get(self, request, project_id, stage_id):
-        stage = get_object_or_404(Stage, pk=stage_id, project_id=project_id)
-        user_stage = UserStage.objects.filter(stage=stage).select_related("user")
-        stage.members = user_stage
-        serializer = StageListSerializers(stage)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        context = {"request": request}
+        stages = StageListSerializers(context=context, expand=["members"]).prepare(
+            Stage.objects.all()
+        )
+        stage = get_object_or_404(stages, pk=stage_id, project_id=project_id)
+        serializer = StageListSerializers(stage, context=context, expand=["members"])
+        return with_etag(Response(serializer.data, status=status.HTTP_200_OK), stage)
 
     @extend_schema(
         request=StageSerializers,
@@ -215,12 +350,21 @@ class StageDetail(APIView):
     )
     def put(self, request, project_id, stage_id):
         stage = get_object_or_404(Stage, pk=stage_id)
+        if not if_match(request, stage):
+            return precondition_failed()
         serializer = StageSerializers(
-            stage, data=request.data, context={"project_id": project_id}
+            stage,
+            data=request.data,
+            context={"project_id": project_id, "request": request},
         )
         if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            try:
+                serializer.save()
+            except VersionConflict:
+                return precondition_failed()
+            return with_etag(
+                Response(serializer.data, status=status.HTTP_200_OK), stage
+            )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, project_id, stage_id):
@@ -236,7 +380,7 @@ class StageDetail(APIView):
                 status.HTTP_400_BAD_REQUEST,
             )
 
-        stage.delete()
+        stage.delete(actor=request.user)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -253,7 +397,7 @@ class ProjectList(ListAPIView):
         return super().get(self, request)
 
     def get_queryset(self):
-        return Project.objects.filter(user=self.request.user)
+        return self.get_serializer().prepare(get_visible_projects(self.request.user))
 
 
 class ProjectDetail(APIView):
@@ -261,19 +405,21 @@ class ProjectDetail(APIView):
 
     @extend_schema(responses=ProjectSerializer)
     def get(self, request, project_id):
-        project = get_object_or_404(Project, pk=project_id)
-        stages = Stage.objects.filter(project=project)
-        users = UserProject.objects.filter(project=project)
-        project.stages = stages
-        project.members = users
-        serializer = ProjectSerializer(project, many=False)
-        return Response(serializer.data, status.HTTP_200_OK)
+        context = {"request": request}
+        expand = ["stages", "members"]
+        projects = ProjectSerializer(context=context, expand=expand).prepare(
+            Project.objects.all()
+        )
+        project = get_object_or_404(projects, pk=project_id)
+        serializer = ProjectSerializer(project, context=context, expand=expand)
+        return with_etag(Response(serializer.data, status.HTTP_200_OK), project)
 
 
 class MemberListOfProject(APIView):
     permission_classes = [IsAuthenticated, IsPM]
 
     @extend_schema(request=ListUserSerializer, responses=MemberProjectSerializer)
+    @method_decorator(idempotent)
     def post(self, request, project_id):
         project = get_object_or_404(Project, pk=project_id)
         serializer = ListUserSerializer(data=request.data, context={"project": project})
@@ -284,7 +430,22 @@ class MemberListOfProject(APIView):
                 for user in members
             ]
             user_project_created = UserProject.objects.bulk_create(user_projects)
-            serializer = MemberProjectSerializer(user_project_created, many=True)
+            refresh_permissions(project.pk, [user.pk for user in members])
+            for user in members:
+                record(
+                    project.pk, constants.ACTIVITY_MEMBER_ADDED, request.user, user.pk
+                )
+            notify_project_change(
+                project.pk,
+                {
+                    "type": "project_member",
+                    "action": "created",
+                    "users": [user.pk for user in members],
+                },
+            )
+            serializer = MemberProjectSerializer(
+                user_project_created, many=True, context={"request": request}
+            )
             return Response(serializer.data, status.HTTP_201_CREATED)
         return Response(serializer.errors, status.HTTP_400_BAD_REQUEST)
 
@@ -298,6 +459,7 @@ class MemberStageList(APIView):
             201: AddMemberStageSerializers,
         },
     )
+    @method_decorator(idempotent)
     def post(self, request, project_id, stage_id):
         serializer = AddMemberStageSerializers(
             data=request.data, context={"project_id": project_id}
@@ -307,11 +469,21 @@ class MemberStageList(APIView):
 
             stage = get_object_or_404(Stage, pk=stage_id)
             stage.user.add(*user_id, through_defaults={"role": constants.MEMBER})
+            for pk in user_id:
+                record(
+                    stage.project_id,
+                    constants.ACTIVITY_STAGE_MEMBER_ADDED,
+                    request.user,
+                    stage.pk,
+                    user=pk,
+                )
 
             user_stage = UserStage.objects.filter(
                 stage_id=stage_id, user_id__in=user_id
             ).select_related("user")
-            data = UserStageSerializers(user_stage, many=True).data
+            data = UserStageSerializers(
+                user_stage, many=True, context={"request": request}
+            ).data
 
             return Response(data, status=status.HTTP_201_CREATED)
 
@@ -353,45 +525,53 @@ class MemberStageDetail(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         stage_member.delete()
+        record(
+            project_id,
+            constants.ACTIVITY_STAGE_MEMBER_REMOVED,
+            request.user,
+            stage_id,
+            user=user_id,
+        )
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class MemberDetailOfProject(APIView):
     permission_classes = [IsAuthenticated, IsPM]
 
     def delete(self, request, project_id, user_id):
-        project = get_object_or_404(Project, pk=project_id)
-        user = get_object_or_404(User, pk=user_id)
-        if not UserProject.objects.filter(user=user, project=project):
-            data = {"message": "User is not in project"}
-            return Response(data=data, status=status.HTTP_400_BAD_REQUEST)
+        outcome = remove_members(project_id, [user_id], request.user)[user_id]
+        if outcome["status"] == members.REMOVED:
+            return Response(status=status.HTTP_204_NO_CONTENT)
 
-        if Task.objects.filter(
-            user=user, status__in=[constants.TASK_NEW, constants.TASK_IN_PROGRESS]
-        ):
-            data = {
-                "message": "Cannot delete user - User have already assigned to some task"
-            }
-            return Response(data=data, status=status.HTTP_400_BAD_REQUEST)
+        data = {"message": REMOVE_MEMBER_MESSAGES[outcome["status"]]}
+        if outcome["status"] == members.IS_STAGE_OWNER:
+            data["stages"] = [{"stage": stage_id} for stage_id in outcome["stages"]]
+        return Response(data=data, status=status.HTTP_400_BAD_REQUEST)
 
-        if is_pm(user=user, project=project):
-            data = {"message": "Cannot delete PM"}
-            return Response(data=data, status=status.HTTP_400_BAD_REQUEST)
 
-        stages = Stage.objects.filter(project=project)
-        user_stages = UserStage.objects.filter(
-            user=user, stage__in=stages, role=constants.STAGE_OWNER
-        ).values("stage")
+class RemoveMembersOfProject(APIView):
+    permission_classes = [IsAuthenticated, IsPM]
 
-        if user_stages:
-            data = {
-                "message": "Cannot delete user - User have already been stage owner of some stage",
-                "stages": user_stages,
-            }
-            return Response(data=data, status=status.HTTP_400_BAD_REQUEST)
+    @extend_schema(request=RemoveMembersSerializer)
+    def post(self, request, project_id):
+        serializer = RemoveMembersSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status.HTTP_400_BAD_REQUEST)
 
-        UserStage.objects.filter(user=user, stage__in=stages).delete()
-        UserProject.objects.filter(user=user, project=project).delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        outcomes = remove_members(
+            project_id, serializer.validated_data["user_ids"], request.user
+        )
+        results = []
+        for user_id, outcome in outcomes.items():
+            removed = outcome["status"] == members.REMOVED
+            result = {"user_id": user_id, "removed": removed}
+            if not removed:
+                result["reason"] = outcome["status"]
+                result["message"] = REMOVE_MEMBER_MESSAGES[outcome["status"]]
+            if "stages" in outcome:
+                result["stages"] = outcome["stages"]
+            results.append(result)
+        return Response({"results": results}, status=status.HTTP_200_OK)
 
 
 class ReportListView(CreateAPIView):
@@ -399,6 +579,7 @@ class ReportListView(CreateAPIView):
     permission_classes = [IsAuthenticated, IsPMOrProjectMember]
 
     @extend_schema(request=ReportSerializer, responses=ReportSerializer)
+    @method_decorator(idempotent)
     def post(self, request, project_id):
         project = get_object_or_404(Project, pk=project_id)
         serializer = ReportSerializer(data=request.data)
@@ -408,6 +589,263 @@ class ReportListView(CreateAPIView):
                 user=request.user,
                 project=project,
             )
-            serializer = ReportSerializer(report)
+            serializer = ReportSerializer(report, context={"request": request})
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ProjectTimeline(APIView):
+    permission_classes = [IsAuthenticated, IsPMOrProjectMember]
+
+    @extend_schema(parameters=[TimelineQuerySerializer])
+    def get(self, request, project_id):
+        serializer = TimelineQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        stages = list(
+            Stage.objects.filter(project_id=project_id).values_list(
+                "id", "name", "start_date", "end_date", "status"
+            )
+        )
+        tasks = Task.objects.filter(stage__project_id=project_id)
+        # Imported here so workers only load numpy once it is needed.
+        from app.utils.timeline import build_timeline, get_window
+
+        dates = [row[2] for row in stages] + [row[3] for row in stages]
+        bounds = tasks.aggregate(Min("start_date"), Max("end_date"))
+        start, end = get_window(
+            [date for date in [*dates, *bounds.values()] if date is not None],
+            serializer.validated_data.get("start"),
+            serializer.validated_data.get("end"),
+        )
+        # Only the tasks in the range are read.
+        tasks = tasks.filter(start_date__lte=end, end_date__gte=start).values_list(
+            "id", "stage_id", "content", "status", "start_date", "end_date", "user_id"
+        )
+        data = build_timeline(
+            stages,
+            list(tasks),
+            serializer.validated_data["bucket"],
+            start,
+            end,
+        )
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class ProjectChanges(APIView):
+    permission_classes = [IsAuthenticated, IsPMOrProjectMember]
+
+    @extend_schema(parameters=[ChangesQuerySerializer])
+    def get(self, request, project_id):
+        serializer = ChangesQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            data = get_changes(
+                project_id,
+                cursor=serializer.validated_data.get("since"),
+                limit=serializer.validated_data["limit"],
+            )
+        except InvalidCursor:
+            return Response(
+                {"since": [_("Invalid cursor")]}, status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class ProjectActivity(APIView):
+    permission_classes = [IsAuthenticated, IsPMOrProjectMember]
+
+    @extend_schema(parameters=[ActivityQuerySerializer])
+    def get(self, request, project_id):
+        serializer = ActivityQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = get_activity(project_id, **serializer.validated_data)
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class Search(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(parameters=[SearchQuerySerializer])
+    def get(self, request):
+        serializer = SearchQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        query = serializer.validated_data
+        kind = SEARCH_KINDS.get(query.get("type"))
+        data = search(request.user, query["q"], kind, query["limit"], query["offset"])
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class Batch(APIView):
+    permission_classes = [IsAuthenticated]
+    batchable = False
+
+    @extend_schema(request=BatchSerializer)
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        responses = run_batch(
+            request,
+            serializer.validated_data["requests"],
+            serializer.validated_data["concurrent"],
+        )
+        return Response({"responses": responses}, status=status.HTTP_200_OK)
+
+
+class Workload(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(parameters=[WorkloadQuerySerializer])
+    def get(self, request):
+        serializer = WorkloadQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        project_ids = set(serializer.validated_data["projects"])
+        managed = UserProject.objects.filter(
+            user=request.user,
+            project_id__in=project_ids,
+            role=constants.PROJECT_MANAGER,
+        ).count()
+        if managed != len(project_ids):
+            return Response(status=status.HTTP_403_FORBIDDEN)
+
+        # Imported here so workers only load numpy once it is needed.
+        from app.utils.workload import get_workload
+
+        data = get_workload(
+            project_ids,
+            serializer.validated_data["start"],
+            serializer.validated_data["end"],
+        )
+        return Response(data, status=status.HTTP_200_OK)
+
+
+def get_event_stream_user(request):
+    try:
+        authenticated = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    if authenticated is not None:
+        return authenticated[0]
+    # Session users, on the workers of the HTML site that authenticate them.
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user
+    return None
+
+
+async def event_stream(subscription):
+    try:
+        yield "retry: %d\n\n" % settings.EVENTS_RETRY_MS
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.get(), settings.EVENTS_HEARTBEAT
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            data = json.dumps(event, cls=DjangoJSONEncoder)
+            yield "event: %s\ndata: %s\n\n" % (event["type"], data)
+    finally:
+        subscription.close()
+
+
+async def project_events(request, project_id):
+    """Stream the committed changes of a project as server-sent events."""
+    user = await sync_to_async(get_event_stream_user)(request)
+    if user is None:
+        return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+    if not await sync_to_async(is_in_project)(user=user, project=project_id):
+        return HttpResponse(status=status.HTTP_403_FORBIDDEN)
+
+    response = StreamingHttpResponse(
+        event_stream(subscribe(project_id)), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+class CalendarFeedUrl(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        token = ics.get_feed_token(request.user)
+        url = request.build_absolute_uri(reverse("calendar_feed", args=[token]))
+        return Response({"url": url}, status=status.HTTP_200_OK)
+
+
+@require_safe
+def calendar_feed(request, token):
+    """Serve the stage and task deadlines of a user as an iCalendar feed.
+
+    The token in the URL stands in for the user, as calendar clients can't
+    send credentials. Polls of an unchanged feed are answered from the cache.
+    """
+    user_id = ics.get_feed_user_id(token)
+    if user_id is None:
+        return HttpResponse(status=status.HTTP_404_NOT_FOUND)
+
+    etag, last_modified = ics.get_feed_version(user_id)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = StreamingHttpResponse(
+            ics.get_feed(user_id, etag), content_type="text/calendar; charset=utf-8"
+        )
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def db_pool_stats(request):
+    return Response(pool_stats(), status=status.HTTP_200_OK)
+
+
+def swagger_ui(request, *args, **kwargs):
+    # drf_spectacular.views is only imported once the UI is opened.
+    from drf_spectacular.views import SpectacularSwaggerView
+
+    # The schema URL of each version can be cached for long.
+    url = "%s?v=%s" % (reverse("schema"), get_code_version())
+    view = SpectacularSwaggerView.as_view(url=url)
+    return view(request, *args, **kwargs)
+
+
+def schema_etag(request):
+    return get_schema(get_language())[1]
+
+
+@condition(etag_func=schema_etag)
+def schema_content(request):
+    return HttpResponse(
+        get_schema(get_language())[0],
+        content_type="application/vnd.oai.openapi+json",
+    )
+
+
+def schema(request):
+    """Serve the OpenAPI schema, cached for long under the URL of its version.
+
+    The plain URL stays the same across versions, so clients check its ETag on
+    every load.
+    """
+    response = schema_content(request)
+    if request.GET.get("v") == get_code_version():
+        patch_cache_control(response, public=True, max_age=settings.SCHEMA_MAX_AGE)
+    else:
+        patch_cache_control(response, no_cache=True)
+    return response
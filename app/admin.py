@@ -1,5 +1,14 @@
 from django.contrib import admin
-from .models import Project, Stage, Task, UserProject, UserStage, Report
+from .models import (
+    ActivityLog,
+    Project,
+    Stage,
+    Task,
+    UserProject,
+    UserStage,
+    Report,
+    Tombstone,
+)
 
 # Register your models here.
 
@@ -8,6 +17,8 @@ admin.site.register(Task)
 admin.site.register(UserProject)
 admin.site.register(UserStage)
 admin.site.register(Report)
+admin.site.register(Tombstone)
+admin.site.register(ActivityLog)
 
 
 @admin.register(Project)
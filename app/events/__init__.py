@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from ..utils.versions import bump_project_versions
+from .broker import Broker
+
+broker = Broker()
+_transport = None
+
+
+def get_transport():
+    global _transport
+    if _transport is None:
+        _transport = import_string(settings.EVENTS_TRANSPORT)(broker.dispatch)
+    return _transport
+
+
+def channel(project_id):
+    return f"project:{project_id}"
+
+
+def publish(project_id, event):
+    get_transport().publish(channel(project_id), event)
+
+
+def subscribe(project_id):
+    return broker.subscribe(channel(project_id), settings.EVENTS_QUEUE_SIZE)
+
+
+def notify_project_change(project_id, event):
+    """Bump the project version and publish ``event`` once the write commits."""
+
+    def send():
+        bump_project_versions([project_id])
+        publish(project_id, event)
+
+    transaction.on_commit(send)
@@ -0,0 +1,20 @@
+class BaseTransport:
+    """Carries events between processes and hands them to ``deliver``.
+
+    ``deliver(channel, event)`` fans an event out to the subscribers of this
+    process. A cross-process transport publishes to its message bus and calls
+    ``deliver`` for every message it receives, including its own.
+    """
+
+    def __init__(self, deliver):
+        self.deliver = deliver
+
+    def publish(self, channel, event):
+        raise NotImplementedError
+
+
+class LocalTransport(BaseTransport):
+    """Stand-in transport for a single process, used in development and tests."""
+
+    def publish(self, channel, event):
+        self.deliver(channel, event)
@@ -7,6 +7,7 @@ from django.utils.translation import gettext_lazy as _
 
 from .models import Task, Stage, UserStage
 from .utils import constants
+from .utils.members import transfer_stage_owner
 
 
 class TaskForm(forms.ModelForm):
@@ -131,6 +132,7 @@ class StageUpdateForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         project_id = kwargs.pop("project_id", None)
+        self.actor = kwargs.pop("actor", None)
         super(StageUpdateForm, self).__init__(*args, **kwargs)
 
         if project_id:
@@ -144,28 +146,10 @@ class StageUpdateForm(forms.ModelForm):
         self.initial["user"] = stage_owner.user if stage_owner else None
 
     def save(self, commit=True):
-        instance = super().save(commit=False)
+        instance = super().save(commit=commit)
         user = self.cleaned_data["user"]
         if user:
-            old_stage_owner = UserStage.objects.filter(
-                stage=instance, role=constants.STAGE_OWNER
-            ).first()
-
-            if old_stage_owner:
-                old_stage_owner.role = constants.MEMBER
-                old_stage_owner.save()
-
-            try:
-                user_stage = UserStage.objects.get(user=user, stage=instance)
-                user_stage.role = constants.STAGE_OWNER
-                user_stage.save()
-            except ObjectDoesNotExist:
-                UserStage.objects.create(
-                    user=user, stage=instance, role=constants.STAGE_OWNER
-                )
-
-        if commit:
-            instance.save()
+            transfer_stage_owner(instance, user.pk, self.actor)
 
         return instance
 
@@ -0,0 +1,82 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from app.models import Stage, Task
+from app.utils import constants
+from app.utils.versions import bump_project_versions
+
+
+def evaluate_stage_status(start_date, end_date, total, resolved, today, tolerance):
+    """Return SLOWED when the resolved ratio trails the elapsed time ratio."""
+    if not total or today < start_date:
+        return constants.ACTIVE
+    duration = (end_date - start_date).days + 1
+    elapsed = min((today - start_date).days + 1, duration) / duration
+    if elapsed - resolved / total > tolerance:
+        return constants.SLOWED
+    return constants.ACTIVE
+
+
+class Command(BaseCommand):
+    help = "Mark open stages as Slowed or Active from their task progress"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tolerance", type=float, default=constants.STAGE_SLOWED_TOLERANCE
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        open_stages = Stage.objects.filter(
+            status__in=constants.STAGE_OPEN_STATUSES, deleted_at__isnull=True
+        )
+
+        # Rejected tasks are not expected to be resolved, so they don't count.
+        progress = {
+            stage_id: (total, resolved)
+            for stage_id, total, resolved in Task.objects.filter(stage__in=open_stages)
+            .values("stage_id")
+            .annotate(
+                total=Count("id", filter=~Q(status=constants.TASK_REJECTED)),
+                resolved=Count("id", filter=Q(status=constants.TASK_RESOLVED)),
+            )
+            .values_list("stage_id", "total", "resolved")
+            .order_by()
+        }
+
+        changes = {constants.ACTIVE: [], constants.SLOWED: []}
+        projects = set()
+        rows = open_stages.values_list(
+            "id", "project_id", "start_date", "end_date", "status"
+        )
+        for pk, project_id, start_date, end_date, current in rows.iterator(
+            chunk_size=options["batch_size"]
+        ):
+            total, resolved = progress.get(pk, (0, 0))
+            new_status = evaluate_stage_status(
+                start_date, end_date, total, resolved, today, options["tolerance"]
+            )
+            if new_status != current:
+                changes[new_status].append(pk)
+                projects.add(project_id)
+
+        if not options["dry_run"]:
+            batch_size = options["batch_size"]
+            for new_status, stage_ids in changes.items():
+                for index in range(0, len(stage_ids), batch_size):
+                    Stage.objects.filter(
+                        pk__in=stage_ids[index : index + batch_size]
+                    ).update(
+                        status=new_status,
+                        version=F("version") + 1,
+                        updated_at=timezone.now(),
+                    )
+            bump_project_versions(projects)
+
+        self.stdout.write(
+            "%d stages slowed, %d stages back on track"
+            % (len(changes[constants.SLOWED]), len(changes[constants.ACTIVE]))
+        )
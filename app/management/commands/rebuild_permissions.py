@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app.models import EffectivePermission, Project
+from app.utils.permissions import get_global_rows, get_project_rows
+from app.utils.queries import delete_without_signals
+
+
+class Command(BaseCommand):
+    help = "Rebuild the effective permissions from the memberships"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Projects per transaction"
+        )
+
+    def handle(self, *args, **options):
+        project_ids = list(Project.objects.values_list("pk", flat=True))
+        batch_size = options["batch_size"]
+        total = 0
+        for index in range(0, len(project_ids), batch_size):
+            batch = project_ids[index : index + batch_size]
+            with transaction.atomic():
+                stale = EffectivePermission.objects.filter(project_id__in=batch)
+                delete_without_signals(stale)
+                total += len(
+                    EffectivePermission.objects.bulk_create(
+                        get_project_rows(batch), batch_size=5000
+                    )
+                )
+        with transaction.atomic():
+            stale = EffectivePermission.objects.filter(project__isnull=True)
+            delete_without_signals(stale)
+            total += len(EffectivePermission.objects.bulk_create(get_global_rows()))
+        self.stdout.write("%d permissions written" % total)
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from app.models import Project, Report, SearchDocument, SearchPosting, Stage, Task
+from app.utils.queries import delete_without_signals
+from app.utils.search import index_documents
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search index of projects, stages, tasks and reports"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        # Deleted without loading the index into memory to cascade.
+        delete_without_signals(SearchPosting.objects.all())
+        delete_without_signals(SearchDocument.objects.all())
+        querysets = [
+            Project.objects.all(),
+            Stage.objects.all(),
+            Task.objects.select_related("stage"),
+            Report.objects.all(),
+        ]
+        total = 0
+        for queryset in querysets:
+            batch = []
+            for instance in queryset.iterator(chunk_size=options["batch_size"]):
+                batch.append(instance)
+                if len(batch) == options["batch_size"]:
+                    total += index_documents(batch)
+                    batch = []
+            total += index_documents(batch)
+        self.stdout.write("%d documents indexed" % total)
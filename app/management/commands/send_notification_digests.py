@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from app.utils.notifications import send_digests
+
+
+class Command(BaseCommand):
+    help = (
+        "Email every user a digest of their pending notifications; "
+        "run it once per digest interval"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=100, help="Users per batch"
+        )
+
+    def handle(self, *args, **options):
+        sent = send_digests(options["batch_size"])
+        self.stdout.write("%d digests sent" % sent)
@@ -0,0 +1,12 @@
+from .utils import activity
+
+
+class ActivityLogMiddleware:
+    """Write the activities of a request with one INSERT once it is handled."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with activity.buffered():
+            return self.get_response(request)
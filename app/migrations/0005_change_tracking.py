@@ -0,0 +1,85 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0004_remove_task_user_alter_userproject_role_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, verbose_name="Updated at"
+            ),
+        ),
+        migrations.AddField(
+            model_name="stage",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, verbose_name="Updated at"
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, verbose_name="Updated at"
+            ),
+        ),
+        migrations.AddField(
+            model_name="userproject",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, verbose_name="Updated at"
+            ),
+        ),
+        migrations.AddField(
+            model_name="userstage",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, verbose_name="Updated at"
+            ),
+        ),
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model", models.CharField(max_length=20, verbose_name="Model")),
+                ("object_id", models.BigIntegerField(verbose_name="Object ID")),
+                ("data", models.JSONField(default=dict, verbose_name="Data")),
+                (
+                    "deleted_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Deleted at"),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="app.project",
+                        verbose_name="Project",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["project", "deleted_at"],
+                        name="app_tombsto_project_e1fad7_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:16
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("app", "0005_change_tracking"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActivityLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "action",
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (0, "project_created"),
+                            (1, "project_updated"),
+                            (2, "project_closed"),
+                            (3, "stage_created"),
+                            (4, "stage_updated"),
+                            (5, "stage_closed"),
+                            (6, "stage_owner_changed"),
+                            (7, "member_added"),
+                            (8, "member_removed"),
+                            (9, "stage_member_added"),
+                            (10, "stage_member_removed"),
+                        ],
+                        verbose_name="Action",
+                    ),
+                ),
+                (
+                    "object_id",
+                    models.BigIntegerField(null=True, verbose_name="Object ID"),
+                ),
+                ("data", models.JSONField(default=dict, verbose_name="Data")),
+                ("month", models.PositiveIntegerField(verbose_name="Month")),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Created at"
+                    ),
+                ),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Actor",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="app.project",
+                        verbose_name="Project",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["project", "id"], name="app_activit_project_15a043_idx"
+                    ),
+                    models.Index(fields=["month"], name="app_activit_month_49706e_idx"),
+                ],
+            },
+        ),
+    ]
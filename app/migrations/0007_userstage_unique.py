@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Value of app.utils.constants when this migration was written.
+STAGE_OWNER = 0
+
+
+def remove_duplicates(apps, schema_editor):
+    """Keep one membership of a user in a stage: the owner one, else the first."""
+    UserStage = apps.get_model("app", "UserStage")
+    duplicated = (
+        UserStage.objects.order_by()
+        .values_list("user_id", "stage_id")
+        .annotate(count=models.Count("pk"))
+        .filter(count__gt=1)
+    )
+    for user_id, stage_id, count in duplicated:
+        rows = UserStage.objects.filter(user_id=user_id, stage_id=stage_id)
+        kept = (
+            rows.filter(role=STAGE_OWNER).order_by("pk").first()
+            or rows.order_by("pk").first()
+        )
+        rows.exclude(pk=kept.pk).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("app", "0006_activity_log"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="userstage",
+            unique_together={("user", "stage")},
+        ),
+    ]
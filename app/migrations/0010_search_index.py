@@ -0,0 +1,89 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0009_idempotency_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (0, "project"),
+                            (1, "stage"),
+                            (2, "task"),
+                            (3, "report"),
+                        ],
+                        verbose_name="Kind",
+                    ),
+                ),
+                ("object_id", models.BigIntegerField(verbose_name="Object ID")),
+                ("title", models.CharField(max_length=200, verbose_name="Title")),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="app.project",
+                        verbose_name="Project",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("kind", "object_id")},
+            },
+        ),
+        migrations.CreateModel(
+            name="SearchPosting",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("token", models.CharField(max_length=40, verbose_name="Token")),
+                ("project_id", models.BigIntegerField(verbose_name="Project ID")),
+                (
+                    "frequency",
+                    models.PositiveSmallIntegerField(verbose_name="Frequency"),
+                ),
+                (
+                    "document",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="app.searchdocument",
+                        verbose_name="Document",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["token", "project_id"],
+                        name="app_searchp_token_076d84_idx",
+                    )
+                ],
+                "unique_together": {("document", "token")},
+            },
+        ),
+    ]
@@ -0,0 +1,139 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Values of app.utils.constants when this migration was written.
+PROJECT_MANAGER = 2
+STAGE_OWNER = 0
+CAN_VIEW_PROJECT = 0
+CAN_MANAGE_PROJECT = 1
+CAN_VIEW_STAGE = 2
+CAN_MANAGE_STAGE = 3
+CAN_CREATE_TASK = 4
+
+
+def populate(apps, schema_editor):
+    EffectivePermission = apps.get_model("app", "EffectivePermission")
+    UserProject = apps.get_model("app", "UserProject")
+    UserStage = apps.get_model("app", "UserStage")
+    Stage = apps.get_model("app", "Stage")
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+
+    rows = set()
+    managers = {}
+    for user_id, project_id, role in UserProject.objects.values_list(
+        "user_id", "project_id", "role"
+    ).iterator():
+        rows.add((user_id, project_id, None, CAN_VIEW_PROJECT))
+        if role == PROJECT_MANAGER:
+            rows.add((user_id, project_id, None, CAN_MANAGE_PROJECT))
+            managers.setdefault(project_id, []).append(user_id)
+    for stage_id, project_id in Stage.objects.values_list("pk", "project_id"):
+        for user_id in managers.get(project_id, []):
+            rows.add((user_id, project_id, stage_id, CAN_VIEW_STAGE))
+            rows.add((user_id, project_id, stage_id, CAN_MANAGE_STAGE))
+    for user_id, stage_id, project_id, role in UserStage.objects.values_list(
+        "user_id", "stage_id", "stage__project_id", "role"
+    ).iterator():
+        rows.add((user_id, project_id, stage_id, CAN_VIEW_STAGE))
+        if role == STAGE_OWNER:
+            rows.add((user_id, project_id, stage_id, CAN_MANAGE_STAGE))
+    for user_id in (
+        User.objects.filter(groups__name__in=["Stage_Owner", "PM"])
+        .values_list("pk", flat=True)
+        .distinct()
+    ):
+        rows.add((user_id, None, None, CAN_CREATE_TASK))
+
+    EffectivePermission.objects.bulk_create(
+        [
+            EffectivePermission(
+                user_id=user_id,
+                project_id=project_id,
+                stage_id=stage_id,
+                capability=capability,
+            )
+            for user_id, project_id, stage_id, capability in rows
+        ],
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("app", "0010_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EffectivePermission",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "capability",
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (0, "view_project"),
+                            (1, "manage_project"),
+                            (2, "view_stage"),
+                            (3, "manage_stage"),
+                            (4, "create_task"),
+                        ],
+                        verbose_name="Capability",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="app.project",
+                        verbose_name="Project",
+                    ),
+                ),
+                (
+                    "stage",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="app.stage",
+                        verbose_name="Stage",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="User",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["user", "capability", "project"],
+                        name="app_effecti_user_id_ea8667_idx",
+                    ),
+                    models.Index(
+                        fields=["user", "capability", "stage"],
+                        name="app_effecti_user_id_4be43b_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,10 @@
 import datetime
 
 from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models.signals import post_save
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from app.utils import constants
@@ -12,7 +15,54 @@ class CustomUser(models.Model):
     verify_token = models.CharField(_("Verify token"), max_length=255, null=True)
 
 
-class Project(models.Model):
+class VersionConflict(Exception):
+    """The row was changed since the version the write was based on."""
+
+
+class VersionedModel(models.Model):
+    """Row with a version that every write increments, for optimistic locking."""
+
+    version = models.PositiveIntegerField(_("Version"), default=1)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "version"}
+        super().save(*args, **kwargs)
+
+    def save_if_version(self, version, update_fields):
+        """Write ``update_fields`` only if the row is still at ``version``.
+
+        The check is the ``WHERE`` of a single UPDATE, so it takes no lock and
+        reads nothing back; ``VersionConflict`` is raised if no row matched.
+        """
+        now = timezone.now()
+        values = {name: getattr(self, name) for name in update_fields}
+        updated = (
+            type(self)
+            ._base_manager.filter(pk=self.pk, version=version)
+            .update(version=version + 1, updated_at=now, **values)
+        )
+        if not updated:
+            raise VersionConflict
+        self.version = version + 1
+        self.updated_at = now
+        post_save.send(
+            sender=type(self),
+            instance=self,
+            created=False,
+            update_fields=frozenset(update_fields),
+            raw=False,
+            using=self._state.db,
+        )
+
+
+class Project(VersionedModel):
     name = models.CharField(_("Project name"), max_length=50)
     describe = models.CharField(_("Describe"), max_length=500)
     start_date = models.DateField(_("Start date"), auto_now_add=True)
@@ -23,15 +73,19 @@ class Project(models.Model):
         default=constants.PROJECT_STATUS_DEFAULT,
     )
     deleted_at = models.DateTimeField(_("Deleted at"), null=True, blank=True)
+    updated_at = models.DateTimeField(_("Updated at"), auto_now=True, db_index=True)
     user = models.ManyToManyField(User, verbose_name=_("User"), through="UserProject")
 
     def __str__(self):
         return self.name
 
-    def delete(self):
+    def delete(self, actor=None):
+        from app.utils.activity import record
+
         self.status = constants.CLOSED
         self.deleted_at = datetime.datetime.now()
         self.save()
+        record(self.pk, constants.ACTIVITY_PROJECT_CLOSED, actor, self.pk)
 
 
 class UserProject(models.Model):
@@ -43,12 +97,13 @@ class UserProject(models.Model):
         choices=constants.ROLE_USERPROJECT_CHOICES,
         default=constants.ROLE_USERPROJECT_DEFAULT,
     )
+    updated_at = models.DateTimeField(_("Updated at"), auto_now=True, db_index=True)
 
     class Meta:
         unique_together = (("user", "project"),)
 
 
-class Stage(models.Model):
+class Stage(VersionedModel):
     name = models.CharField(_("Name"), max_length=50)
     start_date = models.DateField(_("Start date"))
     end_date = models.DateField(_("End date"))
@@ -60,11 +115,15 @@ class Stage(models.Model):
         default=constants.STAGE_STATUS_DEFAULT,
     )
     deleted_at = models.DateTimeField(_("Deleted at"), null=True, blank=True)
+    updated_at = models.DateTimeField(_("Updated at"), auto_now=True, db_index=True)
+
+    def delete(self, *args, actor=None, **kwargs):
+        from app.utils.activity import record
 
-    def delete(self, *args, **kwargs):
         self.status = constants.CLOSED
         self.deleted_at = datetime.datetime.now()
         self.save()
+        record(self.project_id, constants.ACTIVITY_STAGE_CLOSED, actor, self.pk)
 
 
 class UserStage(models.Model):
@@ -75,12 +134,13 @@ class UserStage(models.Model):
         choices=constants.ROLE_USERSTAGE_CHOICES,
         default=constants.ROLE_USERSTAGE_DEFAULT,
     )
+    updated_at = models.DateTimeField(_("Updated at"), auto_now=True, db_index=True)
 
-    class _Meta:
+    class Meta:
         unique_together = ["user", "stage"]
 
 
-class Task(models.Model):
+class Task(VersionedModel):
     content = models.CharField(_("Content"), max_length=200)
     start_date = models.DateField(_("Start date"))
     end_date = models.DateField(_("End date"))
@@ -90,7 +150,13 @@ class Task(models.Model):
         default=constants.TASK_STATUS_DEFAULT,
     )
     stage = models.ForeignKey(Stage, on_delete=models.CASCADE)
-    user = models.ForeignKey(User,on_delete=models.SET_NULL, null=True )
+    user = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, db_index=False
+    )
+    updated_at = models.DateTimeField(_("Updated at"), auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "end_date"])]
 
 
 
@@ -102,3 +168,152 @@ class Report(models.Model):
     project = models.ForeignKey(
         Project, verbose_name=_("Project"), on_delete=models.CASCADE
     )
+
+
+class Tombstone(models.Model):
+    """Hard deleted row of a project, kept for incremental client sync."""
+
+    project = models.ForeignKey(
+        Project, verbose_name=_("Project"), on_delete=models.CASCADE
+    )
+    model = models.CharField(_("Model"), max_length=20)
+    object_id = models.BigIntegerField(_("Object ID"))
+    data = models.JSONField(_("Data"), default=dict)
+    deleted_at = models.DateTimeField(_("Deleted at"), auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["project", "deleted_at"])]
+
+
+class ActivityLog(models.Model):
+    """Append-only record of a change made to a project and who made it."""
+
+    project = models.ForeignKey(
+        Project, verbose_name=_("Project"), on_delete=models.CASCADE, db_index=False
+    )
+    actor = models.ForeignKey(
+        User,
+        verbose_name=_("Actor"),
+        on_delete=models.SET_NULL,
+        null=True,
+        db_index=False,
+        related_name="+",
+    )
+    action = models.PositiveSmallIntegerField(
+        _("Action"), choices=constants.ACTIVITY_CHOICES
+    )
+    object_id = models.BigIntegerField(_("Object ID"), null=True)
+    data = models.JSONField(_("Data"), default=dict)
+    # yyyymm, so old months can be archived or dropped with one range scan.
+    month = models.PositiveIntegerField(_("Month"))
+    created_at = models.DateTimeField(_("Created at"), default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["project", "id"]),
+            models.Index(fields=["month"]),
+        ]
+
+
+class IdempotencyKey(models.Model):
+    """Response of a POST, replayed when it is retried with the same key."""
+
+    user = models.ForeignKey(
+        User, verbose_name=_("User"), on_delete=models.CASCADE, db_index=False
+    )
+    key = models.CharField(_("Key"), max_length=255)
+    request_hash = models.CharField(_("Request hash"), max_length=64)
+    status = models.PositiveSmallIntegerField(_("Status"), null=True)
+    body = models.JSONField(_("Body"), null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(_("Created at"), default=timezone.now)
+
+    class Meta:
+        unique_together = [["user", "key"]]
+        indexes = [models.Index(fields=["created_at"])]
+
+
+class SearchDocument(models.Model):
+    """Searchable text of a project, stage, task or report."""
+
+    project = models.ForeignKey(
+        Project, verbose_name=_("Project"), on_delete=models.CASCADE
+    )
+    kind = models.PositiveSmallIntegerField(
+        _("Kind"), choices=constants.SEARCH_KIND_CHOICES
+    )
+    object_id = models.BigIntegerField(_("Object ID"))
+    title = models.CharField(_("Title"), max_length=constants.SEARCH_TITLE_MAX_LENGTH)
+
+    class Meta:
+        unique_together = [["kind", "object_id"]]
+
+
+class SearchPosting(models.Model):
+    """Occurrences of a token in a document, the inverted index of search."""
+
+    token = models.CharField(_("Token"), max_length=constants.SEARCH_TOKEN_MAX_LENGTH)
+    document = models.ForeignKey(
+        SearchDocument, verbose_name=_("Document"), on_delete=models.CASCADE
+    )
+    # Copied from the document, so postings are filtered by project in the
+    # index without a join.
+    project_id = models.BigIntegerField(_("Project ID"))
+    frequency = models.PositiveSmallIntegerField(_("Frequency"))
+
+    class Meta:
+        unique_together = [["document", "token"]]
+        indexes = [models.Index(fields=["token", "project_id"])]
+
+
+class EffectivePermission(models.Model):
+    """Capability a user has, derived from memberships by app.utils.permissions.
+
+    Project capabilities have no stage and global ones neither a project.
+    """
+
+    user = models.ForeignKey(
+        User,
+        verbose_name=_("User"),
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name="+",
+    )
+    project = models.ForeignKey(
+        Project, verbose_name=_("Project"), on_delete=models.CASCADE, null=True
+    )
+    stage = models.ForeignKey(
+        Stage, verbose_name=_("Stage"), on_delete=models.CASCADE, null=True
+    )
+    capability = models.PositiveSmallIntegerField(
+        _("Capability"), choices=constants.CAPABILITY_CHOICES
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "capability", "project"]),
+            models.Index(fields=["user", "capability", "stage"]),
+        ]
+
+
+class PendingNotification(models.Model):
+    """Event a user is told about in their next digest, see app.utils.notifications."""
+
+    user = models.ForeignKey(
+        User, verbose_name=_("User"), on_delete=models.CASCADE, related_name="+"
+    )
+    project = models.ForeignKey(
+        Project, verbose_name=_("Project"), on_delete=models.CASCADE
+    )
+    actor = models.ForeignKey(
+        User,
+        verbose_name=_("Actor"),
+        on_delete=models.SET_NULL,
+        null=True,
+        db_index=False,
+        related_name="+",
+    )
+    kind = models.PositiveSmallIntegerField(
+        _("Kind"), choices=constants.NOTIFICATION_CHOICES
+    )
+    data = models.JSONField(_("Data"), default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
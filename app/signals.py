@@ -0,0 +1,148 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .events import notify_project_change
+from .models import Project, Report, Stage, Task, UserProject, UserStage
+from .utils import constants, search
+from .utils.permissions import refresh_global_permissions, refresh_permissions
+from .utils.changes import record_tombstones
+
+EVENT_TYPES = {
+    Project: "project",
+    Stage: "stage",
+    Task: "task",
+    UserProject: "project_member",
+    UserStage: "stage_member",
+}
+
+
+def get_project_id(instance):
+    if isinstance(instance, Project):
+        return instance.pk
+    if isinstance(instance, (Stage, UserProject)):
+        return instance.project_id
+    try:
+        return instance.stage.project_id
+    except Stage.DoesNotExist:
+        # The stage is being deleted in the same cascade.
+        return None
+
+
+def is_cascade_of(origin, models):
+    return isinstance(origin, models) or getattr(origin, "model", None) in models
+
+
+def get_event(instance, action):
+    event = {"type": EVENT_TYPES[type(instance)], "action": action, "id": instance.pk}
+    if isinstance(instance, (Task, UserStage)):
+        event["stage"] = instance.stage_id
+    if isinstance(instance, (UserProject, UserStage)):
+        event["user"] = instance.user_id
+    return event
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Stage)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=UserProject)
+@receiver(post_save, sender=UserStage)
+def instance_saved(sender, instance, created, **kwargs):
+    project_id = get_project_id(instance)
+    if project_id is not None:
+        action = "created" if created else "updated"
+        notify_project_change(project_id, get_event(instance, action))
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Stage)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=UserProject)
+@receiver(post_delete, sender=UserStage)
+def instance_deleted(sender, instance, origin=None, **kwargs):
+    project_id = get_project_id(instance)
+    if project_id is None:
+        return
+    event = get_event(instance, "deleted")
+    # Rows removed along with their project need no tombstone.
+    if not is_cascade_of(origin, (Project,)):
+        record_tombstones(project_id, [event])
+    notify_project_change(project_id, event)
+
+
+@receiver(m2m_changed, sender=Stage.user.through)
+def stage_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse or action not in ("post_add", "post_remove", "post_clear"):
+        return
+    refresh_permissions(instance.project_id, pk_set)
+    notify_project_change(
+        instance.project_id,
+        {
+            "type": "stage_member",
+            "action": "created" if action == "post_add" else "deleted",
+            "stage": instance.pk,
+            "users": sorted(pk_set or ()),
+        },
+    )
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Stage)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Report)
+def index_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not search.TEXT_FIELDS[sender] & update_fields:
+        return
+    search.index_document(instance)
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Stage)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Report)
+def unindex_deleted(sender, instance, **kwargs):
+    search.remove_document(instance)
+
+
+@receiver(post_save, sender=UserProject)
+@receiver(post_save, sender=UserStage)
+def membership_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_permissions(get_project_id(instance), [instance.user_id])
+
+
+@receiver(post_delete, sender=UserProject)
+@receiver(post_delete, sender=UserStage)
+def membership_deleted(sender, instance, origin=None, **kwargs):
+    # Permissions of a deleted project or stage go with it.
+    if is_cascade_of(origin, (Project, Stage)):
+        return
+    project_id = get_project_id(instance)
+    if project_id is not None:
+        refresh_permissions(project_id, [instance.user_id])
+
+
+@receiver(post_save, sender=Stage)
+def stage_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        # PMs manage every stage of their project.
+        refresh_permissions(
+            instance.project_id,
+            UserProject.objects.filter(
+                project_id=instance.project_id, role=constants.PROJECT_MANAGER
+            ).values_list("user_id", flat=True),
+        )
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        refresh_global_permissions([instance.pk])
+    elif pk_set is not None:
+        refresh_global_permissions(pk_set)
+    else:
+        refresh_global_permissions()
@@ -0,0 +1,90 @@
+import contextlib
+import logging
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import constants
+from ..models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+ACTION_NAMES = dict(constants.ACTIVITY_CHOICES)
+
+_buffer = ContextVar("activity_buffer", default=None)
+
+
+def record(project_id, action, actor=None, object_id=None, **data):
+    """Log an activity of a project once the current transaction commits.
+
+    Inside ``buffered()`` entries are collected and written together when it
+    exits; elsewhere each entry is written on its own.
+    """
+    now = timezone.now()
+    entry = ActivityLog(
+        project_id=project_id,
+        actor_id=getattr(actor, "pk", actor),
+        action=action,
+        object_id=object_id,
+        data=data,
+        month=now.year * 100 + now.month,
+        created_at=now,
+    )
+    buffer = _buffer.get()
+    if buffer is None:
+        transaction.on_commit(lambda: ActivityLog.objects.bulk_create([entry]))
+    else:
+        transaction.on_commit(lambda: buffer.append(entry))
+
+
+@contextlib.contextmanager
+def buffered():
+    """Write the activities recorded in the block with one ``bulk_create``.
+
+    Entries only join the buffer when their transaction commits, so the write
+    is itself deferred until the transaction open around the block commits.
+    """
+    entries = []
+    token = _buffer.set(entries)
+    try:
+        yield entries
+    finally:
+        _buffer.reset(token)
+        transaction.on_commit(lambda: flush(entries))
+
+
+def flush(entries):
+    if not entries:
+        return
+    try:
+        ActivityLog.objects.bulk_create(entries)
+    except Exception:
+        # The changes are already committed; losing their log must not turn
+        # the response into an error.
+        logger.exception("Could not write %d activities", len(entries))
+
+
+def get_activity(project_id, before=None, limit=50):
+    """Return the activities of a project, newest first, older than ``before``."""
+    rows = ActivityLog.objects.filter(project_id=project_id)
+    if before is not None:
+        rows = rows.filter(pk__lt=before)
+    rows = list(
+        rows.order_by("-pk").values(
+            "id", "action", "actor_id", "object_id", "data", "created_at"
+        )[: limit + 1]
+    )
+    results = [
+        {
+            "id": row["id"],
+            "action": ACTION_NAMES[row["action"]],
+            "actor": row["actor_id"],
+            "object_id": row["object_id"],
+            "data": row["data"],
+            "created_at": row["created_at"],
+        }
+        for row in rows[:limit]
+    ]
+    has_more = len(rows) > limit
+    return {"results": results, "before": results[-1]["id"] if has_more else None}
@@ -0,0 +1,133 @@
+import base64
+import heapq
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from ..models import Project, Stage, Task, Tombstone, UserProject, UserStage
+
+# (type, queryset factory, timestamp field, fields) in cursor order.
+SOURCES = [
+    (
+        "project",
+        lambda project_id: Project.objects.filter(pk=project_id),
+        "updated_at",
+        ["id", "name", "describe", "start_date", "end_date", "status", "deleted_at"],
+    ),
+    (
+        "stage",
+        lambda project_id: Stage.objects.filter(project_id=project_id),
+        "updated_at",
+        ["id", "name", "start_date", "end_date", "status", "deleted_at"],
+    ),
+    (
+        "task",
+        lambda project_id: Task.objects.filter(stage__project_id=project_id),
+        "updated_at",
+        ["id", "stage_id", "content", "start_date", "end_date", "status", "user_id"],
+    ),
+    (
+        "project_member",
+        lambda project_id: UserProject.objects.filter(project_id=project_id),
+        "updated_at",
+        ["id", "user_id", "role"],
+    ),
+    (
+        "stage_member",
+        lambda project_id: UserStage.objects.filter(stage__project_id=project_id),
+        "updated_at",
+        ["id", "stage_id", "user_id", "role"],
+    ),
+    (
+        "tombstone",
+        lambda project_id: Tombstone.objects.filter(project_id=project_id),
+        "deleted_at",
+        ["id", "model", "object_id", "data"],
+    ),
+]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(timestamp, source, pk):
+    raw = json.dumps([timestamp.isoformat(), source, pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        timestamp, source, pk = json.loads(base64.urlsafe_b64decode(cursor))
+        timestamp = parse_datetime(timestamp)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if timestamp is None:
+        raise InvalidCursor(cursor)
+    return timestamp, int(source), int(pk)
+
+
+def keyset_filter(source, field, cursor):
+    """Rows of ``source`` that sort after ``cursor`` by (timestamp, source, pk)."""
+    timestamp, cursor_source, pk = cursor
+    if source > cursor_source:
+        return Q(**{f"{field}__gte": timestamp})
+    if source < cursor_source:
+        return Q(**{f"{field}__gt": timestamp})
+    return Q(**{f"{field}__gt": timestamp}) | Q(**{field: timestamp, "pk__gt": pk})
+
+
+def get_changes(project_id, cursor=None, limit=100):
+    """Return the rows of a project changed after ``cursor``, oldest first.
+
+    Each table is read with its own keyset query and the results are merged,
+    so a page costs one indexed range scan per table.
+    """
+    if cursor is not None:
+        cursor = decode_cursor(cursor)
+
+    pages = []
+    for source, (kind, queryset, field, fields) in enumerate(SOURCES):
+        rows = queryset(project_id)
+        if cursor is not None:
+            rows = rows.filter(keyset_filter(source, field, cursor))
+        rows = rows.order_by(field, "pk").values(field, *fields)[: limit + 1]
+        pages.append([(row.pop(field), source, row["id"], row) for row in rows])
+
+    merged = list(heapq.merge(*pages, key=lambda item: item[:3]))
+    changes = []
+    for timestamp, source, pk, row in merged[:limit]:
+        kind = SOURCES[source][0]
+        if kind == "tombstone":
+            change = {"type": row["model"], "op": "delete", "id": row["object_id"]}
+            change["data"] = row["data"]
+        else:
+            change = {"type": kind, "op": "upsert", "id": pk, "data": row}
+        change["changed_at"] = timestamp
+        changes.append(change)
+
+    next_cursor = None
+    if merged:
+        timestamp, source, pk, _ = merged[:limit][-1]
+        next_cursor = encode_cursor(timestamp, source, pk)
+    return {
+        "changes": changes,
+        "cursor": next_cursor or (encode_cursor(*cursor) if cursor else None),
+        "has_more": len(merged) > limit,
+    }
+
+
+def record_tombstones(project_id, events):
+    """Store one tombstone per deleted-row event of a project."""
+    Tombstone.objects.bulk_create(
+        [
+            Tombstone(
+                project_id=project_id,
+                model=event["type"],
+                object_id=event["id"],
+                data=event,
+            )
+            for event in events
+        ]
+    )
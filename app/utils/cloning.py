@@ -0,0 +1,96 @@
+import datetime
+
+from django.db import transaction
+
+from . import constants
+from .activity import record
+from .permissions import refresh_permissions
+from .search import index_documents
+from ..models import Project, Stage, Task, UserProject, UserStage
+
+
+def clone_project(template, name, start_date=None, actor=None):
+    """Copy a project with its members, stages, stage members and tasks.
+
+    Dates move so that the first stage starts on ``start_date``, today by
+    default. Stages and tasks start over with the default status. Each table
+    is written with one ``bulk_create`` in a single transaction.
+    """
+    start_date = start_date or datetime.date.today()
+    stages = list(Stage.objects.filter(project=template).order_by("pk"))
+    first = min((stage.start_date for stage in stages), default=start_date)
+    shift = start_date - first
+
+    with transaction.atomic():
+        project = Project.objects.create(
+            name=name, describe=template.describe, end_date=template.end_date + shift
+        )
+        UserProject.objects.bulk_create(
+            [
+                UserProject(user_id=user_id, project=project, role=role)
+                for user_id, role in UserProject.objects.filter(
+                    project=template
+                ).values_list("user_id", "role")
+            ]
+        )
+
+        copies = {
+            stage.pk: Stage(
+                name=stage.name,
+                start_date=stage.start_date + shift,
+                end_date=stage.end_date + shift,
+                project=project,
+            )
+            for stage in stages
+        }
+        Stage.objects.bulk_create(copies.values())
+        set_primary_keys(copies.values(), Stage.objects.filter(project=project))
+
+        UserStage.objects.bulk_create(
+            [
+                UserStage(user_id=user_id, stage=copies[stage_id], role=role)
+                for user_id, stage_id, role in UserStage.objects.filter(
+                    stage__project=template
+                ).values_list("user_id", "stage_id", "role")
+            ]
+        )
+
+        tasks = [
+            Task(
+                content=content,
+                start_date=task_start + shift,
+                end_date=task_end + shift,
+                stage=copies[stage_id],
+                user_id=user_id,
+            )
+            for content, task_start, task_end, stage_id, user_id in Task.objects.filter(
+                stage__project=template
+            )
+            .order_by("pk")
+            .values_list("content", "start_date", "end_date", "stage_id", "user_id")
+        ]
+        Task.objects.bulk_create(tasks, batch_size=1000)
+        set_primary_keys(tasks, Task.objects.filter(stage__project=project))
+
+        # Bulk inserts skip the signals keeping these up to date.
+        refresh_permissions(project.pk)
+        index_documents(list(copies.values()))
+        index_documents(tasks)
+        record(
+            project.pk,
+            constants.ACTIVITY_PROJECT_CREATED,
+            actor,
+            project.pk,
+            template=template.pk,
+        )
+    return project
+
+
+def set_primary_keys(instances, queryset):
+    # MySQL doesn't return the primary keys of bulk inserts, but gives the
+    # rows of one insert increasing keys, and the queryset holds only those.
+    instances = list(instances)
+    if instances and instances[0].pk is None:
+        pks = queryset.order_by("pk").values_list("pk", flat=True)
+        for instance, pk in zip(instances, pks):
+            instance.pk = pk
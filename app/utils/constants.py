@@ -7,6 +7,10 @@ TASK_STATUS_CHOICES = (
 
 TASK_NEW = 0
 TASK_IN_PROGRESS = 1
+TASK_RESOLVED = 2
+TASK_REJECTED = 3
+
+TASK_OPEN_STATUSES = (TASK_NEW, TASK_IN_PROGRESS)
 
 TASK_STATUS_DEFAULT = 0
 
@@ -45,5 +49,89 @@ STAGE_STATUS_CHOICES = (
     (2, "Slowed"),
 )
 
+SLOWED = 2
+
 STAGE_STATUS_DEFAULT = 0
+STAGE_OPEN_STATUSES = (ACTIVE, SLOWED)
+# A stage is slowed when its resolved ratio trails elapsed time by more than this
+STAGE_SLOWED_TOLERANCE = 0.2
 ROLE_CHOICES = ((1, "Member"),)
+
+ACTIVITY_PROJECT_CREATED = 0
+ACTIVITY_PROJECT_UPDATED = 1
+ACTIVITY_PROJECT_CLOSED = 2
+ACTIVITY_STAGE_CREATED = 3
+ACTIVITY_STAGE_UPDATED = 4
+ACTIVITY_STAGE_CLOSED = 5
+ACTIVITY_STAGE_OWNER_CHANGED = 6
+ACTIVITY_MEMBER_ADDED = 7
+ACTIVITY_MEMBER_REMOVED = 8
+ACTIVITY_STAGE_MEMBER_ADDED = 9
+ACTIVITY_STAGE_MEMBER_REMOVED = 10
+
+ACTIVITY_CHOICES = (
+    (ACTIVITY_PROJECT_CREATED, "project_created"),
+    (ACTIVITY_PROJECT_UPDATED, "project_updated"),
+    (ACTIVITY_PROJECT_CLOSED, "project_closed"),
+    (ACTIVITY_STAGE_CREATED, "stage_created"),
+    (ACTIVITY_STAGE_UPDATED, "stage_updated"),
+    (ACTIVITY_STAGE_CLOSED, "stage_closed"),
+    (ACTIVITY_STAGE_OWNER_CHANGED, "stage_owner_changed"),
+    (ACTIVITY_MEMBER_ADDED, "member_added"),
+    (ACTIVITY_MEMBER_REMOVED, "member_removed"),
+    (ACTIVITY_STAGE_MEMBER_ADDED, "stage_member_added"),
+    (ACTIVITY_STAGE_MEMBER_REMOVED, "stage_member_removed"),
+)
+
+TIMELINE_MAX_DAYS = 3660
+WORKLOAD_CACHE_TIMEOUT = 600
+FRAGMENT_CACHE_TIMEOUT = 600
+PROJECT_LIST_PAGE_SIZE = 12
+BULK_MEMBERS_MAX = 500
+
+SEARCH_PROJECT = 0
+SEARCH_STAGE = 1
+SEARCH_TASK = 2
+SEARCH_REPORT = 3
+
+SEARCH_KIND_CHOICES = (
+    (SEARCH_PROJECT, "project"),
+    (SEARCH_STAGE, "stage"),
+    (SEARCH_TASK, "task"),
+    (SEARCH_REPORT, "report"),
+)
+
+SEARCH_MAX_TOKENS = 8
+SEARCH_TOKEN_MAX_LENGTH = 40
+SEARCH_TITLE_MAX_LENGTH = 200
+
+CAN_VIEW_PROJECT = 0
+CAN_MANAGE_PROJECT = 1
+CAN_VIEW_STAGE = 2
+CAN_MANAGE_STAGE = 3
+CAN_CREATE_TASK = 4
+
+CAPABILITY_CHOICES = (
+    (CAN_VIEW_PROJECT, "view_project"),
+    (CAN_MANAGE_PROJECT, "manage_project"),
+    (CAN_VIEW_STAGE, "view_stage"),
+    (CAN_MANAGE_STAGE, "manage_stage"),
+    (CAN_CREATE_TASK, "create_task"),
+)
+
+TASK_CREATOR_GROUPS = ("Stage_Owner", "PM")
+
+BATCH_MAX_REQUESTS = 20
+BATCH_MAX_WORKERS = 4
+
+# Days of past deadlines kept in calendar feeds.
+CALENDAR_PAST_DAYS = 90
+CALENDAR_CACHE_TIMEOUT = 86400
+
+NOTIFY_PROJECT_MEMBER_ADDED = 0
+NOTIFY_STAGE_MEMBER_ADDED = 1
+
+NOTIFICATION_CHOICES = (
+    (NOTIFY_PROJECT_MEMBER_ADDED, "project_member_added"),
+    (NOTIFY_STAGE_MEMBER_ADDED, "stage_member_added"),
+)
@@ -8,11 +8,12 @@ from django.utils.http import urlsafe_base64_encode
 from projectmanagement.settings import EMAIL_HOST_USER
 
 from . import constants
-from ..models import UserProject, UserStage, CustomUser
+from .permissions import has_capability
+from ..models import UserStage, CustomUser
 
 
 def is_in_group(user):
-    return user.groups.filter(name__in=["Stage_Owner", "PM"]).exists()
+    return has_capability(user, constants.CAN_CREATE_TASK)
 
 
 def check_token(user, token):
@@ -20,29 +21,27 @@ def check_token(user, token):
 
 
 def is_in_project(user, project):
-    return UserProject.objects.filter(user=user, project=project).exists()
+    return has_capability(user, constants.CAN_VIEW_PROJECT, project=project)
 
 
 def is_pm(user, project):
-    user_project = UserProject.objects.filter(user=user, project=project)
-    if user_project.exists():
-        return user_project[0].role == constants.PROJECT_MANAGER
-    return False
+    return has_capability(user, constants.CAN_MANAGE_PROJECT, project=project)
 
 
 def is_stage_owner(user, stage):
-    user_stage = UserStage.objects.filter(user=user, stage=stage)
-    return user_stage[0].role == constants.STAGE_OWNER
+    return UserStage.objects.filter(
+        user=user, stage=stage, role=constants.STAGE_OWNER
+    ).exists()
 
 
 def is_stage_member_or_pm(user, stage):
-    return UserStage.objects.filter(user=user, stage=stage).exists() or is_pm(
-        user, stage.project
-    )
+    return has_capability(user, constants.CAN_VIEW_STAGE, stage=stage)
 
 
 def is_pm_or_stage_owner(user, stage, project):
-    return is_pm(user, project) or is_stage_owner(user, stage)
+    return has_capability(
+        user, constants.CAN_MANAGE_STAGE, project=project, stage=stage
+    )
 
 
 def send_mail_verification(request, new_user):
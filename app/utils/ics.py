@@ -0,0 +1,146 @@
+import datetime
+import hashlib
+
+from django.core import signing
+from django.core.cache import cache
+
+from . import constants
+from .versions import get_project_versions, get_user_projects
+from ..models import Stage, Task
+
+SALT = "app.utils.ics"
+PRODID = "-//projectmanagement//Deadlines//EN"
+# Domain of event UIDs, which must stay the same across polls.
+UID_DOMAIN = "projectmanagement"
+# Octets per line, after which iCalendar lines are folded.
+LINE_LENGTH = 75
+
+
+def get_feed_token(user):
+    return signing.Signer(salt=SALT).sign(str(user.pk))
+
+
+def get_feed_user_id(token):
+    try:
+        return int(signing.Signer(salt=SALT).unsign(token))
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+def get_feed_version(user_id):
+    """Return the ETag of a user's feed and when it last changed, in seconds.
+
+    The feed changes with the user's projects, so once their list is cached
+    this reads the cache twice and the database not at all.
+    """
+    project_ids, listed_at = get_user_projects(user_id)
+    versions = get_project_versions(project_ids)
+    signature = ",".join(f"{pk}:{versions[pk]}" for pk in project_ids)
+    digest = hashlib.md5(f"{user_id}|{signature}".encode()).hexdigest()
+    return '"%s"' % digest, max([listed_at, *versions.values()]) // 10**9
+
+
+def get_feed(user_id, etag):
+    """Return the chunks of a user's feed, from the cache when built before."""
+    key = f"calendar:{user_id}:{etag}"
+    content = cache.get(key)
+    if content is not None:
+        return [content]
+    return cache_chunks(key, generate_feed(user_id))
+
+
+def cache_chunks(key, chunks):
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    # Only a feed streamed to the end is complete.
+    cache.set(key, "".join(parts), constants.CALENDAR_CACHE_TIMEOUT)
+
+
+def generate_feed(user_id):
+    """Yield the deadlines of a user's stages and tasks as iCalendar text."""
+    since = datetime.date.today() - datetime.timedelta(
+        days=constants.CALENDAR_PAST_DAYS
+    )
+    yield "".join(
+        fold(line)
+        for line in [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:" + PRODID,
+            "CALSCALE:GREGORIAN",
+        ]
+    )
+
+    stages = Stage.objects.filter(
+        userstage__user_id=user_id, end_date__gte=since
+    ).select_related("project")
+    for stage in stages.order_by("end_date", "pk").iterator():
+        yield get_event(
+            "stage-%d" % stage.pk,
+            stage.end_date,
+            stage.name,
+            stage.project.name,
+            stage.updated_at,
+        )
+
+    # Read with the (user, end_date) index of tasks.
+    tasks = (
+        Task.objects.filter(user_id=user_id, end_date__gte=since)
+        .select_related("stage__project")
+        .only(
+            "content",
+            "end_date",
+            "updated_at",
+            "stage__name",
+            "stage__project__name",
+        )
+    )
+    for task in tasks.order_by("end_date", "pk").iterator(chunk_size=500):
+        yield get_event(
+            "task-%d" % task.pk,
+            task.end_date,
+            task.content,
+            "%s / %s" % (task.stage.project.name, task.stage.name),
+            task.updated_at,
+        )
+    yield fold("END:VCALENDAR")
+
+
+def get_event(uid, day, summary, description, stamp):
+    lines = [
+        "BEGIN:VEVENT",
+        "UID:%s@%s" % (uid, UID_DOMAIN),
+        "DTSTAMP:" + stamp.astimezone(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+        "DTSTART;VALUE=DATE:" + day.strftime("%Y%m%d"),
+        "DTEND;VALUE=DATE:" + (day + datetime.timedelta(days=1)).strftime("%Y%m%d"),
+        "SUMMARY:" + escape(summary),
+        "DESCRIPTION:" + escape(description),
+        "END:VEVENT",
+    ]
+    return "".join(fold(line) for line in lines)
+
+
+def escape(text):
+    for char, escaped in [("\\", "\\\\"), (";", "\\;"), (",", "\\,"), ("\n", "\\n")]:
+        text = text.replace(char, escaped)
+    return text.replace("\r", "")
+
+
+def fold(line):
+    """Return ``line`` ended with CRLF and split into lines of at most 75 octets."""
+    parts = []
+    part = ""
+    size = 0
+    for char in line:
+        length = len(char.encode())
+        if size + length > LINE_LENGTH:
+            parts.append(part)
+            # Continuation lines start with a space, which counts.
+            part = " "
+            size = 1
+        part += char
+        size += length
+    parts.append(part)
+    return "\r\n".join(parts) + "\r\n"
@@ -0,0 +1,198 @@
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Case, Exists, OuterRef, Q, Value, When
+from django.utils import timezone
+
+from . import constants
+from .activity import record
+from .changes import record_tombstones
+from .permissions import refresh_permissions
+from .queries import delete_without_signals
+from ..events import notify_project_change
+from ..models import Task, UserProject, UserStage
+
+REMOVED = "removed"
+NOT_IN_PROJECT = "not_in_project"
+HAS_OPEN_TASKS = "has_open_tasks"
+IS_PM = "is_pm"
+IS_STAGE_OWNER = "is_stage_owner"
+
+
+def remove_members(project_id, user_ids, actor=None):
+    """Remove users from a project and its stages unless something blocks them.
+
+    Returns ``{user_id: {"status": ...}}``; users owning stages also get the
+    ``stages`` they own. Every check is one grouped query over all users and
+    the removal is one DELETE per membership table.
+    """
+    user_ids = sorted(set(user_ids))
+    memberships = {
+        user_id: (pk, role)
+        for pk, user_id, role in UserProject.objects.filter(
+            project_id=project_id, user_id__in=user_ids
+        ).values_list("pk", "user_id", "role")
+    }
+    busy = set(
+        Task.objects.filter(
+            stage__project_id=project_id,
+            user_id__in=memberships,
+            status__in=constants.TASK_OPEN_STATUSES,
+        )
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+    owned = defaultdict(list)
+    for user_id, stage_id in UserStage.objects.filter(
+        stage__project_id=project_id,
+        user_id__in=memberships,
+        role=constants.STAGE_OWNER,
+    ).values_list("user_id", "stage_id"):
+        owned[user_id].append(stage_id)
+
+    outcomes = {}
+    removable = []
+    for user_id in user_ids:
+        if user_id not in memberships:
+            outcomes[user_id] = {"status": NOT_IN_PROJECT}
+        elif user_id in busy:
+            outcomes[user_id] = {"status": HAS_OPEN_TASKS}
+        elif memberships[user_id][1] == constants.PROJECT_MANAGER:
+            outcomes[user_id] = {"status": IS_PM}
+        elif owned[user_id]:
+            outcomes[user_id] = {"status": IS_STAGE_OWNER, "stages": owned[user_id]}
+        else:
+            outcomes[user_id] = {"status": REMOVED}
+            removable.append(user_id)
+
+    if removable:
+        delete_memberships(project_id, removable, memberships, actor)
+    return outcomes
+
+
+def delete_memberships(project_id, user_ids, memberships, actor=None):
+    user_stages = UserStage.objects.filter(
+        stage__project_id=project_id, user_id__in=user_ids
+    )
+    stage_rows = list(user_stages.values_list("pk", "stage_id", "user_id"))
+    tombstones = [
+        {
+            "type": "stage_member",
+            "action": "deleted",
+            "id": pk,
+            "stage": stage_id,
+            "user": user_id,
+        }
+        for pk, stage_id, user_id in stage_rows
+    ] + [
+        {
+            "type": "project_member",
+            "action": "deleted",
+            "id": memberships[user_id][0],
+            "user": user_id,
+        }
+        for user_id in user_ids
+    ]
+
+    with transaction.atomic():
+        # The per-row delete signals are skipped, and their work is done here
+        # once for the whole batch.
+        delete_without_signals(
+            UserStage.objects.filter(pk__in=[row[0] for row in stage_rows])
+        )
+        delete_without_signals(
+            UserProject.objects.filter(project_id=project_id, user_id__in=user_ids)
+        )
+        refresh_permissions(project_id, user_ids)
+        record_tombstones(project_id, tombstones)
+        for user_id in user_ids:
+            record(project_id, constants.ACTIVITY_MEMBER_REMOVED, actor, user_id)
+        notify_project_change(
+            project_id,
+            {"type": "project_member", "action": "deleted", "users": user_ids},
+        )
+
+
+def transfer_stage_owner(stage, user_id, actor=None):
+    """Make ``user_id`` the only owner of ``stage`` and return the old owners.
+
+    The stage's memberships are locked for the whole transfer, so concurrent
+    transfers run one after the other and always leave exactly one owner.
+    The previous owners keep their project role while they own another stage
+    and project managers keep theirs in any case.
+    """
+    with transaction.atomic():
+        roles = dict(
+            UserStage.objects.select_for_update()
+            .filter(stage=stage)
+            .values_list("user_id", "role")
+        )
+        old_owners = sorted(
+            pk for pk, role in roles.items() if role == constants.STAGE_OWNER
+        )
+        if old_owners == [user_id]:
+            return old_owners
+
+        now = timezone.now()
+        UserStage.objects.filter(
+            Q(role=constants.STAGE_OWNER) | Q(user_id=user_id), stage=stage
+        ).update(
+            role=Case(
+                When(user_id=user_id, then=Value(constants.STAGE_OWNER)),
+                default=Value(constants.MEMBER),
+            ),
+            updated_at=now,
+        )
+        if user_id not in roles:
+            # Upsert, as a concurrent add of the same member can't be locked.
+            UserStage.objects.bulk_create(
+                [UserStage(user_id=user_id, stage=stage, role=constants.STAGE_OWNER)],
+                update_conflicts=True,
+                update_fields=["role", "updated_at"],
+                unique_fields=get_unique_fields(["user", "stage"]),
+            )
+
+        project_roles = UserProject.objects.filter(project_id=stage.project_id)
+        project_roles.filter(user_id=user_id, role=constants.MEMBER).update(
+            role=constants.STAGE_OWNER, updated_at=now
+        )
+        project_roles.filter(
+            user_id__in=old_owners, role=constants.STAGE_OWNER
+        ).exclude(
+            Exists(
+                UserStage.objects.filter(
+                    user_id=OuterRef("user_id"),
+                    stage__project_id=stage.project_id,
+                    role=constants.STAGE_OWNER,
+                )
+            )
+        ).update(
+            role=constants.MEMBER, updated_at=now
+        )
+
+        refresh_permissions(stage.project_id, {*old_owners, user_id})
+        record(
+            stage.project_id,
+            constants.ACTIVITY_STAGE_OWNER_CHANGED,
+            actor,
+            stage.pk,
+            old=old_owners,
+            new=user_id,
+        )
+        notify_project_change(
+            stage.project_id,
+            {
+                "type": "stage_member",
+                "action": "updated",
+                "stage": stage.pk,
+                "users": sorted({*old_owners, user_id}),
+            },
+        )
+    return old_owners
+
+
+def get_unique_fields(fields):
+    # MySQL upserts on any unique key and can't be given the fields.
+    if connection.features.supports_update_conflicts_with_target:
+        return fields
+    return None
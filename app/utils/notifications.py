@@ -0,0 +1,86 @@
+from itertools import groupby
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Max
+from django.template.loader import render_to_string
+from django.utils.translation import gettext as _, ngettext
+
+from . import constants
+from ..models import PendingNotification
+
+
+def notify(user_ids, project_id, kind, actor=None, **data):
+    """Queue an event for the next digest of each of ``user_ids``.
+
+    Rows are written in the caller's transaction, so they go away with it on
+    a rollback. Nothing is sent until ``send_digests`` runs.
+    """
+    PendingNotification.objects.bulk_create(
+        [
+            PendingNotification(
+                user_id=user_id,
+                project_id=project_id,
+                actor_id=getattr(actor, "pk", actor),
+                kind=kind,
+                data=data,
+            )
+            for user_id in user_ids
+        ]
+    )
+
+
+def describe(notification):
+    actor = notification.actor.username if notification.actor else _("Someone")
+    if notification.kind == constants.NOTIFY_STAGE_MEMBER_ADDED:
+        return _("%(actor)s added you to stage %(stage)s") % {
+            "actor": actor,
+            "stage": notification.data.get("stage"),
+        }
+    return _("%(actor)s added you to the project") % {"actor": actor}
+
+
+def get_digest(user, notifications):
+    projects = [
+        (project, [describe(notification) for notification in group])
+        for project, group in groupby(notifications, lambda item: item.project)
+    ]
+    subject = ngettext(
+        "%(count)d update in your projects",
+        "%(count)d updates in your projects",
+        len(notifications),
+    ) % {"count": len(notifications)}
+    body = render_to_string(
+        "app/email/notification_digest.txt", {"user": user, "projects": projects}
+    )
+    return EmailMessage(subject, body, settings.EMAIL_HOST_USER, [user.email])
+
+
+def send_digests(batch_size=100):
+    """Send each user one email of their pending notifications, then drop them.
+
+    Users are read in batches and every digest goes over one SMTP connection.
+    Notifications queued while this runs wait for the next digest.
+    """
+    last = PendingNotification.objects.aggregate(last=Max("pk"))["last"]
+    if last is None:
+        return 0
+    pending = PendingNotification.objects.filter(pk__lte=last)
+    user_ids = list(
+        pending.order_by("user_id").values_list("user_id", flat=True).distinct()
+    )
+    sent = 0
+    with get_connection() as connection:
+        for index in range(0, len(user_ids), batch_size):
+            batch = pending.filter(user_id__in=user_ids[index : index + batch_size])
+            notifications = batch.select_related("user", "project", "actor").order_by(
+                "user_id", "project_id", "pk"
+            )
+            messages = [
+                get_digest(user, list(group))
+                for user, group in groupby(notifications, lambda item: item.user)
+                if user.email
+            ]
+            sent += connection.send_messages(messages) or 0
+            batch.delete()
+    return sent
@@ -0,0 +1,167 @@
+import contextlib
+from collections import defaultdict
+from contextvars import ContextVar
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from . import constants
+from .queries import delete_without_signals
+from .versions import forget_user_projects
+from ..models import EffectivePermission, Project, Stage, UserProject, UserStage
+
+_checked = ContextVar("checked_permissions", default=None)
+
+
+def get_project_rows(project_ids, user_ids=None):
+    """Return the capabilities users have in projects, as unsaved rows.
+
+    Members can view their project and PMs manage it and all of its stages.
+    Stage members can view their stage and its owner manages it.
+    """
+    members = UserProject.objects.filter(project_id__in=project_ids)
+    stage_members = UserStage.objects.filter(stage__project_id__in=project_ids)
+    if user_ids is not None:
+        members = members.filter(user_id__in=user_ids)
+        stage_members = stage_members.filter(user_id__in=user_ids)
+
+    rows = set()
+    managers = defaultdict(list)
+    for user_id, project_id, role in members.values_list(
+        "user_id", "project_id", "role"
+    ):
+        rows.add((user_id, project_id, None, constants.CAN_VIEW_PROJECT))
+        if role == constants.PROJECT_MANAGER:
+            rows.add((user_id, project_id, None, constants.CAN_MANAGE_PROJECT))
+            managers[project_id].append(user_id)
+    if managers:
+        for stage_id, project_id in Stage.objects.filter(
+            project_id__in=managers
+        ).values_list("pk", "project_id"):
+            for user_id in managers[project_id]:
+                rows.add((user_id, project_id, stage_id, constants.CAN_VIEW_STAGE))
+                rows.add((user_id, project_id, stage_id, constants.CAN_MANAGE_STAGE))
+    for user_id, stage_id, project_id, role in stage_members.values_list(
+        "user_id", "stage_id", "stage__project_id", "role"
+    ):
+        rows.add((user_id, project_id, stage_id, constants.CAN_VIEW_STAGE))
+        if role == constants.STAGE_OWNER:
+            rows.add((user_id, project_id, stage_id, constants.CAN_MANAGE_STAGE))
+    return [
+        EffectivePermission(
+            user_id=user_id, project_id=project_id, stage_id=stage_id, capability=cap
+        )
+        for user_id, project_id, stage_id, cap in rows
+    ]
+
+
+def get_global_rows(user_ids=None):
+    users = User.objects.filter(groups__name__in=constants.TASK_CREATOR_GROUPS)
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    return [
+        EffectivePermission(user_id=user_id, capability=constants.CAN_CREATE_TASK)
+        for user_id in users.values_list("pk", flat=True).distinct()
+    ]
+
+
+def refresh_permissions(project_id, user_ids=None):
+    """Recompute the capabilities of ``user_ids``, or of everyone, in a project.
+
+    Called after every membership change, including the bulk ones that skip
+    model signals, so it also drops the cached project lists of those users.
+    """
+    stale = EffectivePermission.objects.filter(project_id=project_id)
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        stale = stale.filter(user_id__in=user_ids)
+    with transaction.atomic():
+        if user_ids is None:
+            # Users who were removed have rows only among the stale ones.
+            changed = set(stale.values_list("user_id", flat=True).distinct())
+        delete_without_signals(stale)
+        rows = EffectivePermission.objects.bulk_create(
+            get_project_rows([project_id], user_ids)
+        )
+    forget_checks()
+    if user_ids is None:
+        changed |= {row.user_id for row in rows}
+    else:
+        changed = user_ids
+    transaction.on_commit(lambda: forget_user_projects(changed))
+
+
+def refresh_global_permissions(user_ids=None):
+    stale = EffectivePermission.objects.filter(project__isnull=True)
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        stale = stale.filter(user_id__in=user_ids)
+    with transaction.atomic():
+        delete_without_signals(stale)
+        EffectivePermission.objects.bulk_create(get_global_rows(user_ids))
+    forget_checks()
+
+
+def has_capability(user, capability, project=None, stage=None):
+    """Return whether ``user`` has ``capability``, with one indexed lookup.
+
+    Without a stage the row must be of ``project``, or global when that is
+    None too. A stage check only also matches the project when given one.
+    """
+    if not user.is_authenticated:
+        return False
+    checked = _checked.get()
+    key = (
+        user.pk,
+        capability,
+        getattr(project, "pk", project),
+        getattr(stage, "pk", stage),
+    )
+    if checked is not None and key in checked:
+        return checked[key]
+
+    permissions = EffectivePermission.objects.filter(
+        user=user, capability=capability, stage=stage
+    )
+    if stage is None or project is not None:
+        permissions = permissions.filter(project=project)
+    allowed = permissions.exists()
+    if checked is not None:
+        checked[key] = allowed
+    return allowed
+
+
+@contextlib.contextmanager
+def remember_checks():
+    """Answer repeated capability checks in the block from memory.
+
+    Meant for a group of calls made for one client, like the sub-requests of
+    a batch. Threads started with a copy of the context share the answers.
+    """
+    token = _checked.set({})
+    try:
+        yield
+    finally:
+        _checked.reset(token)
+
+
+def forget_checks():
+    checked = _checked.get()
+    if checked is not None:
+        checked.clear()
+
+
+def get_permitted_ids(user, capability, field="project_id"):
+    """Return a subquery of the projects or stages ``user`` has ``capability`` on.
+
+    Filtering with ``pk__in`` on it is a semi-join on the permission index.
+    """
+    return EffectivePermission.objects.filter(user=user, capability=capability).values(
+        field
+    )
+
+
+def get_visible_projects(user):
+    return Project.objects.filter(
+        pk__in=get_permitted_ids(user, constants.CAN_VIEW_PROJECT)
+    )
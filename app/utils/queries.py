@@ -0,0 +1,15 @@
+def delete_without_signals(queryset):
+    """Delete the rows of ``queryset`` with one DELETE and return their count.
+
+    Unlike ``QuerySet.delete`` the rows aren't read first, which keeps large
+    deletes cheap, but neither are related rows cascaded nor ``pre_delete``
+    and ``post_delete`` sent. Callers re-run what those receivers do:
+
+    - UserProject and UserStage: ``members.delete_memberships`` refreshes the
+      permissions and records the tombstones and change events itself.
+    - EffectivePermission, SearchDocument and SearchPosting have no receivers;
+      postings are deleted before the documents they point to.
+
+    Relies on the private ``QuerySet._raw_delete``, which the tests check.
+    """
+    return queryset._raw_delete(queryset.db)
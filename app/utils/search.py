@@ -0,0 +1,248 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, Count, FloatField, Sum, Value, When
+from django.db.models.functions import Cast
+
+from . import constants
+from .permissions import get_permitted_ids
+from ..models import (
+    Project,
+    Report,
+    SearchDocument,
+    SearchPosting,
+    Stage,
+    Task,
+)
+
+TOKEN = re.compile(r"\w+")
+KIND_NAMES = dict(constants.SEARCH_KIND_CHOICES)
+MAX_FREQUENCY = 32767
+# BM25 term frequency saturation.
+K1 = 1.2
+
+KINDS = {
+    Project: constants.SEARCH_PROJECT,
+    Stage: constants.SEARCH_STAGE,
+    Task: constants.SEARCH_TASK,
+    Report: constants.SEARCH_REPORT,
+}
+# Fields whose text is indexed, per searchable model.
+TEXT_FIELDS = {
+    Project: {"name", "describe"},
+    Stage: {"name"},
+    Task: {"content"},
+    Report: {"content"},
+}
+
+
+def tokenize(text):
+    """Split ``text`` in lowercase words without diacritics.
+
+    "Dự án" and "du an" give the same tokens, as users often type
+    Vietnamese without its accents.
+    """
+    text = unicodedata.normalize("NFKD", text.casefold().replace("đ", "d"))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return [token[: constants.SEARCH_TOKEN_MAX_LENGTH] for token in TOKEN.findall(text)]
+
+
+def get_frequencies(text):
+    return {
+        token: min(count, MAX_FREQUENCY)
+        for token, count in Counter(tokenize(text)).items()
+    }
+
+
+def get_document(instance):
+    """Return ``(kind, project_id, text, title)`` of a searchable instance."""
+    if isinstance(instance, Project):
+        text = "%s %s" % (instance.name, instance.describe)
+        return constants.SEARCH_PROJECT, instance.pk, text, instance.name
+    if isinstance(instance, Stage):
+        return constants.SEARCH_STAGE, instance.project_id, instance.name, instance.name
+    if isinstance(instance, Task):
+        project_id = instance.stage.project_id
+        return constants.SEARCH_TASK, project_id, instance.content, instance.content
+    return (
+        constants.SEARCH_REPORT,
+        instance.project_id,
+        instance.content,
+        instance.content,
+    )
+
+
+def index_document(instance):
+    """Bring the postings of ``instance`` in line with its current text.
+
+    Only the tokens whose frequency changed are written, so saving an
+    instance without touching its text costs two indexed reads.
+    """
+    kind, project_id, text, title = get_document(instance)
+    title = title[: constants.SEARCH_TITLE_MAX_LENGTH]
+    frequencies = get_frequencies(text)
+    with transaction.atomic():
+        document = SearchDocument.objects.filter(
+            kind=kind, object_id=instance.pk
+        ).first()
+        moved = False
+        if document is None:
+            document = SearchDocument.objects.create(
+                kind=kind, object_id=instance.pk, project_id=project_id, title=title
+            )
+            existing = {}
+        else:
+            moved = document.project_id != project_id
+            if moved or document.title != title:
+                SearchDocument.objects.filter(pk=document.pk).update(
+                    project_id=project_id, title=title
+                )
+            existing = {}
+            if not moved:
+                existing = dict(
+                    SearchPosting.objects.filter(document=document).values_list(
+                        "token", "frequency"
+                    )
+                )
+
+        unchanged = {
+            token
+            for token, count in frequencies.items()
+            if existing.get(token) == count
+        }
+        if moved or len(unchanged) < len(existing):
+            SearchPosting.objects.filter(document=document).exclude(
+                token__in=unchanged
+            ).delete()
+        SearchPosting.objects.bulk_create(
+            [
+                SearchPosting(
+                    token=token,
+                    document=document,
+                    project_id=project_id,
+                    frequency=count,
+                )
+                for token, count in frequencies.items()
+                if token not in unchanged
+            ]
+        )
+
+
+def index_documents(instances):
+    """Index new instances of one model with one insert per table."""
+    if not instances:
+        return 0
+    kind = KINDS[type(instances[0])]
+    documents = {}
+    for instance in instances:
+        _, project_id, text, title = get_document(instance)
+        documents[instance.pk] = (project_id, text, title)
+
+    with transaction.atomic():
+        SearchDocument.objects.bulk_create(
+            [
+                SearchDocument(
+                    kind=kind,
+                    object_id=pk,
+                    project_id=project_id,
+                    title=title[: constants.SEARCH_TITLE_MAX_LENGTH],
+                )
+                for pk, (project_id, text, title) in documents.items()
+            ]
+        )
+        # MySQL doesn't return the primary keys of bulk inserts.
+        ids = dict(
+            SearchDocument.objects.filter(
+                kind=kind, object_id__in=documents
+            ).values_list("object_id", "pk")
+        )
+        SearchPosting.objects.bulk_create(
+            [
+                SearchPosting(
+                    token=token,
+                    document_id=ids[pk],
+                    project_id=project_id,
+                    frequency=count,
+                )
+                for pk, (project_id, text, title) in documents.items()
+                for token, count in get_frequencies(text).items()
+            ],
+            batch_size=5000,
+        )
+    return len(instances)
+
+
+def remove_document(instance):
+    SearchDocument.objects.filter(
+        kind=KINDS[type(instance)], object_id=instance.pk
+    ).delete()
+
+
+def search(user, query, kind=None, limit=20, offset=0):
+    """Rank the documents of the user's projects matching ``query``.
+
+    Scores are BM25 without length normalization, computed by the database
+    over the postings of the query tokens only.
+    """
+    tokens = list(dict.fromkeys(tokenize(query)))[: constants.SEARCH_MAX_TOKENS]
+    if not tokens:
+        return {"count": 0, "results": []}
+
+    project_ids = get_permitted_ids(user, constants.CAN_VIEW_PROJECT)
+    postings = SearchPosting.objects.filter(
+        token__in=tokens, project_id__in=project_ids
+    )
+    documents = SearchDocument.objects.filter(project_id__in=project_ids)
+    if kind is not None:
+        postings = postings.filter(document__kind=kind)
+        documents = documents.filter(kind=kind)
+
+    frequencies = dict(
+        postings.values_list("token").annotate(count=Count("id")).order_by()
+    )
+    if not frequencies:
+        return {"count": 0, "results": []}
+    total = documents.count()
+    weights = {
+        token: math.log(1 + (total - count + 0.5) / (count + 0.5))
+        for token, count in frequencies.items()
+    }
+
+    frequency = Cast("frequency", FloatField())
+    ranked = (
+        postings.values("document_id")
+        .annotate(
+            score=Sum(
+                Case(
+                    *[
+                        When(token=token, then=Value(weight))
+                        for token, weight in weights.items()
+                    ],
+                    output_field=FloatField(),
+                )
+                * frequency
+                * (K1 + 1)
+                / (frequency + K1)
+            )
+        )
+        .order_by("-score", "-document_id")
+    )
+    count = ranked.count()
+    page = list(ranked[offset : offset + limit])
+    found = SearchDocument.objects.in_bulk([row["document_id"] for row in page])
+    results = []
+    for row in page:
+        document = found[row["document_id"]]
+        results.append(
+            {
+                "type": KIND_NAMES[document.kind],
+                "id": document.object_id,
+                "project": document.project_id,
+                "title": document.title,
+                "score": round(row["score"], 4),
+            }
+        )
+    return {"count": count, "results": results}
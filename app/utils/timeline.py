@@ -0,0 +1,138 @@
+import datetime
+
+import numpy as np
+
+from . import constants
+
+BUCKET_DAYS = {"day": 1, "week": 7}
+
+
+def bucket_origin(start, bucket):
+    if bucket == "week":
+        return start - datetime.timedelta(days=start.weekday())
+    return start
+
+
+def to_ordinals(dates):
+    return np.fromiter(
+        (date.toordinal() for date in dates), dtype=np.int64, count=len(dates)
+    )
+
+
+def count_active(
+    starts, ends, rows, num_rows, origin, num_buckets, width=1, weights=None
+):
+    """Count the intervals active in each bucket, one row per ``rows`` value.
+
+    ``starts`` and ``ends`` are arrays of the inclusive intervals as date
+    ordinals. Every interval adds its weight at its first bucket and removes
+    it after its last one, so a cumulative sum over the buckets gives the
+    active counts.
+    """
+    if num_buckets <= 0:
+        return np.zeros((num_rows, 0), dtype=np.int64)
+
+    first = (starts - origin.toordinal()) // width
+    last = (ends - origin.toordinal()) // width
+
+    keep = (last >= first) & (last >= 0) & (first < num_buckets)
+    first = np.clip(first[keep], 0, num_buckets - 1)
+    last = np.clip(last[keep], 0, num_buckets - 1)
+    rows = np.asarray(rows, dtype=np.int64)[keep]
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.int64)[keep]
+
+    offset = rows * (num_buckets + 1)
+    size = num_rows * (num_buckets + 1)
+    delta = np.bincount(offset + first, weights, minlength=size) - np.bincount(
+        offset + last + 1, weights, minlength=size
+    )
+    counts = delta.astype(np.int64).reshape(num_rows, num_buckets + 1).cumsum(axis=1)
+    return counts[:, :num_buckets]
+
+
+def get_window(dates, start=None, end=None):
+    """Return the ``(start, end)`` range of a timeline over ``dates``.
+
+    A missing bound is taken from the dates. A range longer than
+    ``TIMELINE_MAX_DAYS`` is cut at the end, unless only the end was given.
+    """
+    from_end = start is None and end is not None
+    if start is None:
+        start = min(dates, default=end or datetime.date.today())
+    if end is None:
+        end = max(dates, default=start)
+    limit = datetime.timedelta(days=constants.TIMELINE_MAX_DAYS)
+    if end - start > limit:
+        if from_end:
+            start = end - limit
+        else:
+            end = start + limit
+    return start, end
+
+
+def build_timeline(stages, tasks, bucket="day", start=None, end=None):
+    """Build the timeline payload of a project.
+
+    ``stages`` are ``(id, name, start_date, end_date, status)`` rows and
+    ``tasks`` are ``(id, stage_id, content, status, start_date, end_date,
+    user_id)`` rows, as returned by ``values_list``. Missing bounds are
+    taken with ``get_window``; tasks outside the range are left out.
+    """
+    width = BUCKET_DAYS[bucket]
+    dates = [row[2] for row in stages] + [row[3] for row in stages]
+    start, end = get_window(
+        dates + [row[4] for row in tasks] + [row[5] for row in tasks], start, end
+    )
+    tasks = [row for row in tasks if row[4] <= end and row[5] >= start]
+    task_columns = list(zip(*tasks)) or [[]] * 7
+    starts = to_ordinals(task_columns[4])
+    ends = to_ordinals(task_columns[5])
+
+    origin = bucket_origin(start, bucket)
+    num_buckets = max((end - origin).days // width + 1, 0)
+    counts = count_active(
+        starts,
+        ends,
+        task_columns[3],
+        len(constants.TASK_STATUS_CHOICES),
+        origin,
+        num_buckets,
+        width=width,
+    )
+
+    return {
+        "bucket": bucket,
+        "start": start,
+        "end": end,
+        "stages": [
+            {
+                "id": pk,
+                "name": name,
+                "start_date": start_date,
+                "end_date": end_date,
+                "status": status,
+            }
+            for pk, name, start_date, end_date, status in stages
+        ],
+        "tasks": [
+            {
+                "id": pk,
+                "stage": stage_id,
+                "content": content,
+                "status": status,
+                "start_date": start_date,
+                "end_date": end_date,
+                "user": user_id,
+            }
+            for pk, stage_id, content, status, start_date, end_date, user_id in tasks
+        ],
+        "buckets": [
+            origin + datetime.timedelta(days=index * width)
+            for index in range(num_buckets)
+        ],
+        "active_tasks": {
+            label: counts[value].tolist()
+            for value, label in constants.TASK_STATUS_CHOICES
+        },
+    }
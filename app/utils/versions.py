@@ -0,0 +1,58 @@
+import time
+
+from django.core.cache import cache
+
+
+def project_version_key(project_id):
+    return f"project:{project_id}:version"
+
+
+def get_project_versions(project_ids):
+    """Return the cache version of each project, starting missing ones.
+
+    Versions are timestamps rather than counters so a version evicted from the
+    cache never comes back with a value that was already used.
+    """
+    keys = {project_version_key(pk): pk for pk in project_ids}
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def get_project_version(project_id):
+    return get_project_versions([project_id])[project_id]
+
+
+def bump_project_versions(project_ids):
+    now = time.time_ns()
+    cache.set_many({project_version_key(pk): now for pk in project_ids}, None)
+
+
+def user_projects_key(user_id):
+    return f"user:{user_id}:projects"
+
+
+def get_user_projects(user_id):
+    """Return the sorted ids of a user's projects and when they were listed.
+
+    The list is cached until ``forget_user_projects`` is called for the user,
+    which happens on every membership change.
+    """
+    from ..models import UserProject
+
+    key = user_projects_key(user_id)
+    entry = cache.get(key)
+    if entry is None:
+        project_ids = UserProject.objects.filter(user_id=user_id).values_list(
+            "project_id", flat=True
+        )
+        entry = (sorted(project_ids), time.time_ns())
+        cache.set(key, entry, None)
+    return entry
+
+
+def forget_user_projects(user_ids):
+    cache.delete_many([user_projects_key(pk) for pk in user_ids])
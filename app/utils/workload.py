@@ -0,0 +1,71 @@
+import hashlib
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Count
+
+from . import constants
+from .timeline import count_active, to_ordinals
+from .versions import get_project_versions
+from ..models import Task
+
+
+def workload_cache_key(project_ids, start, end):
+    versions = get_project_versions(project_ids)
+    signature = ",".join(f"{pk}:{versions[pk]}" for pk in sorted(project_ids))
+    digest = hashlib.md5(f"{signature}|{start}|{end}".encode()).hexdigest()
+    return f"workload:{digest}"
+
+
+def build_workload(project_ids, start, end):
+    """Return the user x day matrix of open tasks in columnar layout.
+
+    Tasks sharing user and interval are grouped by the database, so the
+    matrix is accumulated from one row per distinct assignment interval.
+    """
+    rows = list(
+        Task.objects.filter(
+            stage__project_id__in=project_ids,
+            status__in=constants.TASK_OPEN_STATUSES,
+            user__isnull=False,
+            start_date__lte=end,
+            end_date__gte=start,
+        )
+        .values_list("user_id", "user__username", "start_date", "end_date")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    columns = list(zip(*rows)) or [[]] * 5
+    user_ids, index = np.unique(
+        np.array(columns[0], dtype=np.int64), return_inverse=True
+    )
+    usernames = dict(zip(columns[0], columns[1]))
+
+    num_days = (end - start).days + 1
+    matrix = count_active(
+        to_ordinals(columns[2]),
+        to_ordinals(columns[3]),
+        index,
+        len(user_ids),
+        start,
+        num_days,
+        weights=columns[4],
+    )
+    return {
+        "start": start,
+        "end": end,
+        "days": num_days,
+        "projects": sorted(project_ids),
+        "users": user_ids.tolist(),
+        "usernames": [usernames[pk] for pk in user_ids.tolist()],
+        "open_tasks": matrix.tolist(),
+    }
+
+
+def get_workload(project_ids, start, end):
+    key = workload_cache_key(project_ids, start, end)
+    data = cache.get(key)
+    if data is None:
+        data = build_workload(project_ids, start, end)
+        cache.set(key, data, constants.WORKLOAD_CACHE_TIMEOUT)
+    return data
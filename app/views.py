@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from django.contrib import messages
 from django.contrib.auth.decorators import (
     user_passes_test,
@@ -9,21 +11,29 @@ from django.contrib.auth.mixins import (
 )
 from django.contrib.auth.models import User
 from django.core.exceptions import PermissionDenied
-from django.core.mail import send_mail
 from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.forms import model_to_dict
-from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseRedirect,
+    JsonResponse,
+)
 from django.shortcuts import render, redirect, get_object_or_404
 from django.template import loader
 from django.urls import reverse, reverse_lazy
+from django.utils import timezone
 from django.utils.encoding import force_str
+from django.utils.functional import SimpleLazyObject, cached_property
 from django.utils.http import urlsafe_base64_decode
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import DetailView
 from django.views.generic.edit import CreateView, UpdateView
 from django.views.generic.list import ListView
 
-from projectmanagement.settings import EMAIL_HOST_USER
 from .forms import (
     SignupForm,
     TaskForm,
@@ -32,7 +42,7 @@ from .forms import (
     StageCreateForm,
 )
 from .models import Task, Stage, Project, UserProject, UserStage
-from .utils import constants
+from .utils import constants, members
 from .utils.helpers import (
     check_token,
     is_pm,
@@ -42,6 +52,11 @@ from .utils.helpers import (
     is_pm_or_stage_owner,
     send_mail_verification,
 )
+from .utils.activity import record
+from .utils.members import remove_members
+from .utils.notifications import notify
+from .utils.permissions import refresh_permissions
+from .utils.versions import get_project_version
 
 
 def signUp(request):
@@ -92,6 +107,12 @@ class ProjectCreate(LoginRequiredMixin, CreateView):
         UserProject.objects.create(
             user=self.request.user, project=project, role=constants.PROJECT_MANAGER
         )
+        record(
+            project.pk,
+            constants.ACTIVITY_PROJECT_CREATED,
+            self.request.user,
+            project.pk,
+        )
         return HttpResponseRedirect(reverse_lazy("project"))
 
 
@@ -103,6 +124,16 @@ class ProjectUpdate(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     def test_func(self):
         return is_pm(self.request.user, self.get_object())
 
+    def form_valid(self, form):
+        record(
+            self.object.pk,
+            constants.ACTIVITY_PROJECT_UPDATED,
+            self.request.user,
+            self.object.pk,
+            fields=sorted(form.changed_data),
+        )
+        return super().form_valid(form)
+
 
 def render_task_by_stage(request, stage_id):
     stage = get_object_or_404(Stage, pk=stage_id)
@@ -142,34 +173,109 @@ def create_task(request):
 def project_delete(request, pk):
     project = get_object_or_404(Project, pk=pk)
     if is_pm(user=request.user, project=project):
-        project.delete()
+        project.delete(actor=request.user)
         return HttpResponse(_("Delete successfully"))
     else:
         raise PermissionDenied()
 
 
-class ProjectListView(ListView):
+def count_subquery(queryset, field):
+    """Count the rows of ``queryset`` per outer row, correlated on ``field``."""
+    counts = (
+        queryset.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class ProjectListView(LoginRequiredMixin, ListView):
     model = Project
-    queryset = Project.objects.filter(status=constants.ACTIVE)
     context_object_name = "project_list"
     template_name = "app/project_list.html"
+    paginate_by = constants.PROJECT_LIST_PAGE_SIZE
+
+    def get_queryset(self):
+        projects = (
+            Project.objects.filter(
+                status=constants.ACTIVE, userproject__user=self.request.user
+            )
+            .annotate(
+                role=F("userproject__role"),
+                stage_count=count_subquery(
+                    Stage.objects.filter(status__in=constants.STAGE_OPEN_STATUSES),
+                    "project",
+                ),
+                task_count=count_subquery(
+                    Task.objects.filter(status__in=constants.TASK_OPEN_STATUSES),
+                    "stage__project",
+                ),
+            )
+            .order_by("-pk")
+        )
+        query = self.request.GET.get("q", "").strip()
+        if query:
+            projects = projects.filter(
+                Q(name__icontains=query) | Q(describe__icontains=query)
+            )
+        return projects
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["query"] = self.request.GET.get("q", "").strip()
+        return context
+
+
+class CachedObjectMixin:
+    """Fetch the object once even though ``test_func`` also needs it."""
 
+    def get_object(self, queryset=None):
+        if "object" not in self.__dict__:
+            self.object = super().get_object(queryset)
+        return self.object
 
-class ProjectDetail(LoginRequiredMixin, UserPassesTestMixin, DetailView):
+
+class ProjectDetail(
+    CachedObjectMixin, LoginRequiredMixin, UserPassesTestMixin, DetailView
+):
     def test_func(self):
         return is_in_project(user=self.request.user, project=self.get_object())
 
     model = Project
 
+    @cached_property
+    def stages_by_status(self):
+        stages = defaultdict(list)
+        queryset = self.object.stage_set.annotate(task_count=Count("task"))
+        for stage in queryset.order_by("pk"):
+            stages[stage.status].append(stage)
+        return stages
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["user_projects"] = UserProject.objects.filter(project=self.get_object())
-        stages = Stage.objects.filter(project=self.get_object())
-        stage_active = stages.filter(status=constants.ACTIVE)
-        stage_closed = stages.filter(status=constants.CLOSED)
-        context["stage_active"] = stage_active
-        context["stage_closed"] = stage_closed
-        context["task_count"] = Task.objects.filter(stage__in=stages).count()
+        # The template only evaluates these when its fragment cache misses.
+        context["version"] = get_project_version(self.object.pk)
+        context["fragment_timeout"] = constants.FRAGMENT_CACHE_TIMEOUT
+        context["user_projects"] = self.object.userproject_set.select_related("user")
+        context["stage_active"] = SimpleLazyObject(
+            lambda: [
+                stage
+                for status in constants.STAGE_OPEN_STATUSES
+                for stage in self.stages_by_status[status]
+            ]
+        )
+        context["stage_closed"] = SimpleLazyObject(
+            lambda: self.stages_by_status[constants.CLOSED]
+        )
+        context["task_count"] = SimpleLazyObject(
+            lambda: sum(
+                stage.task_count
+                for stages in self.stages_by_status.values()
+                for stage in stages
+            )
+        )
         return context
 
 
@@ -204,23 +310,44 @@ class StageCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
 
         UserStage.objects.create(user=user, stage=stage, role=constants.STAGE_OWNER)
         UserProject.objects.filter(user=user, project=project).update(
-            role=constants.STAGE_OWNER
+            role=constants.STAGE_OWNER, updated_at=timezone.now()
+        )
+        refresh_permissions(project.pk, [user.pk])
+        record(
+            project.pk,
+            constants.ACTIVITY_STAGE_CREATED,
+            self.request.user,
+            stage.pk,
+            owner=user.pk,
         )
 
         success_url = reverse("project-detail", kwargs={"pk": project_id})
         return redirect(success_url)
 
 
-class StageDetailView(LoginRequiredMixin, UserPassesTestMixin, DetailView):
+class StageDetailView(
+    CachedObjectMixin, LoginRequiredMixin, UserPassesTestMixin, DetailView
+):
     def test_func(self):
         return is_stage_member_or_pm(user=self.request.user, stage=self.get_object())
 
     model = Stage
 
+    def get_queryset(self):
+        return Stage.objects.filter(project_id=self.kwargs.get("project_id"))
+
+    @cached_property
+    def tasks(self):
+        return list(self.object.task_set.order_by("pk"))
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["user_stages"] = UserStage.objects.filter(stage=self.get_object())
-        context["tasks"] = Task.objects.filter(stage=self.get_object()).count()
+        # The template only evaluates these when its fragment cache misses.
+        context["version"] = get_project_version(self.object.project_id)
+        context["fragment_timeout"] = constants.FRAGMENT_CACHE_TIMEOUT
+        context["user_stages"] = self.object.userstage_set.select_related("user")
+        context["tasks"] = SimpleLazyObject(lambda: self.tasks)
+        context["task_count"] = SimpleLazyObject(lambda: len(self.tasks))
         context["project_id"] = self.kwargs.get("project_id")
         return context
 
@@ -238,22 +365,33 @@ class StageUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
         kwargs["project_id"] = self.kwargs.get("project_id")
+        kwargs["actor"] = self.request.user
         return kwargs
 
     def test_func(self):
         return is_pm(self.request.user, self.kwargs.get("project_id"))
 
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        record(
+            self.object.project_id,
+            constants.ACTIVITY_STAGE_UPDATED,
+            self.request.user,
+            self.object.pk,
+        )
+        return response
+
 
 @login_required
 def delete_stage(request, project_id, pk):
     stage = get_object_or_404(Stage, pk=pk, project_id=project_id)
     if is_pm(user=request.user, project=stage.project):
-        stage.delete()
+        stage.delete(actor=request.user)
 
         stage_data = model_to_dict(stage, exclude=["user"])
 
         num_stages = Stage.objects.filter(
-            project=project_id, status=constants.ACTIVE
+            project=project_id, status__in=constants.STAGE_OPEN_STATUSES
         ).count()
 
         return JsonResponse(
@@ -289,18 +427,14 @@ def AddUserToProject(request, pk):
                 UserProject.objects.create(
                     user=user, project=project, role=form.cleaned_data["role"]
                 )
-
-                mail_subject = "Add to project"
-                mail_message = _(
-                    f"User have been already added to project {project} by {request.user}"
+                record(
+                    project.pk, constants.ACTIVITY_MEMBER_ADDED, request.user, user.pk
                 )
-                from_email = EMAIL_HOST_USER
-                send_mail(
-                    mail_subject,
-                    mail_message,
-                    from_email,
-                    [user.email],
-                    fail_silently=False,
+                notify(
+                    [user.pk],
+                    project.pk,
+                    constants.NOTIFY_PROJECT_MEMBER_ADDED,
+                    request.user,
                 )
                 return HttpResponseRedirect(
                     reverse_lazy("project-detail", kwargs={"pk": pk})
@@ -380,18 +514,19 @@ def add_member_to_stage(request, project_id, pk):
         user = get_object_or_404(User, pk=user_id)
         stage = get_object_or_404(Stage, pk=pk)
         UserStage.objects.create(user=user, stage=stage, role=constants.MEMBER)
-
-        mail_subject = "Add to stage"
-        mail_message = _(
-            f"User have been already added to stage {stage.name} of project {project} by {request.user}"
+        record(
+            project.pk,
+            constants.ACTIVITY_STAGE_MEMBER_ADDED,
+            request.user,
+            stage.pk,
+            user=user.pk,
         )
-        from_email = EMAIL_HOST_USER
-        send_mail(
-            mail_subject,
-            mail_message,
-            from_email,
-            [user.email],
-            fail_silently=False,
+        notify(
+            [user.pk],
+            project.pk,
+            constants.NOTIFY_STAGE_MEMBER_ADDED,
+            request.user,
+            stage=stage.name,
         )
         return JsonResponse(
             {
@@ -412,17 +547,14 @@ def add_member_to_stage(request, project_id, pk):
 
 @login_required
 def delete_member_from_project(request, project_pk, user_pk):
-    user = get_object_or_404(User, pk=user_pk)
-    project = get_object_or_404(Project, pk=project_pk)
-    user_project = get_object_or_404(UserProject, user=user, project=project)
-
-    if is_pm(user=request.user, project=project) and (
-        not is_pm(user=user, project=project)
-    ):
-        stages = Stage.objects.filter(project=project)
-        user_stage = UserStage.objects.filter(stage__in=stages, user=user)
-        user_stage.delete()
-        user_project.delete()
-        return HttpResponse(_("Delete successfully"))
-    else:
+    if not is_pm(user=request.user, project=project_pk):
         raise PermissionDenied()
+
+    outcome = remove_members(project_pk, [user_pk], request.user)[user_pk]
+    if outcome["status"] == members.NOT_IN_PROJECT:
+        raise Http404()
+    if outcome["status"] == members.IS_PM:
+        raise PermissionDenied()
+    if outcome["status"] != members.REMOVED:
+        return HttpResponseBadRequest(_("Member can not be deleted"))
+    return HttpResponse(_("Delete successfully"))
@@ -0,0 +1,57 @@
+from projectmanagement.db.pool import get_pool
+
+POOL_DEFAULTS = {
+    "MAX_SIZE": 10,
+    "TIMEOUT": 30,
+    "RECYCLE": 3600,
+    "PRE_PING": True,
+}
+
+
+class PooledDatabaseWrapperMixin:
+    """Check raw connections out of a per-worker pool instead of reconnecting.
+
+    Configured through the ``POOL`` key of the database settings, see
+    ``POOL_DEFAULTS``. Closing the Django connection hands the raw connection
+    back to the pool.
+    """
+
+    def get_pool(self, conn_params):
+        options = {**POOL_DEFAULTS, **self.settings_dict.get("POOL", {})}
+        return get_pool(
+            self.alias,
+            connect=lambda: super(PooledDatabaseWrapperMixin, self).get_new_connection(
+                conn_params
+            ),
+            max_size=options["MAX_SIZE"],
+            timeout=options["TIMEOUT"],
+            recycle=options["RECYCLE"],
+            pre_ping=options["PRE_PING"],
+            ping=self.ping_connection,
+            reset=self.reset_connection,
+        )
+
+    def get_new_connection(self, conn_params):
+        self.pool = self.get_pool(conn_params)
+        return self.pool.acquire()
+
+    def ping_connection(self, connection):
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        finally:
+            cursor.close()
+
+    def reset_connection(self, connection):
+        connection.rollback()
+
+    def _close(self):
+        if self.connection is None:
+            return
+        # A connection closed inside an atomic block stays referenced by this
+        # wrapper until the block exits, so it can't be handed to another thread.
+        discard = self.in_atomic_block or (
+            self.errors_occurred and not self.is_usable()
+        )
+        with self.wrap_database_errors:
+            self.pool.release(self.connection, discard=discard)
@@ -0,0 +1,7 @@
+from django.db.backends.sqlite3 import base
+
+from projectmanagement.db.backends.base import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    pass
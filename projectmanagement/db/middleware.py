@@ -0,0 +1,81 @@
+import time
+
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+
+from .routers import read_from_replica, wrote_to_primary
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRoutingMiddleware:
+    """Route safe requests to the replicas unless the client wrote recently.
+
+    After a write the client is pinned to the primary for
+    ``REPLICA_STICKY_SECONDS``: browsers through a cookie, JWT clients through
+    a cache entry keyed on the ``user_id`` claim of their token.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user_id = self.get_token_user_id(request)
+        replica = (
+            bool(settings.REPLICA_DATABASES)
+            and request.method in SAFE_METHODS
+            and not self.is_sticky(request, user_id)
+        )
+        replica_token = read_from_replica.set(replica)
+        wrote_token = wrote_to_primary.set(False)
+        try:
+            response = self.get_response(request)
+            if wrote_to_primary.get():
+                self.stick(response, user_id)
+        finally:
+            read_from_replica.reset(replica_token)
+            wrote_to_primary.reset(wrote_token)
+        return response
+
+    def is_sticky(self, request, user_id):
+        now = time.time()
+        try:
+            until = float(request.COOKIES.get(settings.REPLICA_STICKY_COOKIE, 0))
+        except ValueError:
+            until = 0
+        if until > now:
+            return True
+        if user_id is not None:
+            return cache.get(self.cache_key(user_id), 0) > now
+        return False
+
+    def stick(self, response, user_id):
+        window = settings.REPLICA_STICKY_SECONDS
+        until = time.time() + window
+        response.set_cookie(
+            settings.REPLICA_STICKY_COOKIE,
+            str(int(until) + 1),
+            max_age=window,
+            httponly=True,
+            samesite="Lax",
+        )
+        if user_id is not None:
+            cache.set(self.cache_key(user_id), until, window)
+
+    def get_token_user_id(self, request):
+        # The claim only picks a database, so the signature is checked later
+        # by the authentication classes and not here.
+        header = request.META.get(settings.SIMPLE_JWT["AUTH_HEADER_NAME"], "")
+        parts = header.split()
+        if len(parts) != 2 or parts[0] not in settings.SIMPLE_JWT["AUTH_HEADER_TYPES"]:
+            return None
+        try:
+            claims = jwt.decode(parts[1], options={"verify_signature": False})
+        except jwt.InvalidTokenError:
+            return None
+        return claims.get(settings.SIMPLE_JWT["USER_ID_CLAIM"])
+
+    @staticmethod
+    def cache_key(user_id):
+        return "db:primary_until:%s" % user_id
@@ -0,0 +1,186 @@
+import os
+import threading
+import time
+from collections import deque
+
+from django.db.utils import OperationalError
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """Bounded pool of raw DB-API connections shared by the threads of a worker.
+
+    ``connect`` opens a new raw connection, ``ping`` checks an idle connection
+    before it is handed out again and ``reset`` cleans a connection that is
+    returned to the pool.
+    """
+
+    def __init__(
+        self,
+        connect,
+        max_size=10,
+        timeout=30.0,
+        recycle=3600,
+        pre_ping=True,
+        ping=None,
+        reset=None,
+    ):
+        self.connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.ping = ping
+        self.reset = reset
+
+        self._cond = threading.Condition()
+        self._idle = deque()
+        self._born = {}
+        self._size = 0
+        self._in_use = 0
+        self._created = 0
+        self._discarded = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_time = 0.0
+
+    def acquire(self):
+        started = None
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn = None
+                    break
+                if started is None:
+                    started = time.monotonic()
+                    self._waits += 1
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._wait_time += time.monotonic() - started
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        "Timed out after %.1fs waiting for a database connection"
+                        % self.timeout
+                    )
+                self._cond.wait(remaining)
+
+            if started is not None:
+                self._wait_time += time.monotonic() - started
+            self._in_use += 1
+
+        if conn is not None and not self._is_healthy(conn):
+            self._close(conn)
+            with self._cond:
+                self._discarded += 1
+            conn = None
+
+        if conn is None:
+            try:
+                conn = self.connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._born[id(conn)] = time.monotonic()
+                self._created += 1
+        return conn
+
+    def release(self, conn, discard=False):
+        if not discard and self.reset is not None:
+            try:
+                self.reset(conn)
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard:
+                self._born.pop(id(conn), None)
+                self._size -= 1
+                self._discarded += 1
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+        if discard:
+            self._close(conn)
+
+    def dispose(self):
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            for conn in idle:
+                self._born.pop(id(conn), None)
+            self._size -= len(idle)
+        for conn in idle:
+            self._close(conn)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "created": self._created,
+                "discarded": self._discarded,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "wait_time": round(self._wait_time, 6),
+            }
+
+    def _is_healthy(self, conn):
+        born = self._born.get(id(conn))
+        if self.recycle is not None and born is not None:
+            if time.monotonic() - born > self.recycle:
+                return False
+        if self.pre_ping and self.ping is not None:
+            try:
+                self.ping(conn)
+            except Exception:
+                return False
+        return True
+
+    def _close(self, conn):
+        with self._cond:
+            self._born.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, **kwargs):
+    """Return the pool of ``alias`` for the current process, creating it once.
+
+    Pools are keyed by pid so a forked worker never reuses its parent's sockets.
+    """
+    key = (os.getpid(), alias)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(**kwargs)
+    return pool
+
+
+def pool_stats():
+    pid = os.getpid()
+    return {
+        alias: pool.stats() for (owner, alias), pool in _pools.items() if owner == pid
+    }
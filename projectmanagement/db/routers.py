@@ -0,0 +1,36 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Set by ReplicaRoutingMiddleware for safe requests that are not pinned to the
+# primary. Outside a request (commands, shell) every read goes to the primary.
+read_from_replica = ContextVar("read_from_replica", default=False)
+wrote_to_primary = ContextVar("wrote_to_primary", default=False)
+
+
+class PrimaryReplicaRouter:
+    """Send reads to one of ``REPLICA_DATABASES`` and writes to ``default``.
+
+    The first write of a request pins its remaining reads to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.REPLICA_DATABASES
+        if replicas and read_from_replica.get():
+            return random.choice(replicas)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        read_from_replica.set(False)
+        wrote_to_primary.set(True)
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {"default", *settings.REPLICA_DATABASES}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
@@ -13,7 +13,7 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
-from decouple import config
+from decouple import Csv, config
 from django.utils.translation import gettext_lazy as _
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -53,6 +53,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "api.middleware.APIGZipMiddleware",
+    "projectmanagement.db.middleware.ReplicaRoutingMiddleware",
+    "app.middleware.ActivityLogMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -68,8 +71,16 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [os.path.join(BASE_DIR, "templates")],
-        "APP_DIRS": True,
         "OPTIONS": {
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
@@ -95,6 +106,13 @@ DATABASES = {
         "PASSWORD": config("DB_PASSWORD"),
         "HOST": config("DB_HOST"),
         "PORT": config("DB_PORT"),
+        # Only read by the pooled backends in projectmanagement.db.backends.
+        "POOL": {
+            "MAX_SIZE": config("DB_POOL_MAX_SIZE", default=10, cast=int),
+            "TIMEOUT": config("DB_POOL_TIMEOUT", default=30, cast=float),
+            "RECYCLE": config("DB_POOL_RECYCLE", default=3600, cast=int),
+            "PRE_PING": config("DB_POOL_PRE_PING", default=True, cast=bool),
+        },
         "TEST": {
             "NAME": "test_projectmanagement",
             "CHARSET": "utf8mb4",
@@ -103,6 +121,46 @@ DATABASES = {
     }
 }
 
+# Read replicas, configured by host (MySQL) or by name (local SQLite stand-in).
+DB_REPLICA_HOSTS = config("DB_REPLICA_HOSTS", default="", cast=Csv())
+DB_REPLICA_NAMES = config("DB_REPLICA_NAMES", default="", cast=Csv())
+
+REPLICA_DATABASES = []
+for index in range(max(len(DB_REPLICA_HOSTS), len(DB_REPLICA_NAMES))):
+    replica = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+    if index < len(DB_REPLICA_HOSTS):
+        replica["HOST"] = DB_REPLICA_HOSTS[index]
+    if index < len(DB_REPLICA_NAMES):
+        replica["NAME"] = DB_REPLICA_NAMES[index]
+    DATABASES[f"replica_{index}"] = replica
+    REPLICA_DATABASES.append(f"replica_{index}")
+
+DATABASE_ROUTERS = ["projectmanagement.db.routers.PrimaryReplicaRouter"]
+
+# Reads of a client stay on the primary for this long after it writes.
+REPLICA_STICKY_SECONDS = config("DB_REPLICA_STICKY_SECONDS", default=5, cast=int)
+REPLICA_STICKY_COOKIE = "primary_until"
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=""),
+    }
+}
+
+
+# Server-sent events of project changes, see app.events
+EVENTS_TRANSPORT = "app.events.transports.LocalTransport"
+EVENTS_QUEUE_SIZE = 100
+EVENTS_HEARTBEAT = 15
+EVENTS_RETRY_MS = 3000
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -169,8 +227,36 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "api.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    "DEFAULT_THROTTLE_CLASSES": (
+        "api.throttling.UserBucketThrottle",
+        "api.throttling.RouteBucketThrottle",
+    ),
 }
 
+# Token buckets of api.throttling as (capacity, tokens refilled per second).
+# "user" is shared by all requests of a user, or of a client address when
+# anonymous; the others only count requests to the route of that name.
+THROTTLE_BUCKETS = {
+    "user": (600, 10.0),
+    "signup": (20, 20 / 3600),
+    "token_obtain_pair": (30, 0.5),
+    "project_detail": (60, 2.0),
+}
+# Seconds between merges of the process buckets into the shared cache.
+THROTTLE_SYNC_INTERVAL = 1.0
+
+# JSON responses smaller than this are not worth compressing.
+API_GZIP_MIN_LENGTH = 1024
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "API Project Management",
     "DESCRIPTION": "API for Project Management",
@@ -178,6 +264,19 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
 }
 
+# Deployed code version; the OpenAPI schema file is regenerated when it
+# changes. Left empty, a fingerprint of the source files is used instead.
+CODE_VERSION = config("CODE_VERSION", default="")
+SCHEMA_CACHE_DIR = config("SCHEMA_CACHE_DIR", default=os.path.join(BASE_DIR, "var"))
+# Max-age of the schema at the URL of its version, see api.views.schema.
+SCHEMA_MAX_AGE = 86400
+
+# Checked by the importtime_report command.
+IMPORT_TIME_BUDGET_MS = 600
+
+# Seconds a stored response is replayed for a retried Idempotency-Key.
+IDEMPOTENCY_KEY_TTL = 86400
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=480),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -0,0 +1,9 @@
+"""
+URL configuration of the API-only workers, see ``settings_api``.
+"""
+from django.conf.urls.i18n import i18n_patterns
+from django.urls import path, include
+
+urlpatterns = i18n_patterns(
+    path("api/", include("api.urls")),
+)